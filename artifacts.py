@@ -0,0 +1,264 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+from vocab import MAX_LEN, VOCAB_EXTENSION, CompactTokenizer
+
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 1
+THRESHOLD_FILE = 'threshold_judol.txt'
+DEFAULT_THRESHOLD = 0.5
+# Model hanya di-load dari format .keras dengan safe_mode=True (Lambda / kode ter-marshal ditolak).
+# HDF5 (.h5) tidak dilindungi safe_mode: dikonversi sekali ke .keras saat build bundle.
+MODEL_EXTENSION = '.keras'
+LEGACY_MODEL_EXTENSIONS = ('.h5',)
+
+
+def file_sha256(path):
+    """sha256 file, atau semua file di dalam direktori (mis. .vocab) berurutan nama"""
+    digest = hashlib.sha256()
+    paths = [path] if os.path.isfile(path) else [
+        os.path.join(root, name)
+        for root, _, names in sorted(os.walk(path)) for name in sorted(names)
+    ]
+    for file_path in paths:
+        if file_path != path:
+            digest.update(os.path.relpath(file_path, path).encode('utf-8') + b'\x00')
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def cleaning_version():
+    """Hash source fungsi cleaning inference (serving.clean_text); berubah jika cleaning diubah"""
+    from serving import clean_text
+    return hashlib.sha256(inspect.getsource(clean_text).encode('utf-8')).hexdigest()[:16]
+
+
+def read_threshold(path=THRESHOLD_FILE, default=DEFAULT_THRESHOLD):
+    if not path or not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return float(f.read().strip())
+
+
+def _import_tensorflow():
+    # Harus di-set sebelum TensorFlow di-import
+    os.environ.setdefault('CUDA_VISIBLE_DEVICES', '-1')
+    import tensorflow as tf
+    tf.config.set_visible_devices([], 'GPU')
+    return tf
+
+
+def load_keras_model(path):
+    """Model Keras CPU-only (.keras, safe_mode), tanpa compile dan tanpa custom object"""
+    if not path.endswith(MODEL_EXTENSION):
+        raise ValueError(f"Format model tidak didukung: {path} (pakai {MODEL_EXTENSION}; "
+                         f"model .h5 dikonversi lewat `artifacts.py build --model`)")
+    tf = _import_tensorflow()
+    return tf.keras.models.load_model(path, compile=False, safe_mode=True)
+
+
+def convert_legacy_model(source, destination):
+    """
+    Simpan ulang model HDF5 (.h5) sebagai .keras. Memuat .h5 bisa menjalankan
+    kode di dalam file (Lambda layer), jadi hanya untuk model yang dipercaya;
+    hasilnya tetap di-load dengan safe_mode=True.
+    """
+    tf = _import_tensorflow()
+    tf.keras.models.load_model(source, compile=False).save(destination)
+
+
+class ArtifactError(Exception):
+    pass
+
+
+class ArtifactBundle:
+    """
+    Satu direktori berisi model, tokenizer (.vocab, tanpa pickle) dan
+    manifest.json: hash file, MAX_LEN, MAX_WORDS, threshold, versi cleaning,
+    path model. `load` hanya membaca manifest; tokenizer dan model di-load
+    (dan hash-nya dicek) saat pertama kali dipakai.
+
+    `version` = hash manifest, dipakai sebagai versi cache / deteksi
+    artefak berubah.
+    """
+
+    def __init__(self, path, manifest, verify=True):
+        self.path = path
+        self.manifest = manifest
+        self.verify = verify
+        self._tokenizer = None
+        self._model = None
+
+    @classmethod
+    def load(cls, path, verify=True):
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise ArtifactError(f"Manifest tidak ditemukan: {manifest_path}")
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != FORMAT_VERSION:
+            raise ArtifactError(f"Format bundle {path} tidak didukung: {manifest.get('format_version')}")
+        return cls(path, manifest, verify)
+
+    @property
+    def version(self):
+        return hashlib.sha256(json.dumps(self.manifest, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    @property
+    def threshold(self):
+        return self.manifest['threshold']
+
+    @property
+    def max_len(self):
+        return self.manifest['max_len']
+
+    @property
+    def max_words(self):
+        return self.manifest['max_words']
+
+    @property
+    def cleaning_stale(self):
+        """True jika cleaning di kode sekarang beda dengan cleaning saat bundle dibuat"""
+        return self.manifest['cleaning_version'] != cleaning_version()
+
+    @property
+    def has_model(self):
+        return self.manifest.get('model') is not None
+
+    def _resolve(self, entry, verify=None):
+        path = os.path.join(self.path, entry['path'])
+        if not os.path.exists(path):
+            raise ArtifactError(f"File artefak tidak ditemukan: {path}")
+        if (self.verify if verify is None else verify) and file_sha256(path) != entry['sha256']:
+            raise ArtifactError(f"Hash {path} tidak cocok dengan manifest (file berubah?)")
+        return path
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            self._tokenizer = CompactTokenizer.load(self._resolve(self.manifest['tokenizer']))
+        return self._tokenizer
+
+    @property
+    def model(self):
+        if self._model is None:
+            if not self.has_model:
+                raise ArtifactError(f"Bundle {self.path} tidak berisi model")
+            self._model = load_keras_model(self._resolve(self.manifest['model']))
+        return self._model
+
+    def check(self):
+        """Cek semua hash file; return list masalah (kosong = aman)"""
+        problems = []
+        for key in ('tokenizer', 'model'):
+            entry = self.manifest.get(key)
+            if entry is None:
+                continue
+            try:
+                self._resolve(entry, verify=True)
+            except ArtifactError as e:
+                problems.append(str(e))
+        if self.cleaning_stale:
+            problems.append("Versi cleaning berbeda dengan kode sekarang (serving.clean_text berubah)")
+        return problems
+
+
+def build_bundle(output_dir, tokenizer_path, model_path=None, threshold=None, threshold_file=THRESHOLD_FILE,
+                 max_len=MAX_LEN, name=None):
+    """
+    Buat bundle dari artefak lama: tokenizer (pickle/JSON Keras) dikonversi
+    ke .vocab, model .keras disalin (.h5 dikonversi ke .keras), threshold dari
+    argumen atau threshold_judol.txt.
+    """
+    if model_path and not model_path.endswith((MODEL_EXTENSION,) + LEGACY_MODEL_EXTENSIONS):
+        raise ArtifactError(f"Format model tidak didukung: {model_path} (pakai {MODEL_EXTENSION} atau .h5)")
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = CompactTokenizer.from_keras(tokenizer_path)
+    tokenizer_dir = 'tokenizer' + VOCAB_EXTENSION
+    tokenizer.save(os.path.join(output_dir, tokenizer_dir))
+
+    model_entry = None
+    if model_path:
+        model_file = 'model' + MODEL_EXTENSION
+        if model_path.endswith(LEGACY_MODEL_EXTENSIONS):
+            convert_legacy_model(model_path, os.path.join(output_dir, model_file))
+        else:
+            shutil.copyfile(model_path, os.path.join(output_dir, model_file))
+        model_entry = {
+            'path': model_file,
+            'sha256': file_sha256(os.path.join(output_dir, model_file)),
+            'source': os.path.basename(model_path),
+        }
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'name': name or os.path.basename(os.path.normpath(output_dir)),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'max_len': max_len,
+        'max_words': tokenizer.num_words,
+        'threshold': threshold if threshold is not None else read_threshold(threshold_file),
+        'cleaning_version': cleaning_version(),
+        'model': model_entry,
+        'tokenizer': {
+            'path': tokenizer_dir,
+            'sha256': file_sha256(os.path.join(output_dir, tokenizer_dir)),
+            'source': os.path.basename(tokenizer_path),
+            'source_sha256': tokenizer.meta['source_sha256'],
+            'vocab_size': tokenizer.meta['vocab_size'],
+            'oov_token': tokenizer.oov_token,
+        },
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return ArtifactBundle(output_dir, manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle artefak model (model + tokenizer + threshold + manifest)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Buat bundle dari tokenizer/model lama")
+    build.add_argument('output', help="Direktori bundle, mis. bundles/judol-v1")
+    build.add_argument('--tokenizer', required=True, help="Tokenizer Keras (.pickle/.pkl/.json)")
+    build.add_argument('--model', default=None, help="Model Keras (.keras; .h5 dikonversi ke .keras)")
+    build.add_argument('--threshold', type=float, default=None, help=f"Default: isi {THRESHOLD_FILE}")
+    build.add_argument('--threshold-file', default=THRESHOLD_FILE)
+    build.add_argument('--max-len', type=int, default=MAX_LEN)
+    build.add_argument('--name', default=None)
+
+    check = subparsers.add_parser('check', help="Tampilkan manifest dan cek hash semua file")
+    check.add_argument('bundle')
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        bundle = build_bundle(args.output, args.tokenizer, args.model, args.threshold, args.threshold_file,
+                              args.max_len, args.name)
+        print(f"✅ Bundle {bundle.manifest['name']} ({bundle.version}) disimpan ke: {args.output}")
+        if not bundle.has_model:
+            print("⚠️  Bundle tanpa model (--model tidak diberikan)")
+        return
+
+    start = time.perf_counter()
+    bundle = ArtifactBundle.load(args.bundle)
+    tokenizer = bundle.tokenizer
+    seconds = time.perf_counter() - start
+    print(json.dumps(bundle.manifest, indent=2, ensure_ascii=False))
+    print(f"⏱️  Manifest + tokenizer ({tokenizer.meta['vocab_size']:,} kata) di-load dalam {seconds * 1000:.1f} ms")
+    problems = bundle.check()
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        raise SystemExit(1)
+    print(f"✅ Bundle {bundle.version} valid")
+
+
+if __name__ == '__main__':
+    main()
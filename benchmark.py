@@ -0,0 +1,403 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pipeline import load_script
+from rules import GAMBLING_RULES, RuleSet
+from storage import default_format, read_table, stage_file, write_table
+
+SIZES = [10_000, 100_000, 1_000_000]
+STAGES = ['clean', 'label', 'feature', 'score', 'predict']
+BASELINE_FILE = 'benchmark_baseline.json'
+# rows/sec boleh turun (atau peak RSS naik) sebanyak ini sebelum dianggap regresi
+DEFAULT_TOLERANCE = 0.20
+# Setiap stage diulang minimal REPEATS kali dan sampai total MIN_SECONDS (maks MAX_REPEATS);
+# yang dilaporkan dan dinilai gate adalah waktu terbaik, bukan satu sampel
+DEFAULT_REPEATS = 3
+DEFAULT_MIN_SECONDS = 1.0
+MAX_REPEATS = 50
+
+CLEANING_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'code', 'Data Cleaning.py')
+MODEL_PATH = 'judol_detection_augmented_smote_robust.keras'
+TOKENIZER_PATH = 'tokenizer_augmented_robust.pickle'
+MAX_LEN = 100
+
+# Emoji asli, atau sisa emoji di CSV hasil scraping (export lama menyisakan byte
+# kontrol seperti '\x02' di posisi emoji)
+_EMOJI_PATTERN = re.compile('[\U0001F300-\U0001FAFF\u2600-\u27BF\x01-\x08\x0b\x0c\x0e-\x1f]')
+_EMOJIS = ['😂', '🔥', '😍', '🤣', '👍', '🙏', '😭', '💰', '🎰', '✨']
+_WORD_PATTERN = re.compile(r'\S+')
+
+# Dipakai jika cleaned_comments belum ada
+DEFAULT_PROFILE = {
+    'source': None,
+    'rows': 0,
+    'lengths': [1, 2, 3, 4, 5, 6, 8, 10, 13, 18, 25, 40],
+    'emoji_rate': 0.2,
+    'brand_rate': 0.06,
+    'obfuscated_rate': 0.7,
+    'brands': {'lazadatoto': 1},
+    'vocab': {'mantap': 3, 'bang': 3, 'lucu': 2, 'banget': 2, 'video': 2, 'keren': 1},
+    'judol_vocab': {'depo': 2, 'wd': 2, 'modal': 1, 'gacor': 1, 'maxwin': 1, '50k': 1},
+}
+
+# Obfuscation nama brand seperti di komentar spam asli
+_LEET = str.maketrans({'o': '0', 'a': '4', 'e': '3', 'i': '1', 's': '5', 'g': '6'})
+_BOLD = {chr(ord('a') + i): chr(0x1D5EE + i) for i in range(26)}
+
+
+# ===== PROFIL & GENERATOR =====
+def corpus_profile(df, vocab_size=5000):
+    """
+    Statistik korpus asli yang dipakai generator: distribusi panjang komentar
+    (jumlah kata), rate emoji, rate komentar ber-brand judi dan seberapa sering
+    brand itu di-obfuscate di teks mentah, plus frekuensi kata.
+    """
+    raw = df['comment_text'].fillna('').astype(str)
+    cleaned = df['cleaned_comment_text'].fillna('').astype(str)
+    lengths = cleaned.str.split().str.len()
+
+    rules = RuleSet()
+    hits, columns = rules.matcher.hit_matrix(cleaned.str.lower())
+    platform_cols = [i for i, (category, _) in enumerate(columns) if category == 'platform']
+    brand_hits = hits[:, platform_cols]
+    has_brand = brand_hits.any(axis=1)
+
+    brands = Counter()
+    obfuscated = 0
+    raw_lower = raw.str.lower().to_numpy()
+    for row in np.flatnonzero(has_brand):
+        brand = columns[platform_cols[np.flatnonzero(brand_hits[row])[0]]][1]
+        brands[brand] += 1
+        obfuscated += brand not in raw_lower[row]
+
+    def word_counts(texts):
+        counts = Counter(word for text in texts for word in _WORD_PATTERN.findall(text))
+        for brand in brands:
+            counts.pop(brand, None)
+        return dict(counts.most_common(vocab_size))
+
+    return {
+        'source': None,
+        'rows': len(df),
+        'lengths': [int(length) for length in np.quantile(lengths[lengths > 0], np.linspace(0, 1, 201))],
+        'emoji_rate': float(raw.str.contains(_EMOJI_PATTERN).mean()),
+        'brand_rate': float(has_brand.mean()),
+        'obfuscated_rate': obfuscated / max(int(has_brand.sum()), 1),
+        'brands': dict(brands.most_common()),
+        'vocab': word_counts(cleaned[~has_brand]),
+        'judol_vocab': word_counts(cleaned[has_brand]),
+    }
+
+
+def load_profile(path=None):
+    path = path or stage_file('cleaned_comments')
+    if not os.path.exists(path):
+        print(f"⚠️ {path} tidak ada, pakai profil default")
+        return dict(DEFAULT_PROFILE)
+    df = read_table(path, columns=['comment_text', 'cleaned_comment_text'], verbose=False)
+    profile = corpus_profile(df)
+    profile['source'] = path
+    return profile
+
+
+def _sampler(counts, rng, size):
+    words = np.array(list(counts), dtype=object)
+    weights = np.array(list(counts.values()), dtype=float)
+    return words[rng.choice(len(words), size=size, p=weights / weights.sum())]
+
+
+def obfuscate(brand, rng):
+    """Variasi brand yang lolos dari pencarian substring biasa (T0GEL62, spasi, huruf bold)"""
+    style = rng.integers(4)
+    if style == 0:
+        return brand.translate(_LEET).upper()
+    if style == 1:
+        return ' '.join(brand)
+    if style == 2:
+        return ''.join(_BOLD.get(char, char) for char in brand)
+    return brand.upper()
+
+
+def generate_comments(n, profile, seed=0):
+    """
+    DataFrame n komentar sintetis dengan kolom yang sama seperti cleaned_comments
+    (+ target). Deterministik untuk seed yang sama.
+    """
+    rng = np.random.default_rng(seed)
+    lengths = np.maximum(rng.choice(profile['lengths'], size=n), 1)
+    is_judol = rng.random(n) < profile['brand_rate']
+    has_emoji = rng.random(n) < profile['emoji_rate']
+    is_obfuscated = rng.random(n) < profile['obfuscated_rate']
+
+    words = _sampler(profile['vocab'], rng, int(lengths.sum()))
+    judol_words = _sampler(profile['judol_vocab'], rng, int(lengths.sum()))
+    brands = _sampler(profile['brands'], rng, n)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    cleaned, raw = [], []
+    for i in range(n):
+        tokens = list((judol_words if is_judol[i] else words)[offsets[i]:offsets[i + 1]])
+        raw_tokens = list(tokens)
+        if is_judol[i]:
+            position = int(rng.integers(len(tokens) + 1))
+            tokens.insert(position, brands[i])
+            raw_tokens.insert(position, obfuscate(brands[i], rng) if is_obfuscated[i] else brands[i])
+        text = ' '.join(raw_tokens)
+        if has_emoji[i]:
+            text += ' ' + _EMOJIS[i % len(_EMOJIS)] * int(1 + i % 3)
+        cleaned.append(' '.join(tokens))
+        raw.append(text[:1].upper() + text[1:])
+
+    return pd.DataFrame({
+        'video_id': [f'vid{i % 500:05d}' for i in range(n)],
+        'author': [f'@user{i}' for i in range(n)],
+        'comment_text': raw,
+        'published_at': pd.Timestamp('2025-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 3e7, n), unit='s'),
+        'like_count': rng.geometric(0.6, n) - 1,
+        'cleaned_comment_text': cleaned,
+        'target': is_judol.astype(int),
+    })
+
+
+# ===== STAGES =====
+def _load_cleaner_module():
+    return load_script(CLEANING_SCRIPT, 'data_cleaning')
+
+
+def _setup_stage(stage, df, options):
+    """Siapkan objek/input stage (tidak ikut diukur); return fungsi tanpa argumen yang diukur"""
+    if stage == 'clean':
+        cleaner = _load_cleaner_module().JudolTextCleaner()
+        texts = df['comment_text'].tolist()
+        workers = options.get('clean_workers')
+        if workers and workers > 1:
+            return lambda: cleaner.clean_texts_parallel(texts, workers=workers)
+        return lambda: [cleaner.clean_comprehensive(text) for text in texts]
+
+    if stage == 'label':
+        rules = RuleSet(GAMBLING_RULES)
+        return lambda: rules.evaluate(df['cleaned_comment_text'])
+
+    from featuring import FinalProductionJudolDetector
+    detector = FinalProductionJudolDetector()
+    if stage == 'feature':
+        return lambda: detector.extract_final_features(df)
+    if stage == 'score':
+        features = detector.extract_final_features(df)
+        return lambda: detector.calculate_final_score(features)
+
+    if stage == 'predict':
+        import pickle
+        import tensorflow as tf
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+        model_path = options.get('model') or MODEL_PATH
+        tokenizer_path = options.get('tokenizer') or TOKENIZER_PATH
+        for path in (model_path, tokenizer_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+        model = tf.keras.models.load_model(model_path, compile=False)
+        with open(tokenizer_path, 'rb') as f:
+            tokenizer = pickle.load(f)
+        texts = detector.prepare_text(df.copy())['combined_text'].tolist()
+
+        def predict():
+            sequences = pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=MAX_LEN)
+            return model.predict(sequences, batch_size=1024, verbose=0)
+        return predict
+
+    raise ValueError(f"Stage tidak dikenal: {stage} (pilih {', '.join(STAGES)})")
+
+
+def peak_rss_mb():
+    """Peak RSS proses ini (MB), None jika platform tidak mendukung"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def time_repeats(func, repeats=DEFAULT_REPEATS, min_seconds=DEFAULT_MIN_SECONDS, max_repeats=MAX_REPEATS):
+    """Waktu (detik) setiap pengulangan func: minimal `repeats` kali dan sampai totalnya `min_seconds`"""
+    samples = []
+    while len(samples) < max_repeats and (len(samples) < repeats or sum(samples) < min_seconds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_stage(stage, data_path, options):
+    """
+    Jalankan satu stage pada dataset di data_path. Dipanggil di proses baru
+    per stage, sehingga peak RSS yang dilaporkan milik stage itu sendiri.
+    Throughput dihitung dari waktu terbaik beberapa pengulangan (time_repeats).
+    """
+    df = read_table(data_path, verbose=False)
+    result = {'stage': stage, 'rows': len(df)}
+    start = time.perf_counter()
+    try:
+        func = _setup_stage(stage, df, options)
+    except (ImportError, FileNotFoundError) as e:
+        result.update(status='skipped', reason=f"{type(e).__name__}: {e}")
+        return result
+    result['setup_seconds'] = round(time.perf_counter() - start, 4)
+    result['rss_before_mb'] = peak_rss_mb()
+
+    samples = time_repeats(
+        func,
+        repeats=options.get('repeats') or DEFAULT_REPEATS,
+        min_seconds=options.get('min_seconds', DEFAULT_MIN_SECONDS),
+    )
+    seconds = min(samples)
+    result.update(
+        status='ok',
+        seconds=round(seconds, 4),
+        median_seconds=round(float(np.median(samples)), 4),
+        repeats=len(samples),
+        rows_per_sec=round(len(df) / seconds, 1) if seconds > 0 else None,
+        peak_rss_mb=peak_rss_mb(),
+    )
+    return result
+
+
+def run_benchmark(sizes=SIZES, stages=STAGES, profile=None, seed=0, options=None, workdir=None):
+    """Dataset sintetis per ukuran, lalu setiap stage diukur di proses terpisah"""
+    profile = profile or load_profile()
+    options = options or {}
+    owns_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='judol_bench_')
+    ext = '.parquet' if default_format() == 'parquet' else '.csv'
+    context = multiprocessing.get_context('spawn')
+
+    runs = []
+    try:
+        for size in sizes:
+            start = time.perf_counter()
+            data_path = os.path.join(workdir, f'synthetic_{size}_{seed}{ext}')
+            write_table(generate_comments(size, profile, seed=seed), data_path)
+            print(f"📦 {size:,} komentar sintetis ({time.perf_counter() - start:.1f}s)")
+
+            for stage in stages:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(run_stage, stage, data_path, options).result()
+                runs.append(result)
+                if result['status'] == 'ok':
+                    print(f"  {stage:<8} {result['rows_per_sec']:>12,.0f} rows/s  {result['seconds']:>8.2f}s "
+                          f"(terbaik dari {result['repeats']})  peak {result['peak_rss_mb'] or 0:,.0f} MB")
+                else:
+                    print(f"  {stage:<8} dilewati ({result['reason']})")
+    finally:
+        if owns_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'created_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'profile': {key: profile[key] for key in ('source', 'rows', 'emoji_rate', 'brand_rate', 'obfuscated_rate')},
+        'runs': runs,
+    }
+
+
+# ===== REGRESSION GATE =====
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    List regresi dibanding baseline (per stage + jumlah baris): throughput
+    (dari waktu terbaik beberapa pengulangan) turun lebih dari `tolerance`
+    atau peak RSS naik lebih dari `tolerance`.
+    Stage yang tidak ada di baseline (atau dilewati) tidak dinilai.
+    """
+    reference = {(run['stage'], run['rows']): run for run in baseline['runs'] if run.get('status') == 'ok'}
+    regressions = []
+    for run in results['runs']:
+        base = reference.get((run['stage'], run['rows']))
+        if run.get('status') != 'ok' or base is None:
+            continue
+        if base.get('rows_per_sec') and run['rows_per_sec'] < base['rows_per_sec'] * (1 - tolerance):
+            regressions.append({
+                'stage': run['stage'], 'rows': run['rows'], 'metric': 'rows_per_sec',
+                'baseline': base['rows_per_sec'], 'current': run['rows_per_sec'],
+            })
+        if base.get('peak_rss_mb') and run['peak_rss_mb'] and run['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance):
+            regressions.append({
+                'stage': run['stage'], 'rows': run['rows'], 'metric': 'peak_rss_mb',
+                'baseline': base['peak_rss_mb'], 'current': run['peak_rss_mb'],
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark throughput per stage dengan komentar sintetis")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SIZES),
+                        help="Jumlah komentar, pisahkan dengan koma (default: 10000,100000,1000000)")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Stage yang diukur (default: {','.join(STAGES)})")
+    parser.add_argument('--profile-source', default=None,
+                        help="Korpus untuk profil generator (default: cleaned_comments.parquet/.csv)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--clean-workers', type=int, default=None,
+                        help="Worker untuk stage clean (default: 1 proses)")
+    parser.add_argument('--model', default=None, help=f"Model Keras untuk stage predict (default: {MODEL_PATH})")
+    parser.add_argument('--tokenizer', default=None, help=f"Tokenizer stage predict (default: {TOKENIZER_PATH})")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f"Pengulangan minimal per stage, dinilai waktu terbaik (default: {DEFAULT_REPEATS})")
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help=f"Ulangi stage sampai total waktunya minimal segini (default: {DEFAULT_MIN_SECONDS:g}s)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help="Baseline untuk regression gate (dilewati jika file tidak ada)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true', help="Simpan hasil run ini sebagai baseline baru")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stages = args.stages.split(',')
+    options = {'clean_workers': args.clean_workers, 'model': args.model, 'tokenizer': args.tokenizer,
+               'repeats': args.repeats, 'min_seconds': args.min_seconds}
+    results = run_benchmark(sizes, stages, load_profile(args.profile_source), seed=args.seed, options=options)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Hasil disimpan ke: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline disimpan ke: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} belum ada, regression gate dilewati (pakai --save-baseline)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"❌ {regression['stage']} @ {regression['rows']:,}: {regression['metric']} "
+              f"{regression['baseline']} -> {regression['current']}")
+    if regressions:
+        return 1
+    print(f"✅ Tidak ada regresi dibanding {args.baseline} (toleransi {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
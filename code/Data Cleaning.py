@@ -1,5 +1,11 @@
+import argparse
+import multiprocessing
+import os
 import re
+import sys
+import time
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import emoji
 import pandas as pd
 from unidecode import unidecode
@@ -7,11 +13,17 @@ import ftfy
 from cleantext import clean
 import nltk
 from tqdm import tqdm
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
 from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 
+# Modul bersama (stemming.py) ada di root repo, satu level di atas folder code/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import StepProfiler
+from stemming import get_stem_cache, get_stemmer
+from storage import default_format, read_table, stage_file, write_table
+
 class JudolTextCleaner:
-    def __init__(self, domain_number_strategy='preserve', number_replacement_strategy='smart'):
+    def __init__(self, domain_number_strategy='preserve', number_replacement_strategy='smart', verbose=False,
+                 profile=False, fast_path=True):
         """
         Initialize JudolTextCleaner
         
@@ -24,11 +36,13 @@ class JudolTextCleaner:
             - 'aggressive': Ganti semua angka dengan huruf (insan4d -> insanad)
             - 'smart': Ganti hanya angka yang membentuk kata judol, pertahankan lainnya (insan4d -> insan4d) [RECOMMENDED]
             - 'preserve': Pertahankan semua angka asli
+        verbose (bool): Cetak teks asli dan setiap perubahan per step (untuk debugging)
+        profile (bool): Rekam waktu dan perubahan per step di self.profiler
+        fast_path (bool): Lewati step yang guard-nya menyatakan teks pasti tidak berubah
         """       
 
-        # Initialize Sastrawi untuk bahasa Indonesia
-        factory = StemmerFactory()
-        self.stemmer = factory.create_stemmer()
+        # Initialize Sastrawi untuk bahasa Indonesia (stemmer + cache kata dasar bersama per proses)
+        self.stemmer = get_stemmer()
         stopword_factory = StopWordRemoverFactory()
         self.stopword_remover = stopword_factory.create_stop_word_remover()
         
@@ -36,6 +50,11 @@ class JudolTextCleaner:
         self.domain_number_strategy = domain_number_strategy
         self.number_replacement_strategy = number_replacement_strategy
         
+        # Output & tracing: default diam (production)
+        self.verbose = verbose
+        self.profiler = StepProfiler() if profile else None
+        self.fast_path = fast_path
+        
         # Mapping untuk number replacement
         self.number_map = {
             '0': 'o', '1': 'i', '2': 'z', '3': 'e', '4': 'a',
@@ -387,6 +406,405 @@ class JudolTextCleaner:
             'sedari', 'seraya', 'sambil', 'seraya', 'sambil', 'seraya'
         }
 
+        # Semua regex dikompilasi SEKALI di sini, bukan di setiap pemanggilan
+        self._compile_patterns()
+        self.step_guards = self._build_step_guards()
+
+    # ===== REGEX REGISTRY =====
+    @staticmethod
+    def _alternation(words):
+        """Alternation regex dari daftar kata, terpanjang dulu agar tidak partial match"""
+        ordered = sorted(words, key=len, reverse=True)
+        return '|'.join(re.escape(word) for word in ordered)
+
+    @staticmethod
+    def _lookup_replacement(mapping, fallback_patterns):
+        """
+        Callback re.sub untuk pattern gabungan: ambil pengganti dari dict.
+        Fallback ke pencocokan per key untuk karakter yang hanya cocok lewat
+        IGNORECASE tapi .lower()-nya berbeda (misal 'ſ' atau tanda Kelvin).
+        """
+        def replace(match):
+            matched = match.group(0)
+            replacement = mapping.get(matched.lower())
+            if replacement is None:
+                replacement = next(
+                    mapping[key] for key, pattern in fallback_patterns if pattern.fullmatch(matched)
+                )
+            return replacement
+        return replace
+
+    def _compile_patterns(self):
+        """Bangun registry regex yang dipakai oleh method-method cleaning"""
+        ignore = re.IGNORECASE
+        self.regex = {
+            'whitespace': re.compile(r'\s+'),
+            'digit': re.compile(r'\d'),
+            # Guard improved_word_segmentation: kata berawalan di/ke/se + >= 3 karakter
+            'prefix_word': re.compile(r'\b(?:di|ke|se)\w{3}', ignore),
+            'decoration': re.compile(r'[|!¤*\'~`¯,¸øº°∙▪■□▢▣▤▥▦▧▨▩▪▫▬▭▮▯▰▱▲△▴▵▶▷▸▹►▻▼▽▾▿◀◁◂◃◄◅◆◇◈◉◊○◌◍◎●◐◑◒◓◔◕◖◗◘◙◚◛◜◝◞◟◠◡◢◣◤◥◦◧◨◩◪◫◬◭◮◯◰◱◲◳◴◵◶◷◸◹◺◻◼◽◾◿]+'),
+            'emoji_code': re.compile(r':[a-z_]+:'),
+            'special_chars': re.compile(r'[^\w\s\d]'),
+            'url': re.compile(r'http\S+|www\.\S+'),
+            'domain': re.compile(r'\S+\.(com|net|org|id|io)\S*'),
+            'phone': re.compile(r'[\+]?[0-9]{2,}[\s\-]?[0-9]{2,}[\s\-]?[0-9]{2,}[\s\-]?[0-9]{2,}'),
+            'zero_width': re.compile(r'[\u200B-\u200D\uFEFF]'),
+            'nbsp': re.compile(r'&nbsp;'),
+            'brackets': re.compile(r'[【】『』〖〗「」｢｣〔〕〈〉《»«〝〞＂‟〟：；，。、！？～‧・¢@®©™]'),
+            'repeated_chars': re.compile(r'([a-zA-Z])\1{2,}'),
+            'repeated_words': re.compile(r'\b(\w+)(?:\s+\1\b)+'),
+            'special_symbols': re.compile(r'[@#\$%\^&\*\(\)_\+=\[\]\{\};:"\\|<>/~`]'),
+            'spaced_letters': re.compile(r'\b(?:([a-z])\s+){2,}([a-z])\b'),
+            'spaced_digits': re.compile(r'(\d)\s+(\d)'),
+            'three_tokens_before_digit': re.compile(r'\b([a-z]{1,3})\s+([a-z]{1,3})\s+([a-z]{1,3})(?=\d)'),
+            'two_tokens_before_digit': re.compile(r'\b([a-z]{1,4})\s+([a-z]{1,4})(?=\d)'),
+        }
+
+        # Karakter tunggal di extended_char_map -> satu tabel str.translate;
+        # key multi-karakter (misal 'A҉') tetap diganti satu per satu dulu
+        self.char_translation = str.maketrans({
+            char: replacement for char, replacement in self.extended_char_map.items() if len(char) == 1
+        })
+        self.multi_char_replacements = [
+            (chars, replacement) for chars, replacement in self.extended_char_map.items() if len(chars) > 1
+        ]
+
+        # Brand yang dipakai pattern segmentasi (untuk guard fast path)
+        self.segmentation_brands = [
+            'sgi88', 'sg188', 'sgi808', 'sgi888', 'pstoto', 'arwanatoto', 'garudahoki',
+            'togel62', 'sendal4d', 'sekali4d',
+        ]
+
+        # Pattern berurutan: urutan penting, jadi tetap list tapi sudah terkompilasi
+        self.segmentation_patterns = [
+            (re.compile(pattern, ignore), replacement) for pattern, replacement in [
+                # Kasus: prefix + brand + kata (disgi88membuat -> di sgi88 membuat)
+                (r'(\b\w{1,2})(sgi88|sg188|sgi808|sgi888)(\w+)\b', r'\1 \2 \3'),
+                (r'(\b\w{1,2})(pstoto|arwanatoto|garudahoki)(\w+)\b', r'\1 \2 \3'),
+                
+                # Kasus: kata + brand (membuatsgi88 -> membuat sgi88)
+                (r'(\b\w+)(sgi88|sg188|sgi808|sgi888)(\w{1,2}\b)', r'\1 \2 \3'),
+                (r'(\b\w+)(pstoto|arwanatoto|garudahoki)(\w{1,2}\b)', r'\1 \2 \3'),
+                
+                # Kasus: brand langsung gabung dengan kata
+                (r'\b(sgi88|sg188|sgi808|sgi888)(\w{3,})\b', r'\1 \2'),
+                (r'\b(\w{3,})(sgi88|sg188|sgi808|sgi888)\b', r'\1 \2'),
+                
+                # ✅ PERBAIKI: Pattern untuk Togel62, Sendal4d, Sekali4d - LEBIH SPESIFIK
+                # Kasus: kata + togel62 (membuattogel62 -> membuat togel62)
+                (r'\b(\w{3,})(togel62)(\w*)\b', r'\1 \2 \3'),
+                # Kasus: togel62 + kata (togel62membuat -> togel62 membuat)  
+                (r'\b(togel62)(\w{3,})\b', r'\1 \2'),
+                # Kasus: prefix pendek + togel62 (ditogel62 -> di togel62)
+                (r'\b(\w{1,2})(togel62)(\w*)\b', r'\1 \2 \3'),
+                
+                # Pattern yang sama untuk sendal4d dan sekali4d
+                (r'\b(\w{3,})(sendal4d)(\w*)\b', r'\1 \2 \3'),
+                (r'\b(sendal4d)(\w{3,})\b', r'\1 \2'),
+                (r'\b(\w{1,2})(sendal4d)(\w*)\b', r'\1 \2 \3'),
+                
+                (r'\b(\w{3,})(sekali4d)(\w*)\b', r'\1 \2 \3'),
+                (r'\b(sekali4d)(\w{3,})\b', r'\1 \2'),
+                (r'\b(\w{1,2})(sekali4d)(\w*)\b', r'\1 \2 \3'),
+                
+                # Kasus umum: prefix + kata
+                (r'\b(di)(\w{3,})\b', r'\1 \2'),  # dimembuat -> di membuat
+                (r'\b(ke)(\w{3,})\b', r'\1 \2'),  # kemana -> ke mana
+                (r'\b(se)(\w{3,})\b', r'\1 \2'),  # semahal -> se mahal
+            ]
+        ]
+
+        # Tiap brand hanya merapikan spasi sebelum dirinya sendiri; tidak bisa
+        # digabung karena match brand A bisa "memakan" kata sebelum brand B
+        self.brand_prefix_patterns = [
+            re.compile(rf'\b([a-z]+)\s+({brand})\b', ignore)
+            for brand in getattr(self, "preserved_brands", [])
+        ]
+
+        self.brand_recognition_patterns = [
+            (re.compile(pattern, ignore), replacement) for pattern, replacement in {
+                # SGI88 variations
+                r'\b[sS5][gG9][iI1]88\b': 'sgi88',
+                r'\b[sS5][gG9][iI1]\s*88\b': 'sgi88', 
+                r'\b[sS5][gG9][iI1]808\b': 'sgi808',
+                r'\b[sS5][gG9][iI1]888\b': 'sgi888',
+                r'\b[sS5][gG9]188\b': 'sg188',
+                r'\b[sS5][gG9]\s*188\b': 'sg188',
+                
+                # PSTOTO99 variations
+                r'\b[pP][sS5][tT7][oO0][tT7][oO0]99\b': 'pstoto99',
+                r'\b[pP][sS5][tT7][oO0][tT7][oO0]\s*99\b': 'pstoto99',
+                r'\bpstoto\s*99\b': 'pstoto99',
+                
+                # ✅ PERBAIKI: Togel62 variations - HAPUS pattern spacing di sini
+                r'\b[tT7][oO0][gG9][eE3][lL1]62\b': 'togel62',
+                r'\b[tT7][oO0][gG9][eE3][lL1]\s*62\b': 'togel62',
+                
+                # Sendal4d variations
+                r'\b[sS5][eE3][nN][dD][aA4@][lL1]4[dD]\b': 'sendal4d',
+                r'\b[sS5][eE3][nN][dD][aA4@][lL1]\s*4[dD]\b': 'sendal4d',
+                
+                # Sekali4d variations
+                r'\b[sS5][eE3][kK][aA4@][lL1][iI1]4[dD]\b': 'sekali4d',
+                r'\b[sS5][eE3][kK][aA4@][lL1][iI1]\s*4[dD]\b': 'sekali4d',
+            }.items()
+        ]
+
+        # Bracket dibiarkan berurutan: bracket berbeda bisa saling bersarang
+        self.bracket_patterns = [
+            re.compile(pattern) for pattern in [
+                r'【.*?】', r'『.*?』', r'〖.*?〗', r'「.*?」', r'｢.*?｣',
+                r'〔.*?〕', r'〈.*?〉', r'《.*?》', r'«.*?»', r'@¢', r'®', r'©', r'™'
+            ]
+        ]
+
+        self.specific_brand_patterns = [
+            (re.compile(pattern, ignore), replacement) for pattern, replacement in {
+                # SGI88 patterns - DIPERBAIKI
+                r'sgi\s*88': 'sgi88',
+                r'sg\s*188': 'sg188', 
+                r'sgi\s*808': 'sgi808',
+                r'sgi\s*888': 'sgi888',
+                
+                # PSTOTO99 patterns - DIPERBAIKI
+                r'pstoto\s*99': 'pstoto99',
+                r'ps\s*toto\s*99': 'pstoto99',
+                
+                # Togel62 patterns - TAMBAHKAN
+                r'togel\s*62': 'togel62',
+                r't0gel\s*62': 'togel62',
+                
+                # Sendal4d patterns - TAMBAHKAN
+                r'sendal\s*4d': 'sendal4d',
+                r'sendal\s*4\s*d': 'sendal4d',
+                
+                # Sekali4d patterns - TAMBAHKAN
+                r'sekali\s*4d': 'sekali4d',
+                r'sekali\s*4\s*d': 'sekali4d',
+                
+                # "cari di google" -> pisah menjadi 3 kata terpisah
+                r'cari\s*di\s*google': 'cari di google',
+                r'cari\s*di\s*g[o0][o0]gle': 'cari di google',
+                r'çäri\s*di\s*göögle': 'cari di google',
+                r'çari\s*di\s*google': 'cari di google',
+                
+                # "lazadatoto" -> pertahankan sebagai SATU KATA
+                r'lazada\s*toto': 'lazadatoto',
+                r'lazada\s*t[o0]t[o0]': 'lazadatoto',
+                r'lazada\s*4d': 'lazada4d',
+                
+                # "garudahoki" -> pertahankan sebagai SATU KATA
+                r'ga\s*ruda\s*ho\s*ki': 'garudahoki',
+                r'ga\s*ruda\s*hoki': 'garudahoki',
+                r'garuda\s*ho\s*ki': 'garudahoki',
+                r'garuda\s*hoki': 'garudahoki',
+            }.items()
+        ]
+
+        self.brand_spacing_patterns = [
+            (re.compile(pattern, ignore), replacement) for pattern, replacement in {
+                # ✅ PERBAIKI: Gunakan word boundaries dan pastikan spasi konsisten
+                r'\b(\w{2,})(togel62|sendal4d|sekali4d|sgi88|sg188|sgi808|sgi888|pstoto99)\b': r'\1 \2',
+                r'\b(togel62|sendal4d|sekali4d|sgi88|sg188|sgi808|sgi888|pstoto99)(\w{2,})\b': r'\1 \2',
+                
+                # Handle kasus khusus dengan karakter tunggal
+                r'\b(\w{1})(togel62|sendal4d|sekali4d)\b': r'\1 \2',
+                r'\b(togel62|sendal4d|sekali4d)(\w{1})\b': r'\1 \2',
+            }.items()
+        ]
+
+        # Brand utuh: satu alternation (penggantinya hanya lowercase, jadi urutan
+        # tidak berpengaruh). Brand berspasi (sgi 88) tetap berurutan per brand.
+        sorted_brands = sorted(self.preserved_brands.keys(), key=len, reverse=True)
+        brand_fallback = [(brand, re.compile(re.escape(brand), ignore)) for brand in sorted_brands]
+        self.preserved_brand_pattern = re.compile(
+            r'\b(?:' + self._alternation(sorted_brands) + r')\b', ignore
+        )
+        self.preserved_brand_replacement = self._lookup_replacement(self.preserved_brands, brand_fallback)
+        self.spaced_brand_patterns = [
+            (re.compile(r'\b' + r'\s*'.join(re.escape(char) for char in brand) + r'\b', ignore),
+             self.preserved_brands[brand])
+            for brand in sorted_brands if any(char.isdigit() for char in brand)
+        ]
+
+        # Kombinasi kata: satu alternation + lookup dict
+        combination_fallback = [
+            (combination, re.compile(re.escape(combination), ignore)) for combination in self.common_combinations
+        ]
+        self.combination_pattern = re.compile(
+            r'\b(?:' + self._alternation(self.common_combinations) + r')\b', ignore
+        )
+        self.combination_replacement = self._lookup_replacement(self.common_combinations, combination_fallback)
+
+        # Leet speak: satu alternation + lookup dict
+        leet_fallback = [
+            (leet_word, re.compile(re.escape(leet_word), ignore)) for leet_word in self.leet_speak_indonesia
+        ]
+        self.leet_pattern = re.compile(
+            r'\b(?:' + self._alternation(self.leet_speak_indonesia) + r')\b', ignore
+        )
+        self.leet_replacement = self._lookup_replacement(self.leet_speak_indonesia, leet_fallback)
+
+        self.word_separation_patterns = [
+            (re.compile(pattern, ignore), replacement) for pattern, replacement in {
+                # SGI88 variations - DIPERBAIKI
+                r'\b(s)\s*(g)\s*(i)\s*(8)\s*(8)\b': 'sgi88',
+                r'\b(s\s*g\s*i\s*8\s*8)\b': 'sgi88',
+                r'\b(sg)\s*(i88)\b': 'sgi88',
+                r'\b(sgi)\s*(88)\b': 'sgi88',
+                
+                # PSTOTO99 variations - DIPERBAIKI
+                r'\b(p)\s*(s)\s*(t)\s*(o)\s*(t)\s*(o)\s*(9)\s*(9)\b': 'pstoto99',
+                r'\b(p\s*s\s*t\s*o\s*t\s*o\s*9\s*9)\b': 'pstoto99',
+                r'\b(pstoto)\s*(99)\b': 'pstoto99',
+                r'\b(ps)\s*(toto)\s*(99)\b': 'pstoto99',
+                
+                # Togel62 variations - TAMBAHKAN
+                r'\b(t)\s*(o)\s*(g)\s*(e)\s*(l)\s*(6)\s*(2)\b': 'togel62',
+                r'\b(t\s*o\s*g\s*e\s*l\s*6\s*2)\b': 'togel62',
+                r'\b(togel)\s*(62)\b': 'togel62',
+                
+                # Sendal4d variations - TAMBAHKAN
+                r'\b(s)\s*(e)\s*(n)\s*(d)\s*(a)\s*(l)\s*(4)\s*(d)\b': 'sendal4d',
+                r'\b(s\s*e\s*n\s*d\s*a\s*l\s*4\s*d)\b': 'sendal4d',
+                r'\b(sendal)\s*(4d)\b': 'sendal4d',
+                
+                # Sekali4d variations - TAMBAHKAN
+                r'\b(s)\s*(e)\s*(k)\s*(a)\s*(l)\s*(i)\s*(4)\s*(d)\b': 'sekali4d',
+                r'\b(s\s*e\s*k\s*a\s*l\s*i\s*4\s*d)\b': 'sekali4d',
+                r'\b(sekali)\s*(4d)\b': 'sekali4d',
+                
+                # Pulauwin variations
+                r'\b(p)\s*(u)\s*(l)\s*(a)\s*(u)\s*(w)\s*(i)\s*(n)\b': 'pulauwin',
+                r'\b(p\s*u\s*l\s*a\s*u\s*w\s*i\s*n)\b': 'pulauwin',
+                r'\b(pula)\s*(uwin)\b': 'pulauwin',
+                r'\b(pulau)\s*(win)\b': 'pulauwin',
+                
+                # Arwanatoto variations
+                r'\b(a)\s*(r)\s*(w)\s*(a)\s*(n)\s*(a)\s*(t)\s*(o)\s*(t)\s*(o)\b': 'arwanatoto',
+                r'\b(arwana)\s*(toto)\b': 'arwanatoto',
+                
+                # Garudahoki variations
+                r'\b(g)\s*(a)\s*(r)\s*(u)\s*(d)\s*(a)\s*(h)\s*(o)\s*(k)\s*(i)\b': 'garudahoki',
+                r'\b(garuda)\s*(hoki)\b': 'garudahoki',
+            }.items()
+        ]
+
+        # Domain + angka: tetap per domain (berurutan), karena hasil satu domain
+        # bisa dicocokkan lagi oleh domain berikutnya (sgi88123 -> sgi88 123 -> sgi 88 123)
+        self.domain_number_patterns = [
+            re.compile(r'\b(' + domain + r')(\d{2,3})\b', ignore) for domain in self.judol_domains
+        ]
+
+    # ===== STEP GUARDS (FAST PATH) =====
+    @staticmethod
+    def _is_plain_text(text):
+        """
+        Guard hanya berlaku untuk teks ASCII printable: satu-satunya whitespace
+        adalah spasi dan lower()/IGNORECASE berperilaku sama. Teks lain selalu
+        menjalankan semua step.
+        """
+        return text.isascii() and text.isprintable()
+
+    @staticmethod
+    def _abnormal_spacing(text):
+        return '  ' in text or text[:1] == ' ' or text[-1:] == ' '
+
+    def _has_digit(self, text):
+        return self.regex['digit'].search(text) is not None
+
+    def _build_step_guards(self):
+        """
+        Guard murah per step (key = nama method). Guard bernilai False hanya jika
+        step PASTI tidak mengubah teks (syarat perlu, bukan syarat cukup), sehingga
+        step boleh dilewati tanpa mengubah output pipeline.
+        """
+        ascii_map_chars = ''.join(
+            char for char in self.extended_char_map if len(char) == 1 and char.isascii()
+        )
+        brands = list(self.preserved_brands)
+        # Leet word tanpa angka (misal 'wd', 'dp') tetap harus dicek sebagai kata
+        letter_leet_words = [word for word in self.leet_speak_indonesia if not any(c.isdigit() for c in word)]
+        judol_words = self.judol_words_for_reconstruction
+        # Kata pendek (<= 3 huruf) hanya bisa digabung oleh detect_and_fix_word_separation
+        # jika ia prefix dari kata judol (atau diawali kata judol sepanjang <= 3 huruf)
+        judol_short_prefixes = {word[:length] for word in judol_words for length in range(1, 4)}
+
+        def has_brand_with_uppercase(text, lower):
+            # preserve_brand_names hanya me-lowercase brand (key == value)
+            return lower != text and any(brand in lower for brand in brands)
+
+        def may_fix_encoding(text):
+            # ftfy pada ASCII printable hanya mengubah HTML entity
+            return '&' in text
+
+        def may_handle_emoji(text):
+            # Emoji selalu non-ASCII; yang tersisa hanya kode ':nama_emoji:'
+            return ':' in text
+
+        def may_normalize_characters(text):
+            return (':' in text or self._abnormal_spacing(text) or
+                    any(char in text for char in ascii_map_chars))
+
+        def may_segment_words(text):
+            lower = text.lower()
+            return (self.regex['prefix_word'].search(text) is not None or
+                    any(brand in lower for brand in self.segmentation_brands))
+
+        def may_fix_common_combinations(text):
+            lower = text.lower()
+            return self._abnormal_spacing(text) or any(key in lower for key in self.common_combinations)
+
+        def may_fix_word_separation(text):
+            if may_fix_common_combinations(text):
+                return True
+            return any(len(word) <= 3 and word.lower() in judol_short_prefixes for word in text.split(' '))
+
+        def may_reconstruct_separated_words(text):
+            compact = text.lower().replace(' ', '')
+            return self._abnormal_spacing(text) or any(word in compact for word in judol_words)
+
+        def may_reconstruct_letter_brands(text):
+            # Pattern tanpa angka: pulauwin, arwanatoto, garudahoki (huruf dipisah \s*)
+            compact = text.lower().replace(' ', '')
+            return self._has_digit(text) or any(word in compact for word in ('pulauwin', 'arwanatoto', 'garudahoki'))
+
+        def may_preserve_brand_names(text):
+            return (self._abnormal_spacing(text) or self._has_digit(text) or
+                    has_brand_with_uppercase(text, text.lower()))
+
+        def may_fix_specific_brand_patterns(text):
+            # Bracket pattern selalu non-ASCII; pattern brand tanpa angka hanya
+            # 'cari di google', 'lazada toto', dan 'garuda hoki'
+            compact = text.lower().replace(' ', '')
+            return self._has_digit(text) or any(word in compact for word in ('caridig', 'lazada', 'garudahoki'))
+
+        def may_replace_numbers(text):
+            lower = text.lower()
+            return (self._abnormal_spacing(text) or self._has_digit(text) or
+                    has_brand_with_uppercase(text, lower) or
+                    any(word in lower for word in letter_leet_words))
+
+        return {
+            'fix_encoding': may_fix_encoding,
+            'handle_emoji_characters': may_handle_emoji,
+            'enhanced_character_normalization': may_normalize_characters,
+            'clean_whitespace_characters': lambda text: '&nbsp;' in text,
+            'enhanced_brand_recognition': self._has_digit,
+            'improved_word_segmentation': may_segment_words,
+            'fix_brand_spacing': self._has_digit,
+            'fix_common_combinations': may_fix_common_combinations,
+            'advanced_word_reconstruction': may_reconstruct_letter_brands,
+            'detect_and_fix_word_separation': may_fix_word_separation,
+            'reconstruct_separated_words': may_reconstruct_separated_words,
+            'preserve_brand_names_in_text': may_preserve_brand_names,
+            'fix_specific_brand_patterns': may_fix_specific_brand_patterns,
+            'remove_urls': lambda text: '.' in text or 'http' in text,
+            'remove_phone_numbers': self._has_digit,
+            'comprehensive_number_replacement': may_replace_numbers,
+            'fix_broken_alphanumeric': lambda text: self._abnormal_spacing(text) or self._has_digit(text),
+        }
+
     # ===== IMPROVED STOPWORD REMOVAL =====
     def selective_stopword_removal(self, text):
         """Stopword removal yang selektif - hanya menghapus stopwords umum"""
@@ -413,45 +831,8 @@ class JudolTextCleaner:
     # ===== IMPROVED WORD SEGMENTATION =====
     def improved_word_segmentation(self, text):
         """Segmentasi kata yang lebih baik untuk kasus seperti 'disgi88membuat'"""
-        # Pattern untuk memisahkan kata yang menempel pada brand
-        patterns = [
-            # Kasus: prefix + brand + kata (disgi88membuat -> di sgi88 membuat)
-            (r'(\b\w{1,2})(sgi88|sg188|sgi808|sgi888)(\w+)\b', r'\1 \2 \3'),
-            (r'(\b\w{1,2})(pstoto|arwanatoto|garudahoki)(\w+)\b', r'\1 \2 \3'),
-            
-            # Kasus: kata + brand (membuatsgi88 -> membuat sgi88)
-            (r'(\b\w+)(sgi88|sg188|sgi808|sgi888)(\w{1,2}\b)', r'\1 \2 \3'),
-            (r'(\b\w+)(pstoto|arwanatoto|garudahoki)(\w{1,2}\b)', r'\1 \2 \3'),
-            
-            # Kasus: brand langsung gabung dengan kata
-            (r'\b(sgi88|sg188|sgi808|sgi888)(\w{3,})\b', r'\1 \2'),
-            (r'\b(\w{3,})(sgi88|sg188|sgi808|sgi888)\b', r'\1 \2'),
-            
-            # ✅ PERBAIKI: Pattern untuk Togel62, Sendal4d, Sekali4d - LEBIH SPESIFIK
-            # Kasus: kata + togel62 (membuattogel62 -> membuat togel62)
-            (r'\b(\w{3,})(togel62)(\w*)\b', r'\1 \2 \3'),
-            # Kasus: togel62 + kata (togel62membuat -> togel62 membuat)  
-            (r'\b(togel62)(\w{3,})\b', r'\1 \2'),
-            # Kasus: prefix pendek + togel62 (ditogel62 -> di togel62)
-            (r'\b(\w{1,2})(togel62)(\w*)\b', r'\1 \2 \3'),
-            
-            # Pattern yang sama untuk sendal4d dan sekali4d
-            (r'\b(\w{3,})(sendal4d)(\w*)\b', r'\1 \2 \3'),
-            (r'\b(sendal4d)(\w{3,})\b', r'\1 \2'),
-            (r'\b(\w{1,2})(sendal4d)(\w*)\b', r'\1 \2 \3'),
-            
-            (r'\b(\w{3,})(sekali4d)(\w*)\b', r'\1 \2 \3'),
-            (r'\b(sekali4d)(\w{3,})\b', r'\1 \2'),
-            (r'\b(\w{1,2})(sekali4d)(\w*)\b', r'\1 \2 \3'),
-            
-            # Kasus umum: prefix + kata
-            (r'\b(di)(\w{3,})\b', r'\1 \2'),  # dimembuat -> di membuat
-            (r'\b(ke)(\w{3,})\b', r'\1 \2'),  # kemana -> ke mana
-            (r'\b(se)(\w{3,})\b', r'\1 \2'),  # semahal -> se mahal
-        ]
-        
-        for pattern, replacement in patterns:
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for pattern, replacement in self.segmentation_patterns:
+            text = pattern.sub(replacement, text)
         
         return text
 
@@ -464,30 +845,23 @@ class JudolTextCleaner:
         avoid_words = r'(di|ke|yang|aja|lagi|dan|itu|nya|bos|slot|jackpot|main|udah)'
         
         # Pastikan brand tetap utuh (tidak tergabung)
-        for brand in getattr(self, "preserved_brands", []):
-            text = re.sub(
-                rf'\b([a-z]+)\s+({brand})\b',
-                r'\1 \2',
-                text,
-                flags=re.IGNORECASE
-            )
+        for pattern in self.brand_prefix_patterns:
+            text = pattern.sub(r'\1 \2', text)
         
         # 🔧 1. Gabungkan tiga token sebelum angka (contoh: se ru 69 -> seru69)
-        text = re.sub(
-            r'\b([a-z]{1,3})\s+([a-z]{1,3})\s+([a-z]{1,3})(?=\d)',
+        text = self.regex['three_tokens_before_digit'].sub(
             lambda m: m.group(1) + m.group(2) + m.group(3),
             text
         )
         
         # 🔧 2. Gabungkan dua token sebelum angka (contoh: se ru69 -> seru69)
-        text = re.sub(
-            r'\b([a-z]{1,4})\s+([a-z]{1,4})(?=\d)',
+        text = self.regex['two_tokens_before_digit'].sub(
             lambda m: m.group(1) + m.group(2),
             text
         )
         
         # 🔧 3. Gabungkan angka yang terpisah (6 9 -> 69)
-        text = re.sub(r'(\d)\s+(\d)', r'\1\2', text)
+        text = self.regex['spaced_digits'].sub(r'\1\2', text)
         
         return text
 
@@ -499,25 +873,15 @@ class JudolTextCleaner:
         Contoh: 's u k u 8 8' -> 'suku88'
         """
         # Gabungkan huruf yang terpisah satu spasi
-        text = re.sub(r'\b(?:([a-z])\s+){2,}([a-z])\b', 
-                      lambda m: ''.join(m.group(0).split()), 
-                      text)
+        text = self.regex['spaced_letters'].sub(lambda m: ''.join(m.group(0).split()), text)
         # Gabungkan angka yang terpisah satu spasi
-        text = re.sub(r'(\d)\s+(\d)', r'\1\2', text)
+        text = self.regex['spaced_digits'].sub(r'\1\2', text)
         return text
 
     # ===== TEXT DECORATION CLEANING =====
     def remove_text_decorations(self, text):
         """Hapus dekorasi teks seperti |!¤*'~``~'*¤!| dan sejenisnya"""
-        # Pattern untuk decorated text dengan berbagai simbol
-        decoration_patterns = [
-            r'[|!¤*\'~`¯,¸øº°∙▪■□▢▣▤▥▦▧▨▩▪▫▬▭▮▯▰▱▲△▴▵▶▷▸▹►▻▼▽▾▿◀◁◂◃◄◅◆◇◈◉◊○◌◍◎●◐◑◒◓◔◕◖◗◘◙◚◛◜◝◞◟◠◡◢◣◤◥◦◧◨◩◪◫◬◭◮◯◰◱◲◳◴◵◶◷◸◹◺◻◼◽◾◿]+',
-        ]
-        
-        for pattern in decoration_patterns:
-            text = re.sub(pattern, ' ', text)
-        
-        return text
+        return self.regex['decoration'].sub(' ', text)
 
     # ===== EMOJI HANDLING METHODS =====
     def replace_emoji_numbers(self, text):
@@ -542,7 +906,7 @@ class JudolTextCleaner:
         
         # Step 3: Remove remaining emojis, tapi pertahankan makna
         text = emoji.demojize(text)
-        text = re.sub(r':[a-z_]+:', ' ', text)  # Hapus kode emoji
+        text = self.regex['emoji_code'].sub(' ', text)  # Hapus kode emoji
         
         return text
 
@@ -562,24 +926,24 @@ class JudolTextCleaner:
     def remove_special_chars(self, text):
         """Hapus karakter khusus tapi pertahankan huruf Indonesia"""
         # Pertahankan kata dengan angka (brand names)
-        text = re.sub(r'[^\w\s\d]', ' ', text)
+        text = self.regex['special_chars'].sub(' ', text)
         return text
 
     def remove_urls(self, text):
         """Hapus URL dan domain"""
-        text = re.sub(r'http\S+|www\.\S+', '', text)
-        text = re.sub(r'\S+\.(com|net|org|id|io)\S*', '', text)
+        text = self.regex['url'].sub('', text)
+        text = self.regex['domain'].sub('', text)
         return text
 
     def remove_phone_numbers(self, text):
         """Hapus nomor telepon"""
-        text = re.sub(r'[\+]?[0-9]{2,}[\s\-]?[0-9]{2,}[\s\-]?[0-9]{2,}[\s\-]?[0-9]{2,}', '', text)
+        text = self.regex['phone'].sub('', text)
         return text
 
     def clean_whitespace_characters(self, text):
         """Bersihkan karakter whitespace tidak terlihat"""
-        text = re.sub(r'[\u200B-\u200D\uFEFF]', '', text)
-        text = re.sub(r'&nbsp;', ' ', text)
+        text = self.regex['zero_width'].sub('', text)
+        text = self.regex['nbsp'].sub(' ', text)
         return text
 
     # ===== IMPROVED CHARACTER NORMALIZATION =====
@@ -592,8 +956,9 @@ class JudolTextCleaner:
         text = unicodedata.normalize('NFKD', text)
         
         # Step 3: Replace extended characters
-        for char, replacement in self.extended_char_map.items():
-            text = text.replace(char, replacement)
+        for chars, replacement in self.multi_char_replacements:
+            text = text.replace(chars, replacement)
+        text = text.translate(self.char_translation)
         
         # Step 4: Remove diacritics (accents)
         text = ''.join(c for c in text if not unicodedata.combining(c))
@@ -602,50 +967,21 @@ class JudolTextCleaner:
         text = unidecode(text)
         
         # Step 6: Remove extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = self.regex['whitespace'].sub(' ', text).strip()
         
         return text
 
     def clean_brackets_and_special_chars(self, text):
         """Bersihkan brackets dan karakter khusus secara terpisah"""
         # Hapus semua brackets dan karakter khusus, ganti dengan spasi
-        text = re.sub(r'[【】『』〖〗「」｢｣〔〕〈〉《»«〝〞＂‟〟：；，。、！？～‧・¢@®©™]', ' ', text)
+        text = self.regex['brackets'].sub(' ', text)
         return text
 
     # ===== IMPROVED BRAND RECOGNITION =====
     def enhanced_brand_recognition(self, text):
         """Enhanced brand recognition dengan pattern matching yang lebih kuat"""
-        brand_patterns = {
-            # SGI88 variations
-            r'\b[sS5][gG9][iI1]88\b': 'sgi88',
-            r'\b[sS5][gG9][iI1]\s*88\b': 'sgi88', 
-            r'\b[sS5][gG9][iI1]808\b': 'sgi808',
-            r'\b[sS5][gG9][iI1]888\b': 'sgi888',
-            r'\b[sS5][gG9]188\b': 'sg188',
-            r'\b[sS5][gG9]\s*188\b': 'sg188',
-            
-            # PSTOTO99 variations
-            r'\b[pP][sS5][tT7][oO0][tT7][oO0]99\b': 'pstoto99',
-            r'\b[pP][sS5][tT7][oO0][tT7][oO0]\s*99\b': 'pstoto99',
-            r'\bpstoto\s*99\b': 'pstoto99',
-            
-            # ✅ PERBAIKI: Togel62 variations - HAPUS pattern spacing di sini
-            r'\b[tT7][oO0][gG9][eE3][lL1]62\b': 'togel62',
-            r'\b[tT7][oO0][gG9][eE3][lL1]\s*62\b': 'togel62',
-            
-            # Sendal4d variations
-            r'\b[sS5][eE3][nN][dD][aA4@][lL1]4[dD]\b': 'sendal4d',
-            r'\b[sS5][eE3][nN][dD][aA4@][lL1]\s*4[dD]\b': 'sendal4d',
-            
-            # Sekali4d variations
-            r'\b[sS5][eE3][kK][aA4@][lL1][iI1]4[dD]\b': 'sekali4d',
-            r'\b[sS5][eE3][kK][aA4@][lL1][iI1]\s*4[dD]\b': 'sekali4d',
-            
-            # Pattern lainnya tetap sama...
-        }
-        
-        for pattern, replacement in brand_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for pattern, replacement in self.brand_recognition_patterns:
+            text = pattern.sub(replacement, text)
         
         return text
 
@@ -653,76 +989,19 @@ class JudolTextCleaner:
     def fix_specific_brand_patterns(self, text):
         """Perbaiki pattern brand khusus"""
         # Pattern untuk brackets dan special characters - HAPUS saja
-        bracket_patterns = [
-            r'【.*?】', r'『.*?』', r'〖.*?〗', r'「.*?」', r'｢.*?｣',
-            r'〔.*?〕', r'〈.*?〉', r'《.*?》', r'«.*?»', r'@¢', r'®', r'©', r'™'
-        ]
-        
-        for pattern in bracket_patterns:
-            text = re.sub(pattern, ' ', text)
+        for pattern in self.bracket_patterns:
+            text = pattern.sub(' ', text)
         
         # Pattern untuk brand names - NORMALIZE tapi pertahankan sebagai SATU KATA
-        brand_patterns = {
-            # SGI88 patterns - DIPERBAIKI
-            r'sgi\s*88': 'sgi88',
-            r'sg\s*188': 'sg188', 
-            r'sgi\s*808': 'sgi808',
-            r'sgi\s*888': 'sgi888',
-            
-            # PSTOTO99 patterns - DIPERBAIKI
-            r'pstoto\s*99': 'pstoto99',
-            r'ps\s*toto\s*99': 'pstoto99',
-            
-            # Togel62 patterns - TAMBAHKAN
-            r'togel\s*62': 'togel62',
-            r't0gel\s*62': 'togel62',
-            
-            # Sendal4d patterns - TAMBAHKAN
-            r'sendal\s*4d': 'sendal4d',
-            r'sendal\s*4\s*d': 'sendal4d',
-            
-            # Sekali4d patterns - TAMBAHKAN
-            r'sekali\s*4d': 'sekali4d',
-            r'sekali\s*4\s*d': 'sekali4d',
-            
-            # "cari di google" -> pisah menjadi 3 kata terpisah
-            r'cari\s*di\s*google': 'cari di google',
-            r'cari\s*di\s*g[o0][o0]gle': 'cari di google',
-            r'çäri\s*di\s*göögle': 'cari di google',
-            r'çari\s*di\s*google': 'cari di google',
-            
-            # "lazadatoto" -> pertahankan sebagai SATU KATA
-            r'lazada\s*toto': 'lazadatoto',
-            r'lazada\s*t[o0]t[o0]': 'lazadatoto',
-            r'lazada\s*4d': 'lazada4d',
-            
-            # "garudahoki" -> pertahankan sebagai SATU KATA
-            r'ga\s*ruda\s*ho\s*ki': 'garudahoki',
-            r'ga\s*ruda\s*hoki': 'garudahoki',
-            r'garuda\s*ho\s*ki': 'garudahoki',
-            r'garuda\s*hoki': 'garudahoki',
-        }
-        
-        for pattern, replacement in brand_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for pattern, replacement in self.specific_brand_patterns:
+            text = pattern.sub(replacement, text)
         
         return text
 
     def fix_brand_spacing(self, text):
         """Perbaiki spacing khusus untuk brand names - VERSI DIPERBAIKI"""
-        # Pattern untuk memastikan brand names memiliki spasi yang tepat
-        brand_spacing_patterns = {
-            # ✅ PERBAIKI: Gunakan word boundaries dan pastikan spasi konsisten
-            r'\b(\w{2,})(togel62|sendal4d|sekali4d|sgi88|sg188|sgi808|sgi888|pstoto99)\b': r'\1 \2',
-            r'\b(togel62|sendal4d|sekali4d|sgi88|sg188|sgi808|sgi888|pstoto99)(\w{2,})\b': r'\1 \2',
-            
-            # Handle kasus khusus dengan karakter tunggal
-            r'\b(\w{1})(togel62|sendal4d|sekali4d)\b': r'\1 \2',
-            r'\b(togel62|sendal4d|sekali4d)(\w{1})\b': r'\1 \2',
-        }
-        
-        for pattern, replacement in brand_spacing_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for pattern, replacement in self.brand_spacing_patterns:
+            text = pattern.sub(replacement, text)
         
         return text
 
@@ -731,26 +1010,14 @@ class JudolTextCleaner:
         # ✅ PERBAIKI: Jangan tambahkan brand baru di sini, gunakan yang sudah ada di __init__
         
         # Normalize spacing terlebih dahulu
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = self.regex['whitespace'].sub(' ', text).strip()
         
-        # Urutkan dari yang terpanjang ke terpendek untuk menghindari partial matching
-        sorted_brands = sorted(self.preserved_brands.keys(), key=len, reverse=True)
+        # Pattern 1: Brand sebagai kata utuh dengan boundaries (satu pass untuk semua brand)
+        text = self.preserved_brand_pattern.sub(self.preserved_brand_replacement, text)
         
-        for brand in sorted_brands:
-            preserved_form = self.preserved_brands[brand]
-            
-            # ✅ PERBAIKI: Gunakan pattern yang lebih spesifik
-            # Pattern 1: Brand sebagai kata utuh dengan boundaries
-            pattern1 = r'\b' + re.escape(brand) + r'\b'
-            text = re.sub(pattern1, preserved_form, text, flags=re.IGNORECASE)
-            
-            # Pattern 2: Brand dengan spasi internal (sgi 88 -> sgi88)
-            if any(char.isdigit() for char in brand):
-                # Untuk brand dengan angka, buat pattern dengan optional spaces
-                chars = list(brand)
-                spaced_pattern = r'\s*'.join(re.escape(char) for char in chars)
-                pattern2 = r'\b' + spaced_pattern + r'\b'
-                text = re.sub(pattern2, preserved_form, text, flags=re.IGNORECASE)
+        # Pattern 2: Brand dengan spasi internal (sgi 88 -> sgi88), terpanjang dulu
+        for pattern, preserved_form in self.spaced_brand_patterns:
+            text = pattern.sub(preserved_form, text)
         
         return text
 
@@ -758,17 +1025,10 @@ class JudolTextCleaner:
     def fix_common_combinations(self, text):
         """Perbaiki kombinasi kata yang sering dipisah"""
         # Normalize spacing terlebih dahulu
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Urutkan kombinasi dari yang terpanjang ke terpendek
-        sorted_combinations = sorted(self.common_combinations.items(), 
-                                   key=lambda x: len(x[0]), reverse=True)
+        text = self.regex['whitespace'].sub(' ', text).strip()
         
-        for combination, replacement in sorted_combinations:
-            # Gunakan regex untuk matching yang lebih fleksibel
-            pattern = r'\b' + re.escape(combination) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        # Satu pass untuk semua kombinasi (alternation terpanjang dulu)
+        text = self.combination_pattern.sub(self.combination_replacement, text)
         
         return text
 
@@ -806,8 +1066,7 @@ class JudolTextCleaner:
             
         elif self.number_replacement_strategy == 'smart':
             # Hanya ganti angka pada kata-kata leet speak yang diketahui
-            for leet_word, normal_word in self.leet_speak_indonesia.items():
-                text = re.sub(r'\b' + re.escape(leet_word) + r'\b', normal_word, text, flags=re.IGNORECASE)
+            text = self.leet_pattern.sub(self.leet_replacement, text)
             
         # 'preserve' strategy tidak melakukan apa-apa terhadap angka
         
@@ -832,52 +1091,8 @@ class JudolTextCleaner:
     # ===== WORD RECONSTRUCTION METHODS =====
     def advanced_word_reconstruction(self, text):
         """Rekonstruksi yang lebih advanced dengan pattern matching - DIPERBAIKI"""
-        # Pattern untuk kata yang sering dipisah - DIPERBAIKI
-        separation_patterns = {
-            # SGI88 variations - DIPERBAIKI
-            r'\b(s)\s*(g)\s*(i)\s*(8)\s*(8)\b': 'sgi88',
-            r'\b(s\s*g\s*i\s*8\s*8)\b': 'sgi88',
-            r'\b(sg)\s*(i88)\b': 'sgi88',
-            r'\b(sgi)\s*(88)\b': 'sgi88',
-            
-            # PSTOTO99 variations - DIPERBAIKI
-            r'\b(p)\s*(s)\s*(t)\s*(o)\s*(t)\s*(o)\s*(9)\s*(9)\b': 'pstoto99',
-            r'\b(p\s*s\s*t\s*o\s*t\s*o\s*9\s*9)\b': 'pstoto99',
-            r'\b(pstoto)\s*(99)\b': 'pstoto99',
-            r'\b(ps)\s*(toto)\s*(99)\b': 'pstoto99',
-            
-            # Togel62 variations - TAMBAHKAN
-            r'\b(t)\s*(o)\s*(g)\s*(e)\s*(l)\s*(6)\s*(2)\b': 'togel62',
-            r'\b(t\s*o\s*g\s*e\s*l\s*6\s*2)\b': 'togel62',
-            r'\b(togel)\s*(62)\b': 'togel62',
-            
-            # Sendal4d variations - TAMBAHKAN
-            r'\b(s)\s*(e)\s*(n)\s*(d)\s*(a)\s*(l)\s*(4)\s*(d)\b': 'sendal4d',
-            r'\b(s\s*e\s*n\s*d\s*a\s*l\s*4\s*d)\b': 'sendal4d',
-            r'\b(sendal)\s*(4d)\b': 'sendal4d',
-            
-            # Sekali4d variations - TAMBAHKAN
-            r'\b(s)\s*(e)\s*(k)\s*(a)\s*(l)\s*(i)\s*(4)\s*(d)\b': 'sekali4d',
-            r'\b(s\s*e\s*k\s*a\s*l\s*i\s*4\s*d)\b': 'sekali4d',
-            r'\b(sekali)\s*(4d)\b': 'sekali4d',
-            
-            # Pulauwin variations
-            r'\b(p)\s*(u)\s*(l)\s*(a)\s*(u)\s*(w)\s*(i)\s*(n)\b': 'pulauwin',
-            r'\b(p\s*u\s*l\s*a\s*u\s*w\s*i\s*n)\b': 'pulauwin',
-            r'\b(pula)\s*(uwin)\b': 'pulauwin',
-            r'\b(pulau)\s*(win)\b': 'pulauwin',
-            
-            # Arwanatoto variations
-            r'\b(a)\s*(r)\s*(w)\s*(a)\s*(n)\s*(a)\s*(t)\s*(o)\s*(t)\s*(o)\b': 'arwanatoto',
-            r'\b(arwana)\s*(toto)\b': 'arwanatoto',
-            
-            # Garudahoki variations
-            r'\b(g)\s*(a)\s*(r)\s*(u)\s*(d)\s*(a)\s*(h)\s*(o)\s*(k)\s*(i)\b': 'garudahoki',
-            r'\b(garuda)\s*(hoki)\b': 'garudahoki',
-        }
-        
-        for pattern, replacement in separation_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for pattern, replacement in self.word_separation_patterns:
+            text = pattern.sub(replacement, text)
         
         return text
 
@@ -1000,8 +1215,7 @@ class JudolTextCleaner:
     def decode_leet_speak_indonesia(self, text):
         """Decode leet speak khusus bahasa Indonesia"""
         # Step 1: Replace known leet speak patterns
-        for leet_word, normal_word in self.leet_speak_indonesia.items():
-            text = re.sub(r'\b' + re.escape(leet_word) + r'\b', normal_word, text, flags=re.IGNORECASE)
+        text = self.leet_pattern.sub(self.leet_replacement, text)
         
         return text
 
@@ -1076,19 +1290,16 @@ class JudolTextCleaner:
     def handle_domain_numbers(self, text):
         """Handle angka di domain dengan strategi yang berbeda"""
         if self.domain_number_strategy == 'remove':
-            for domain in self.judol_domains:
-                pattern = r'\b(' + domain + r')(\d{2,3})\b'
-                text = re.sub(pattern, r'\1', text, flags=re.IGNORECASE)
+            for pattern in self.domain_number_patterns:
+                text = pattern.sub(r'\1', text)
             
         elif self.domain_number_strategy == 'preserve':
-            for domain in self.judol_domains:
-                pattern = r'\b(' + domain + r')(\d{2,3})\b'
-                text = re.sub(pattern, r'\1 \2', text, flags=re.IGNORECASE)
+            for pattern in self.domain_number_patterns:
+                text = pattern.sub(r'\1 \2', text)
             
         elif self.domain_number_strategy == 'separate_token':
-            for domain in self.judol_domains:
-                pattern = r'\b(' + domain + r')(\d{2,3})\b'
-                text = re.sub(pattern, r'\1 [DOMAIN_NUMBER]', text, flags=re.IGNORECASE)
+            for pattern in self.domain_number_patterns:
+                text = pattern.sub(r'\1 [DOMAIN_NUMBER]', text)
             
         return text
 
@@ -1111,33 +1322,36 @@ class JudolTextCleaner:
 
     def remove_repeated_chars(self, text):
         """Kurangi karakter berulang berlebihan"""
-        text = re.sub(r'([a-zA-Z])\1{2,}', r'\1\1', text)
+        text = self.regex['repeated_chars'].sub(r'\1\1', text)
         return text
 
     def handle_repeated_words(self, text):
         """Handle kata yang diulang-ulang"""
-        text = re.sub(r'\b(\w+)(?:\s+\1\b)+', r'\1', text)
+        text = self.regex['repeated_words'].sub(r'\1', text)
         return text
 
     # ===== SPACING CLEANING =====
     def fix_advanced_spacing(self, text):
         """Perbaiki spacing"""
-        text = re.sub(r'\s+', ' ', text)
+        text = self.regex['whitespace'].sub(' ', text)
         return text.strip()
 
     # ===== SPECIAL CHARACTER CLEANING =====
     def clean_special_characters(self, text):
         """Bersihkan karakter khusus seperti @@ dan lainnya"""
         # Hapus karakter khusus seperti @@, **, dll
-        text = re.sub(r'[@#\$%\^&\*\(\)_\+=\[\]\{\};:"\\|<>/~`]', ' ', text)
+        text = self.regex['special_symbols'].sub(' ', text)
         # Hapus multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = self.regex['whitespace'].sub(' ', text)
         return text.strip()
 
     # ===== IMPROVED CLEANING PIPELINE =====
-    def clean_comprehensive(self, text, aggressive=True):
+    def clean_comprehensive(self, text, aggressive=True, verbose=None):
         """
         Pipeline cleaning komprehensif untuk teks judol - VERSI DIPERBAIKI
+        
+        verbose=None memakai self.verbose; jika self.profiler aktif, waktu dan
+        perubahan setiap step direkam di sana.
         """
         if not isinstance(text, str) or not text.strip():
             return ""
@@ -1182,40 +1396,72 @@ class JudolTextCleaner:
         ]
         
         # Add aggressive cleaning steps if enabled
+        # stem_text tidak diulang: hasil stem Sastrawi sudah berupa kata dasar
+        # (stem(stem(w)) == stem(w)), jadi stem kedua tidak mengubah teks
         if aggressive:
             aggressive_steps = [
                 self.selective_stopword_removal,
-                self.stem_text,
                 self.fix_advanced_spacing,
             ]
             steps.extend(aggressive_steps)
         
+        verbose = self.verbose if verbose is None else verbose
+        profiler = self.profiler
+        guards = self.step_guards if self.fast_path else {}
+        
         # Execute cleaning pipeline
         cleaned_text = text
-        print(f"Original: {text}")
+        if verbose:
+            print(f"Original: {text}")
         for step in steps:
+            # Fast path: lewati step yang pasti tidak mengubah teks
+            guard = guards.get(step.__name__)
+            if guard is not None and self._is_plain_text(cleaned_text) and not guard(cleaned_text):
+                if profiler is not None:
+                    profiler.record_skip(step.__name__)
+                continue
+            
+            previous_text = cleaned_text
+            error = False
+            started = time.perf_counter() if profiler is not None else 0.0
             try:
-                previous_text = cleaned_text
                 cleaned_text = step(cleaned_text)
-                
-                # Debug: Cetak perubahan jika ada
-                if previous_text != cleaned_text:
-                    print(f"After {step.__name__}: {cleaned_text}")
-                   
-                    
-                if not cleaned_text.strip():
-                    return ""
             except Exception as e:
+                error = True
                 print(f"Error in {step.__name__}: {e}")
+            
+            if profiler is not None:
+                profiler.record(step.__name__, time.perf_counter() - started,
+                                previous_text != cleaned_text, error)
+            if error:
                 continue
-                
-        cleaned_text = self.preserve_brand_names_in_text(cleaned_text)
-
-        print("-" * 100)
+            
+            # Debug: Cetak perubahan jika ada
+            if verbose and previous_text != cleaned_text:
+                print(f"After {step.__name__}: {cleaned_text}")
+            
+            if not cleaned_text.strip():
+                return ""
+        
+        guard = guards.get('preserve_brand_names_in_text')
+        if guard is not None and self._is_plain_text(cleaned_text) and not guard(cleaned_text):
+            if profiler is not None:
+                profiler.record_skip('final_preserve_brand_names')
+        else:
+            previous_text = cleaned_text
+            started = time.perf_counter() if profiler is not None else 0.0
+            cleaned_text = self.preserve_brand_names_in_text(cleaned_text)
+            if profiler is not None:
+                profiler.record('final_preserve_brand_names', time.perf_counter() - started,
+                                previous_text != cleaned_text)
+
+        if verbose:
+            print("-" * 100)
         return cleaned_text
 
     # ===== BATCH PROCESSING =====
-    def clean_dataset(self, df, text_column='text', new_column='cleaned_text', aggressive=True):
+    def clean_dataset(self, df, text_column='text', new_column='cleaned_text', aggressive=True,
+                      workers=None, chunksize=500):
         """
         Clean entire dataset
         
@@ -1224,14 +1470,58 @@ class JudolTextCleaner:
         text_column (str): Nama kolom teks
         new_column (str): Nama kolom hasil cleaning
         aggressive (bool): Mode aggressive cleaning
+        workers (int): Jumlah proses paralel (None/1 = single process)
+        chunksize (int): Jumlah teks per chunk yang dikirim ke satu worker
         """
-        tqdm.pandas(desc="Cleaning texts")
-        df[new_column] = df[text_column].progress_apply(
-            lambda x: self.clean_comprehensive(x, aggressive=aggressive)
-        )
+        if not workers or workers <= 1:
+            tqdm.pandas(desc="Cleaning texts")
+            df[new_column] = df[text_column].progress_apply(
+                lambda x: self.clean_comprehensive(x, aggressive=aggressive)
+            )
+            return df
         
+        df[new_column] = self.clean_texts_parallel(
+            df[text_column].tolist(), aggressive=aggressive, workers=workers, chunksize=chunksize
+        )
         return df
 
+    def clean_texts_parallel(self, texts, aggressive=True, workers=None, chunksize=500):
+        """
+        Clean list of texts dengan process pool. Setiap worker membuat
+        JudolTextCleaner (dan stemmer Sastrawi) sendiri satu kali di initializer.
+        Urutan hasil sama dengan urutan input.
+        """
+        workers = workers or os.cpu_count()
+        chunks = [texts[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+        results = [None] * len(chunks)
+        
+        # Script ini biasanya di-load lewat importlib (nama file ada spasinya), jadi worker
+        # 'spawn' tidak bisa meng-import ulang modulnya. Pakai fork jika platform mendukung.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork') if 'fork' in methods else None
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_cleaning_worker,
+            initargs=(self.domain_number_strategy, self.number_replacement_strategy, get_stem_cache().path,
+                      self.verbose, self.profiler is not None),
+        ) as executor:
+            futures = {
+                executor.submit(_clean_chunk, chunk, aggressive): index
+                for index, chunk in enumerate(chunks)
+            }
+            with tqdm(total=len(texts), desc=f"Cleaning texts ({workers} workers)") as progress:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index], new_stems, profile_records = future.result()
+                    # Kata dasar baru & profil dari worker digabung ke proses utama
+                    get_stem_cache().update(new_stems)
+                    if profile_records is not None:
+                        self.profiler.merge(profile_records)
+                    progress.update(len(chunks[index]))
+        
+        return [cleaned for chunk_result in results for cleaned in chunk_result]
+
     # ===== ANALYSIS METHODS =====
     def analyze_cleaning_result(self, original_text, cleaned_text):
         """Analisis hasil cleaning"""
@@ -1262,35 +1552,128 @@ class JudolTextCleaner:
         return len(found_keywords) > 0, found_keywords
 
 
-df = pd.read_csv('comments_from_scraping.csv')
-
-cleaner = JudolTextCleaner()
- 
-for i, text in enumerate(df["comment_text"], 1):
-    cleaned = cleaner.clean_comprehensive(text)
-    
-    df.loc[i-1, "comment_text"] = cleaned
-
-
-empty_comments = df[df['comment_text'].str.strip() == '']
-print(f"Jumlah komentar yang kosong: {len(empty_comments)}")
-print(f"Persentase: {(len(empty_comments) / len(df)) * 100:.2f}%")
-
-
-
-df = df[df['comment_text'].str.strip().astype(bool)].reset_index(drop=True)
-
-output_filename = 'cleaned_comments.csv'
-columns_to_save = [
-    col for col in [
-        'Unnamed: 0', 'comment_id', 'video_id', 'author', 
-        'comment_text', 'published_at', 'like_count'
-    ] if col in df.columns
-]
-
-
-
-df[columns_to_save].to_csv(output_filename, index=False, encoding='utf-8')
-print(f"\n✅ Data ultimate disimpan ke: {output_filename}")
-print(f"📊 Total baris: {len(df)}")
 
+# ===== PROCESS POOL WORKER =====
+# Cleaner per proses worker, dibuat sekali oleh initializer
+_worker_cleaner = None
+
+
+def _init_cleaning_worker(domain_number_strategy, number_replacement_strategy, stem_cache_path=None,
+                          verbose=False, profile=False):
+    global _worker_cleaner
+    get_stemmer(stem_cache_path)
+    _worker_cleaner = JudolTextCleaner(domain_number_strategy, number_replacement_strategy, verbose=verbose,
+                                       profile=profile)
+
+
+def _clean_chunk(texts, aggressive):
+    cleaned = [_worker_cleaner.clean_comprehensive(text, aggressive=aggressive) for text in texts]
+    profile_records = None
+    if _worker_cleaner.profiler is not None:
+        profile_records = _worker_cleaner.profiler.records()
+        _worker_cleaner.profiler.reset()
+    return cleaned, get_stem_cache().pop_new_entries(), profile_records
+
+
+def verify_fast_path(input_file='comments_from_scraping.csv', limit=None, aggressive=True):
+    """
+    Differential check: cleaning dengan fast path (step guards) harus identik
+    dengan pipeline penuh untuk setiap komentar di input_file.
+    Return list of (index, text, expected, actual) yang berbeda (kosong = lolos).
+    """
+    df = read_table(input_file, columns=['comment_text'])
+    texts = df['comment_text'].tolist()
+    if limit:
+        texts = texts[:limit]
+
+    full_cleaner = JudolTextCleaner(fast_path=False)
+    fast_cleaner = JudolTextCleaner(fast_path=True, profile=True)
+    mismatches = []
+    for index, text in enumerate(tqdm(texts, desc="Verifying fast path")):
+        expected = full_cleaner.clean_comprehensive(text, aggressive=aggressive)
+        actual = fast_cleaner.clean_comprehensive(text, aggressive=aggressive)
+        if expected != actual:
+            mismatches.append((index, text, expected, actual))
+
+    skipped = fast_cleaner.profiler.to_frame()[['step', 'calls', 'skipped']]
+    print(skipped.to_string(index=False))
+    print(f"{len(texts)} komentar diverifikasi, {len(mismatches)} berbeda")
+    for index, text, expected, actual in mismatches[:20]:
+        print(f"[{index}] {text!r}\n  full: {expected!r}\n  fast: {actual!r}")
+    return mismatches
+
+
+def clean_comments(df, cleaner=None, new_column='comment_text', workers=None, chunksize=500):
+    """Clean kolom comment_text ke `new_column`, lalu buang komentar yang jadi kosong"""
+    cleaner = cleaner or JudolTextCleaner()
+    df = cleaner.clean_dataset(df, text_column='comment_text', new_column=new_column,
+                               workers=workers, chunksize=chunksize)
+
+    empty_comments = df[df[new_column].str.strip() == '']
+    print(f"Jumlah komentar yang kosong: {len(empty_comments)}")
+    print(f"Persentase: {(len(empty_comments) / len(df)) * 100:.2f}%")
+
+    return df[df[new_column].str.strip().astype(bool)].reset_index(drop=True)
+
+
+def main(input_file='comments_from_scraping.csv', output_file='cleaned_comments.csv', workers=None,
+         chunksize=500, stem_cache_path=None, verbose=False, profile_path=None, quarantine=False):
+    df = read_table(input_file, quarantine=quarantine)
+
+    # Cache kata dasar dari run sebelumnya (jika ada)
+    stem_cache = get_stemmer(stem_cache_path).get_cache()
+
+    cleaner = JudolTextCleaner(verbose=verbose, profile=bool(profile_path))
+    df = clean_comments(df, cleaner, workers=workers, chunksize=chunksize)
+    if stem_cache_path:
+        stem_cache.save()
+        print(f"Stem cache: {stem_cache.stats()['entries']} kata disimpan ke {stem_cache_path}")
+    if profile_path:
+        cleaner.profiler.save(profile_path)
+        print(cleaner.profiler.report(top=10))
+        print(f"Profil per step disimpan ke: {profile_path}")
+
+    columns_to_save = [
+        col for col in [
+            'Unnamed: 0', 'comment_id', 'video_id', 'author', 
+            'comment_text', 'published_at', 'like_count'
+        ] if col in df.columns
+    ]
+
+    write_table(df[columns_to_save], output_file)
+    print(f"\n✅ Data ultimate disimpan ke: {output_file}")
+    print(f"📊 Total baris: {len(df)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleaning komentar judol")
+    parser.add_argument('--input', default=None,
+                        help="comments_from_scraping.parquet/.csv (default: yang tersedia)")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default=None,
+                        help="Format output jika --output tidak diisi (default: parquet jika pyarrow ada)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Jumlah proses paralel (1 = single process)")
+    parser.add_argument('--chunksize', type=int, default=500,
+                        help="Jumlah komentar per chunk untuk satu worker")
+    parser.add_argument('--stem-cache', default=None,
+                        help="File JSON cache kata dasar Sastrawi (dimuat lalu disimpan lagi)")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Cetak teks asli dan perubahan di setiap step")
+    parser.add_argument('--profile', default=None,
+                        help="Simpan profil waktu per step ke file .json atau .csv")
+    parser.add_argument('--verify-fast-path', action='store_true',
+                        help="Bandingkan output fast path dengan pipeline penuh untuk --input, lalu keluar")
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Batasi jumlah komentar untuk --verify-fast-path")
+    parser.add_argument('--quarantine', action='store_true',
+                        help="Tulis baris CSV rusak di input ke <input>.quarantine.csv")
+    args = parser.parse_args()
+    input_file = args.input or stage_file('comments_from_scraping')
+    output_file = args.output or stage_file('cleaned_comments', args.format or default_format())
+
+    if args.verify_fast_path:
+        sys.exit(1 if verify_fast_path(input_file, args.limit) else 0)
+
+    main(input_file, output_file, args.workers, args.chunksize, args.stem_cache, args.verbose, args.profile,
+         args.quarantine)
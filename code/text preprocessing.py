@@ -4,45 +4,37 @@
 # In[1]:
 
 
+import argparse
 import re
 import unicodedata
 import emoji
-import pandas as pd
 from unidecode import unidecode
 import ftfy
 from cleantext import clean
 import nltk
 from tqdm import tqdm
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-
-
-# In[ ]:
-
-
-tqdm.pandas()
-
-
-# In[2]:
-
-
-df = pd.read_csv('comments_from_scraping.csv')
-
-
-# In[3]:
+import os
+import sys
 
-
-comments = df['comment_text']
+# stemming.py ada di root repo, satu level di atas folder code/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stemming import get_stemmer
+from storage import default_format, read_table, stage_file, write_table
+from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 
 
 # In[4]:
 
 
-factory = StopWordRemoverFactory()
-stopword_remover = factory.create_stop_word_remover()
+# Dibuat saat pertama dipakai, supaya modul ini bisa di-import tanpa efek samping
+_stopword_remover = None
+
 
-factory_stemmer = StemmerFactory()
-stemmer = factory_stemmer.create_stemmer()
+def get_stopword_remover():
+    global _stopword_remover
+    if _stopword_remover is None:
+        _stopword_remover = StopWordRemoverFactory().create_stop_word_remover()
+    return _stopword_remover
 
 
 # In[5]:
@@ -566,8 +558,9 @@ def clean_text_for_nlp(text: str):
     # 6️⃣ Lowercase
     text = text.lower()
 
-    text = stopword_remover.remove(text)
-    text = stemmer.stem(text)
+    text = get_stopword_remover().remove(text)
+    # Stemmer bersama dengan cache kata dasar (tiap kata unik hanya di-stem sekali)
+    text = get_stemmer().stem(text)
     
     return text
 
@@ -588,41 +581,39 @@ def clean_text_for_nlp(text: str):
 # In[ ]:
 
 
-df['cleaned_comment_text'] = df['comment_text'].progress_apply(clean_text_for_nlp)
-
-
-# In[ ]:
-
-
-df = df[df['cleaned_comment_text'].str.strip() != '']
-
-
-# In[ ]:
-
-
-df = df[df['cleaned_comment_text'].str.split().str.len() > 1]
-
-
-# In[ ]:
-
-
-df = df[~df['cleaned_comment_text'].str.contains(r'\b\d{1,2}:\d{2}\b')]
-
-
-# In[ ]:
-
-
-df = df[~df['cleaned_comment_text'].str.fullmatch(r'\d+')]
-
-
-# In[ ]:
-
-
-df = df.reset_index(drop=True)
-
-
-# In[ ]:
-
-
-df.to_csv("cleaned_comments.csv", index=False)
-
+def preprocess_comments(df, progress=True):
+    """Tambah kolom cleaned_comment_text lalu buang komentar kosong, satu kata, timestamp, atau angka saja"""
+    df = df.copy()
+    if progress:
+        tqdm.pandas(desc="Preprocessing")
+        df['cleaned_comment_text'] = df['comment_text'].progress_apply(clean_text_for_nlp)
+    else:
+        df['cleaned_comment_text'] = df['comment_text'].apply(clean_text_for_nlp)
+
+    df = df[df['cleaned_comment_text'].str.strip() != '']
+    df = df[df['cleaned_comment_text'].str.split().str.len() > 1]
+    df = df[~df['cleaned_comment_text'].str.contains(r'\b\d{1,2}:\d{2}\b')]
+    df = df[~df['cleaned_comment_text'].str.fullmatch(r'\d+')]
+    return df.reset_index(drop=True)
+
+
+def main(input_file='comments_from_scraping.csv', output_file='cleaned_comments.csv', quarantine=False):
+    df = preprocess_comments(read_table(input_file, quarantine=quarantine))
+    write_table(df, output_file)
+    print(f"✅ {len(df)} komentar disimpan ke: {output_file}")
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preprocessing komentar (cleaned_comment_text)")
+    parser.add_argument('--input', default=None,
+                        help="comments_from_scraping.parquet/.csv (default: yang tersedia)")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default=None,
+                        help="Format output jika --output tidak diisi (default: parquet jika pyarrow ada)")
+    parser.add_argument('--quarantine', action='store_true',
+                        help="Tulis baris CSV rusak di input ke <input>.quarantine.csv")
+    args = parser.parse_args()
+    main(args.input or stage_file('comments_from_scraping'),
+         args.output or stage_file('cleaned_comments', args.format or default_format()),
+         args.quarantine)
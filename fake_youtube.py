@@ -0,0 +1,209 @@
+import hashlib
+import threading
+import time
+
+
+class FakeHttpError(Exception):
+    """Meniru pesan googleapiclient HttpError (scraping.py hanya membaca str(e))"""
+
+    def __init__(self, status, reason, message):
+        self.status = status
+        self.reason = reason
+        super().__init__(
+            f'<HttpError {status} returned "{message}". Details: "[{{\'reason\': \'{reason}\'}}]">'
+        )
+
+
+INDONESIAN_COMMENTS = [
+    "mantap banget videonya bang, lanjutkan terus kontennya",
+    "aku sudah nonton dari awal sampai akhir dan ini seru sekali",
+    "kenapa ya hari ini susah banget dapat jackpot di situs itu",
+    "gacor parah hari ini, langsung wd lima ratus ribu di akun baru",
+    "daftar sekarang di situs terpercaya, deposit kecil bonus besar",
+    "semoga sehat selalu dan terus berkarya untuk kita semua",
+    "lagu ini mengingatkan aku sama masa kecil di kampung halaman",
+    "jangan main judi online, uang habis keluarga jadi korban",
+    "bagus sekali penjelasannya, saya jadi paham sekarang",
+    "rtp slot lagi tinggi, buruan main sebelum turun lagi bosku",
+]
+OTHER_COMMENTS = [
+    "this is the best video I have watched all week, thanks a lot",
+    "who is still listening to this song in the middle of the night",
+    "great explanation, please make another one about this topic",
+]
+SHORT_COMMENTS = ["wkwk", "🔥🔥", "gg", "mantul"]
+
+
+def _digest(*parts):
+    payload = '\x00'.join(str(part) for part in parts)
+    return int(hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12], 16)
+
+
+class FakeRequest:
+    def __init__(self, backend, key, endpoint, params):
+        self.backend = backend
+        self.key = key
+        self.endpoint = endpoint
+        self.params = params
+
+    def execute(self):
+        return self.backend.execute(self.key, self.endpoint, self.params)
+
+
+class FakeResource:
+    def __init__(self, backend, key, endpoint):
+        self.backend = backend
+        self.key = key
+        self.endpoint = endpoint
+
+    def list(self, **params):
+        return FakeRequest(self.backend, self.key, self.endpoint, params)
+
+
+class FakeService:
+    """Pengganti objek hasil googleapiclient build('youtube', 'v3', developerKey=key)"""
+
+    def __init__(self, backend, key):
+        self.backend = backend
+        self.key = key
+
+    def search(self):
+        return FakeResource(self.backend, self.key, 'search')
+
+    def commentThreads(self):
+        return FakeResource(self.backend, self.key, 'commentThreads')
+
+
+class FakeYouTube:
+    """
+    Backend YouTube Data API palsu untuk menjalankan scraping.py secara offline.
+
+    Data deterministik (diturunkan dari hash keyword / video id), jadi hasilnya
+    sama berapa pun jumlah thread dan urutan request. Mendukung:
+    - search().list: video id per keyword, sebagian overlap antar keyword
+    - commentThreads().list: halaman komentar dengan nextPageToken, sebagian
+      video komentarnya dimatikan (commentsDisabled), dilarang (403), atau kosong;
+      order='time' mengurutkan terbaru dulu seperti API
+    - add_comments: komentar baru (lebih baru dari semua komentar lama) untuk
+      menguji scraping inkremental
+    - kuota per API key (unit: search=100, commentThreads=1) -> quotaExceeded
+    - latency per request untuk mensimulasikan jaringan
+
+    Pakai `FakeYouTube().service` sebagai service_factory di scraping.main().
+    """
+
+    UNIT_COSTS = {'search': 100, 'commentThreads': 1}
+
+    def __init__(self, seed=0, video_pool=400, videos_per_keyword=120, max_comments=700,
+                 quota_per_key=None, latency=0.0):
+        self.seed = seed
+        self.video_pool = video_pool
+        self.videos_per_keyword = videos_per_keyword
+        self.max_comments = max_comments
+        self.quota_per_key = quota_per_key
+        self.latency = latency
+        self.units_used = {}
+        self.new_comments = {}
+        self.calls = {'search': 0, 'commentThreads': 0}
+        self._lock = threading.Lock()
+
+    def service(self, key):
+        return FakeService(self, key)
+
+    # ----- data -----
+    def keyword_videos(self, keyword):
+        return [
+            f"fakevid{_digest(self.seed, 'search', keyword, i) % self.video_pool:04d}"
+            for i in range(self.videos_per_keyword)
+        ]
+
+    def video_comments(self, video_id):
+        count = _digest(self.seed, 'count', video_id) % self.max_comments
+        comments = list(self.new_comments.get(video_id, []))
+        for i in range(count):
+            h = _digest(self.seed, 'comment', video_id, i)
+            bucket = h % 10
+            if bucket < 7:
+                text = INDONESIAN_COMMENTS[h % len(INDONESIAN_COMMENTS)]
+            elif bucket < 9:
+                text = OTHER_COMMENTS[h % len(OTHER_COMMENTS)]
+            else:
+                text = SHORT_COMMENTS[h % len(SHORT_COMMENTS)]
+            day = 1 + h % 28
+            hour = h % 24
+            comments.append({
+                "snippet": {
+                    "topLevelComment": {
+                        "snippet": {
+                            "textOriginal": text,
+                            "authorDisplayName": f"@user{h % 5000}",
+                            "publishedAt": f"2025-10-{day:02d}T{hour:02d}:00:{i % 60:02d}Z",
+                            "likeCount": h % 50,
+                        }
+                    }
+                }
+            })
+        return comments
+
+    def add_comments(self, video_id, texts):
+        """Komentar baru untuk video_id (November, setelah semua komentar bawaan yang bertanggal Oktober)"""
+        with self._lock:
+            comments = self.new_comments.setdefault(video_id, [])
+            for text in texts:
+                minute = len(comments)
+                comments.insert(0, {
+                    "snippet": {
+                        "topLevelComment": {
+                            "snippet": {
+                                "textOriginal": text,
+                                "authorDisplayName": f"@new{minute}",
+                                "publishedAt": f"2025-11-01T00:{minute:02d}:00Z",
+                                "likeCount": 0,
+                            }
+                        }
+                    }
+                })
+
+    # ----- endpoint -----
+    def _charge(self, key, endpoint):
+        cost = self.UNIT_COSTS[endpoint]
+        with self._lock:
+            used = self.units_used.get(key, 0)
+            if self.quota_per_key is not None and used + cost > self.quota_per_key:
+                raise FakeHttpError(403, 'quotaExceeded', 'The request cannot be completed because you have exceeded your quota.')
+            self.units_used[key] = used + cost
+            self.calls[endpoint] += 1
+
+    def execute(self, key, endpoint, params):
+        if self.latency:
+            time.sleep(self.latency)
+        self._charge(key, endpoint)
+        if endpoint == 'search':
+            return self._search(params)
+        return self._comment_threads(params)
+
+    @staticmethod
+    def _page(items, page_token, page_size):
+        start = int(page_token[1:]) if page_token else 0
+        page = items[start:start + page_size]
+        response = {"items": page}
+        if start + page_size < len(items):
+            response["nextPageToken"] = f"p{start + page_size}"
+        return response
+
+    def _search(self, params):
+        videos = [{"id": {"videoId": video_id}} for video_id in self.keyword_videos(params["q"])]
+        return self._page(videos, params.get("pageToken"), params.get("maxResults", 5))
+
+    def _comment_threads(self, params):
+        video_id = params["videoId"]
+        h = _digest(self.seed, 'video', video_id)
+        if h % 11 == 0:
+            raise FakeHttpError(403, 'commentsDisabled',
+                                f'The video identified by the videoId parameter {video_id} has disabled comments.')
+        if h % 17 == 0:
+            raise FakeHttpError(403, 'forbidden', 'The request is not properly authorized.')
+        comments = self.video_comments(video_id)
+        if params.get("order") == "time":
+            comments.sort(key=lambda item: item["snippet"]["topLevelComment"]["snippet"]["publishedAt"], reverse=True)
+        return self._page(comments, params.get("pageToken"), params.get("maxResults", 20))
@@ -1,9 +1,45 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+
 import pandas as pd
-import re
 import numpy as np
 
+from matcher import TermMatcher
+from score_cache import ScoreCache
+from storage import (COLUMN_TYPES, ChunkWriter, coerce_types, default_format, iter_chunks, read_table, stage_file,
+                     table_format, write_table)
+
+# Bump when feature/score code changes, so cached scores are invalidated
+FEATURE_VERSION = 2
+
+# Text columns score_dataframe reads (the report additionally needs target)
+TEXT_COLUMNS = ['comment_text', 'cleaned_comment_text']
+
+# Calibrated raw_score -> judol_score normalization constant
+SCORE_SCALE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'judol_score_scale.txt')
+
+def load_score_scale(path=SCORE_SCALE_FILE):
+    """Read the calibrated normalization constant, None if the artifact is missing"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return float(f.read().strip())
+
+def save_score_scale(score_scale, path=SCORE_SCALE_FILE):
+    with open(path, 'w') as f:
+        f.write(repr(float(score_scale)))
+
 class FinalProductionJudolDetector:
-    def __init__(self):
+    def __init__(self, score_scale=None):
+        """
+        score_scale: fixed raw_score that maps to judol_score 10. Defaults to
+        the calibrated constant in judol_score_scale.txt, or the theoretical
+        max of the weight table if that file is missing. Being a constant, it
+        makes every comment's score independent of the batch it is in.
+        """
         self.judi_sites = [
             'lazadatoto', 'pstoto99', 'mini1221', 'arwanatoto', 'garudahoki', 'garuda hoki',
             'pulauwin', 'berkah99', 'seru69', 'pesiar88', 'sgi88', 'plazabola', 'bukit4d',
@@ -24,25 +60,80 @@ class FinalProductionJudolDetector:
             r'pasti menang', r'gampang menang', r'depo kecil', r'hasil besar'
         ]
 
-    def extract_final_features(self, df):
-        """Final optimized feature extraction"""
-        df = df.copy()
-        
-        # Prepare text
+        # Single-pass matcher over all lexicons (phrases are plain literals)
+        self.matcher = TermMatcher({
+            'judi_site': self.judi_sites,
+            'financial_term': self.financial_terms,
+            'high_confidence_phrase': self.high_confidence_phrases,
+        })
+
+        # Optimized weights based on performance analysis
+        self.weights = {
+            # Very high confidence (max precision)
+            'very_high_confidence': 12.0,
+            'site_plus_phrase': 10.0,
+            
+            # High confidence (good precision)
+            'high_confidence': 8.0,
+            'financial_plus_currency': 7.5,
+            'site_plus_multiple_financial': 7.0,
+            
+            # Medium confidence (balanced)
+            'medium_confidence': 5.0,
+            'site_plus_any_financial': 4.5,
+            
+            # Base features (recall focused)
+            'has_high_confidence_phrase': 4.0,
+            'has_judi_site': 3.0,
+            'financial_term_count': 1.2,  # Reduced to prevent over-scoring
+            'has_currency': 2.0,
+            'has_large_number': 1.0,
+        }
+
+        if score_scale is None:
+            score_scale = load_score_scale()
+        if score_scale is None:
+            score_scale = self.theoretical_max_score()
+        self.score_scale = score_scale
+
+    def term_hit_matrix(self, texts):
+        """Columnar term-document hit matrix: (bool array (len(texts), n_terms), (category, term) per column)"""
+        return self.matcher.hit_matrix(texts)
+
+    def prepare_text(self, df):
+        """Fill and combine the text columns into combined_text (in place)"""
         df['cleaned_comment_text'] = df['cleaned_comment_text'].fillna('').astype(str)
         df['comment_text'] = df['comment_text'].fillna('').astype(str)
         df['combined_text'] = (df['cleaned_comment_text'] + ' ' + df['comment_text']).str.lower()
+        return df
+
+    def extract_final_features(self, df, copy=True):
+        """Final optimized feature extraction (copy=False adds columns to df in place)"""
+        if copy:
+            df = df.copy()
         
+        # Prepare text
+        self.prepare_text(df)
+        return self.add_text_features(df)
+
+    def add_text_features(self, df):
+        """Compute every feature column from df['combined_text'] (in place)"""
         texts = df['combined_text']
         
+        # Spam templates repeat a lot: compute every feature once per unique text
+        codes, uniques = pd.factorize(texts)
+        # Same string dtype as the input: under pandas 3 the regexes below then run on the
+        # Arrow engine like a plain texts.str.contains (\b differs from Python re in non-ASCII text)
+        uniques = pd.Series(uniques, dtype=texts.dtype)
+        hits, columns = self.term_hit_matrix(uniques)
+        categories = np.array([category for category, _ in columns])
+        
         # Core features - fixed currency pattern warning
-        df['has_judi_site'] = texts.apply(lambda x: any(site in x for site in self.judi_sites)).astype(int)
-        df['financial_term_count'] = texts.apply(lambda x: sum(1 for term in self.financial_terms if term in x))
-        df['has_high_confidence_phrase'] = texts.apply(
-            lambda x: any(re.search(phrase, x) for phrase in self.high_confidence_phrases)
-        ).astype(int)
-        df['has_currency'] = texts.str.contains(r'\d+\s*(?:jt|rb|k|juta|ribu)', na=False).astype(int)  # Fixed pattern
-        df['has_large_number'] = texts.str.contains(r'\b[1-9]\d{2,}\b', na=False).astype(int)
+        df['has_judi_site'] = hits[:, categories == 'judi_site'].any(axis=1)[codes].astype(int)
+        df['financial_term_count'] = hits[:, categories == 'financial_term'].sum(axis=1)[codes].astype(np.int64)
+        df['has_high_confidence_phrase'] = hits[:, categories == 'high_confidence_phrase'].any(axis=1)[codes].astype(int)
+        df['has_currency'] = uniques.str.contains(r'\d+\s*(?:jt|rb|k|juta|ribu)', na=False).to_numpy(dtype=bool)[codes].astype(int)  # Fixed pattern
+        df['has_large_number'] = uniques.str.contains(r'\b[1-9]\d{2,}\b', na=False).to_numpy(dtype=bool)[codes].astype(int)
         
         # Strategic combinations for optimal recall/precision balance
         df['site_plus_any_financial'] = ((df['has_judi_site'] == 1) & (df['financial_term_count'] >= 1)).astype(int)
@@ -76,43 +167,40 @@ class FinalProductionJudolDetector:
         
         return df
 
-    def calculate_final_score(self, df):
-        """Final optimized scoring"""
-        df = df.copy()
-        
-        # Optimized weights based on performance analysis
-        weights = {
-            # Very high confidence (max precision)
-            'very_high_confidence': 12.0,
-            'site_plus_phrase': 10.0,
-            
-            # High confidence (good precision)
-            'high_confidence': 8.0,
-            'financial_plus_currency': 7.5,
-            'site_plus_multiple_financial': 7.0,
-            
-            # Medium confidence (balanced)
-            'medium_confidence': 5.0,
-            'site_plus_any_financial': 4.5,
-            
-            # Base features (recall focused)
-            'has_high_confidence_phrase': 4.0,
-            'has_judi_site': 3.0,
-            'financial_term_count': 1.2,  # Reduced to prevent over-scoring
-            'has_currency': 2.0,
-            'has_large_number': 1.0,
-        }
+    def theoretical_max_score(self):
+        """Highest raw_score the weight table can produce"""
+        return sum(
+            weight * (len(self.financial_terms) if feature == 'financial_term_count' else 1)
+            for feature, weight in self.weights.items()
+        )
+
+    def calculate_raw_score(self, df):
+        """Weighted sum of the feature columns (before normalization)"""
+        raw_score = pd.Series(0, index=df.index)
+        for feature, weight in self.weights.items():
+            if feature in df.columns:
+                raw_score += df[feature] * weight
+        return raw_score
+
+    def calculate_final_score(self, df, max_score=None, copy=True):
+        """
+        Final optimized scoring
+
+        max_score: normalization constant for judol_score. Defaults to
+        self.score_scale, so a comment gets the same score in any batch.
+        Scores above the constant are capped at 10.
+        """
+        if copy:
+            df = df.copy()
         
         # Calculate score
-        df['raw_score'] = 0
-        for feature, weight in weights.items():
-            if feature in df.columns:
-                df['raw_score'] += df[feature] * weight
+        df['raw_score'] = self.calculate_raw_score(df)
         
         # Normalize to 0-10 scale
-        max_score = df['raw_score'].max()
+        if max_score is None:
+            max_score = self.score_scale
         if max_score > 0:
-            df['judol_score'] = (df['raw_score'] / max_score) * 10
+            df['judol_score'] = ((df['raw_score'] / max_score) * 10).clip(upper=10)
         else:
             df['judol_score'] = 0
         
@@ -134,13 +222,58 @@ class FinalProductionJudolDetector:
         
         return df
 
-    def final_performance_report(self, df):
-        """Final performance report with business recommendations"""
-        if 'target' not in df.columns:
+    @property
+    def version(self):
+        """Hash of everything that affects a comment's score, used as cache version"""
+        config = {
+            'feature_version': FEATURE_VERSION,
+            'judi_sites': self.judi_sites,
+            'financial_terms': self.financial_terms,
+            'high_confidence_phrases': self.high_confidence_phrases,
+            'weights': self.weights,
+            'score_scale': self.score_scale,
+        }
+        payload = json.dumps(config, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def score_texts(self, combined_texts):
+        """Features and score for each (already combined and lowercased) text, as dicts"""
+        # Same dtype prepare_text produces (astype(str)), so cached scores match score_dataframe
+        frame = pd.DataFrame({'combined_text': pd.Series(list(combined_texts), dtype=str)})
+        scored = self.calculate_final_score(self.add_text_features(frame), copy=False)
+        return scored.drop(columns=['combined_text']).to_dict('records')
+
+    def score_dataframe(self, df, cache=None):
+        """
+        extract_final_features + calculate_final_score in one call.
+
+        With a ScoreCache (built with self.version), each unique combined
+        text is scored once and repeats are served from the cache.
+        """
+        if cache is None:
+            return self.calculate_final_score(self.extract_final_features(df), copy=False)
+        
+        df = self.prepare_text(df.copy())
+        results = cache.lookup_or_compute(df['combined_text'], self.score_texts)
+        scored = pd.DataFrame.from_records(results, index=df.index)
+        for column in scored.columns:
+            df[column] = scored[column]
+        return df
+
+    def final_performance_report(self, counts):
+        """Final performance report with business recommendations, from action_counts()"""
+        if not counts:
             return
         
-        judol_data = df[df['target'] == 1]
-        non_judol_data = df[df['target'] == 0]
+        def count(target=None, actions=None):
+            return sum(n for (row_target, action), n in counts.items()
+                       if (target is None or row_target == target) and (actions is None or action in actions))
+        
+        def share(part, whole):
+            return part / whole * 100 if whole > 0 else 0
+        
+        total_judol = count(target=1)
+        total_non_judol = count(target=0)
         
         print("=" * 80)
         print("FINAL PRODUCTION JUDOL DETECTOR - PERFORMANCE REPORT")
@@ -154,61 +287,133 @@ class FinalProductionJudolDetector:
         print("-" * 80)
         
         for action in actions:
-            judol_in_action = len(judol_data[judol_data['action'] == action])
-            all_in_action = len(df[df['action'] == action])
+            judol_in_action = count(target=1, actions=[action])
+            all_in_action = count(actions=[action])
             
-            recall = judol_in_action / len(judol_data) * 100 if len(judol_data) > 0 else 0
-            precision = judol_in_action / all_in_action * 100 if all_in_action > 0 else 0
+            recall = share(judol_in_action, total_judol)
+            precision = share(judol_in_action, all_in_action)
             efficiency = recall * precision / 100  # Combined metric
             
-            non_judol_in_action = len(non_judol_data[non_judol_data['action'] == action])
+            non_judol_in_action = count(target=0, actions=[action])
             
             print(f"{action:<8} {judol_in_action:>6} {non_judol_in_action:>9} {recall:>7.1f}% {precision:>9.1f}% {efficiency:>9.1f}%")
         
         # Summary for business decisions
         print(f"\n{'BUSINESS DECISION SUMMARY':^80}")
         print("-" * 80)
-        review_plus = judol_data[judol_data['action'].isin(['Review', 'Flag', 'Remove'])]
-        flag_plus = judol_data[judol_data['action'].isin(['Flag', 'Remove'])]
+        review_plus = count(target=1, actions=['Review', 'Flag', 'Remove'])
+        flag_plus = count(target=1, actions=['Flag', 'Remove'])
+        false_positives = total_non_judol - count(target=0, actions=['Monitor'])
         
-        print(f"Comments needing Review+: {len(review_plus):,}/{len(judol_data):,} ({len(review_plus)/len(judol_data)*100:.1f}% of judol)")
-        print(f"Comments needing Flag+:   {len(flag_plus):,}/{len(judol_data):,} ({len(flag_plus)/len(judol_data)*100:.1f}% of judol)")
-        print(f"False Positive Rate:      {len(non_judol_data[non_judol_data['action'] != 'Monitor'])/len(non_judol_data)*100:.1f}%")
+        print(f"Comments needing Review+: {review_plus:,}/{total_judol:,} ({share(review_plus, total_judol):.1f}% of judol)")
+        print(f"Comments needing Flag+:   {flag_plus:,}/{total_judol:,} ({share(flag_plus, total_judol):.1f}% of judol)")
+        print(f"False Positive Rate:      {share(false_positives, total_non_judol):.1f}%")
         
         # Cost-benefit analysis
-        total_actionable = len(df[df['action'].isin(['Flag', 'Remove'])])
-        judol_actionable = len(judol_data[judol_data['action'].isin(['Flag', 'Remove'])])
-        precision_actionable = judol_actionable / total_actionable * 100 if total_actionable > 0 else 0
+        total_actionable = count(actions=['Flag', 'Remove'])
+        judol_actionable = count(target=1, actions=['Flag', 'Remove'])
+        precision_actionable = share(judol_actionable, total_actionable)
         
         print(f"\n{'COST-BENEFIT ANALYSIS':^80}")
         print("-" * 80)
         print(f"High-confidence actions (Flag/Remove): {total_actionable:,} comments")
         print(f"Judol caught in high-confidence: {judol_actionable:,} comments")
         print(f"Precision in high-confidence: {precision_actionable:.1f}%")
-        print(f"Manual review needed: {len(df[df['action'] == 'Review']):,} comments")
+        print(f"Manual review needed: {count(actions=['Review']):,} comments")
+
+def action_counts(df):
+    """
+    Row counts per (target, action), all final_performance_report needs.
+    Counters of separate chunks add up to the counts of the whole table;
+    a missing or unreadable target is counted as -1.
+    """
+    if 'target' not in df.columns or 'action' not in df.columns:
+        return Counter()
+    target = pd.to_numeric(df['target'], errors='coerce').fillna(-1)
+    pairs = pd.DataFrame({'target': target, 'action': df['action']}).value_counts(dropna=False)
+    return Counter({key: int(n) for key, n in pairs.items()})
 
-def main():
-    # Load data
-    df = pd.read_csv('labeled_comments.csv')
+def csv_chunk_dtypes(input_file, chunksize, columns=None):
+    """
+    Column dtypes for streaming a CSV, taken from its first chunk only, so
+    every chunk is parsed the same way: text columns stay text even in a
+    chunk of digits, numeric columns are read as float (a later chunk may
+    have missing values). Columns in storage.COLUMN_TYPES are cast per chunk
+    by coerce_types instead.
+    """
+    first = read_table(input_file, columns=columns, nrows=chunksize, verbose=False)
+    dtypes = {}
+    for column, dtype in first.dtypes.items():
+        if column in COLUMN_TYPES or pd.api.types.is_bool_dtype(dtype):
+            continue
+        dtypes[column] = np.dtype('float64') if pd.api.types.is_numeric_dtype(dtype) else object
+    return dtypes
+
+def calibrate_score_scale(detector, input_file, chunksize=None):
+    """Max raw_score over a reference dataset, to be stored as the score scale"""
+    max_score = 0
+    for chunk in iter_chunks(input_file, chunksize or 100_000, columns=TEXT_COLUMNS):
+        features = detector.extract_final_features(chunk, copy=False)
+        chunk_max = detector.calculate_raw_score(features).max()
+        if chunk_max > max_score:
+            max_score = chunk_max
+    return max_score
+
+def score_streaming(detector, input_file, output_file, chunksize, cache=None, columns=None, quarantine=False):
+    """
+    Score a CSV/Parquet table in bounded chunks and append each one to output_file.
+
+    judol_score uses the detector's fixed score_scale, so each chunk is
+    scored independently and the result matches a whole-file run. Only the
+    (target, action) counts for the report are kept; returns action_counts().
+    """
+    # Parquet already carries typed columns; CSV dtypes are fixed from the first chunk
+    csv_kwargs = {}
+    if table_format(input_file) == 'csv':
+        csv_kwargs['dtype'] = csv_chunk_dtypes(input_file, chunksize, columns)
+    if quarantine:
+        csv_kwargs['quarantine'] = True
+    
+    counts = Counter()
+    with ChunkWriter(output_file) as writer:
+        for chunk in iter_chunks(input_file, chunksize, columns=columns, **csv_kwargs):
+            scored = detector.score_dataframe(coerce_types(chunk), cache=cache)
+            writer.write(scored)
+            counts += action_counts(scored)
+    return counts
+
+def main(input_file='labeled_comments.csv', output_file='final_production_judol_detection.csv', chunksize=None,
+         cache_path=None, columns=None, quarantine=False):
     print(f"FINAL PRODUCTION DETECTOR")
-    print(f"Dataset: {len(df):,} comments, {df['target'].sum():,} judol comments")
     
     # Initialize final detector
     detector = FinalProductionJudolDetector()
+    cache = ScoreCache(detector.version, path=cache_path) if cache_path else None
     
-    # Extract features
-    df_features = detector.extract_final_features(df)
-    
-    # Calculate scores
-    df_scored = detector.calculate_final_score(df_features)
+    if chunksize:
+        # Streaming mode: peak memory bounded by chunksize, not file size
+        counts = score_streaming(detector, input_file, output_file, chunksize, cache=cache, columns=columns,
+                                 quarantine=quarantine)
+        judol = sum(n for (target, _), n in counts.items() if target == 1)
+        print(f"Dataset: {sum(counts.values()):,} comments, {judol:,} judol comments")
+    else:
+        # Load data
+        df = coerce_types(read_table(input_file, columns=columns, quarantine=quarantine))
+        print(f"Dataset: {len(df):,} comments, {df['target'].sum():,} judol comments")
+        
+        # Extract features and calculate scores
+        df_scored = detector.score_dataframe(df, cache=cache)
+        
+        # Save final production results
+        write_table(df_scored, output_file)
+        counts = action_counts(df_scored)
     
     # Generate final report
-    detector.final_performance_report(df_scored)
-    
-    # Save final production results
-    output_file = 'final_production_judol_detection.csv'
-    df_scored.to_csv(output_file, index=False)
+    detector.final_performance_report(counts)
     print(f"\n✅ FINAL PRODUCTION RESULTS saved to: {output_file}")
+    if cache is not None:
+        print(f"Score cache: {cache.stats()}")
+        cache.close()
     
     # Deployment recommendations
     print(f"\n{'DEPLOYMENT RECOMMENDATIONS':^80}")
@@ -220,4 +425,31 @@ def main():
     print("=" * 80)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Final production judol detector")
+    parser.add_argument('--input', default=None,
+                        help="labeled_comments.parquet/.csv (default: whichever exists)")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default=None,
+                        help="Output format when --output is not given (default: parquet if pyarrow is installed)")
+    parser.add_argument('--columns', default=None,
+                        help="Comma-separated input columns to load (default: all); "
+                             f"scoring needs {','.join(TEXT_COLUMNS + ['target'])}")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Stream the input in chunks of this many rows")
+    parser.add_argument('--calibrate', action='store_true',
+                        help=f"Recompute the score scale from --input and save it to {SCORE_SCALE_FILE}")
+    parser.add_argument('--cache', default=None,
+                        help="SQLite file for the persistent per-comment score cache")
+    parser.add_argument('--quarantine', action='store_true',
+                        help="Write malformed CSV rows of --input to <input>.quarantine.csv")
+    args = parser.parse_args()
+    input_file = args.input or stage_file('labeled_comments')
+    output_file = args.output or stage_file('final_production_judol_detection', args.format or default_format())
+    columns = args.columns.split(',') if args.columns else None
+    
+    if args.calibrate:
+        score_scale = calibrate_score_scale(FinalProductionJudolDetector(), input_file, args.chunksize)
+        save_score_scale(score_scale)
+        print(f"Score scale {score_scale} saved to: {SCORE_SCALE_FILE}")
+    else:
+        main(input_file, output_file, args.chunksize, args.cache, columns, args.quarantine)
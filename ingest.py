@@ -0,0 +1,480 @@
+import codecs
+import csv
+import io
+import os
+import re
+from itertools import chain
+
+import pandas as pd
+
+# Komentar multi-baris lebih panjang dari ini dianggap kutip yang tidak tertutup
+MAX_RECORD_LINES = 200
+
+# BOM yang ikut terbaca sebagai teks, termasuk versi mojibake-nya
+# ('ï»¿' = BOM UTF-8 dibaca sebagai latin-1, 'Ã¯Â»Â¿' = hasil encode ulang)
+_HEADER_BOM_PATTERN = re.compile('^(?:\ufeff|ï»¿|Ã¯Â»Â¿)+')
+_SAMPLE_BYTES = 1 << 20
+# File dibaca per blok sebesar ini
+_BLOCK_BYTES = 1 << 20
+_REPLACEMENT_BYTES = '\ufffd'.encode('utf-8')
+# Isi field yang dikutip sampai sebelum kutip penutupnya ('""' = kutip di dalam field)
+_QUOTED_CONTENT = re.compile(r'[^"]*+(?:""[^"]*+)*+')
+# Pengganti sementara '\r'/'\n' saat memecah field (private use area, tidak muncul di komentar)
+_CR, _LF = '\ue000', '\ue001'
+
+
+class IngestReport:
+    """Ringkasan satu pembacaan CSV: encoding, jumlah baris, dan apa yang diperbaiki/dikarantina"""
+
+    def __init__(self, path, encoding):
+        self.path = path
+        self.encoding = encoding
+        self.rows = 0
+        self.nul_bytes = 0
+        self.replaced_chars = 0
+        self.header_fixed = False
+        self.trailing_fields = 0
+        self.rejoined = 0
+        self.quarantined = []
+        self.quarantine_path = None
+
+    def summary(self):
+        return {
+            'path': self.path,
+            'encoding': self.encoding,
+            'rows': self.rows,
+            'quarantined': len(self.quarantined),
+            'trailing_fields_repaired': self.trailing_fields,
+            'line_breaks_rejoined': self.rejoined,
+            'nul_bytes_removed': self.nul_bytes,
+            'replaced_chars': self.replaced_chars,
+            'header_fixed': self.header_fixed,
+            'quarantine_path': self.quarantine_path,
+        }
+
+    def __str__(self):
+        text = (f"{self.path}: {self.rows} baris ({self.encoding}), {len(self.quarantined)} dikarantina, "
+                f"{self.trailing_fields} koma ekstra dan {self.rejoined} komentar terpotong diperbaiki")
+        if self.quarantine_path:
+            text += f" -> {self.quarantine_path}"
+        return text
+
+
+def detect_encoding(raw):
+    """
+    Tebak encoding dari sampel bytes: BOM, lalu UTF-8 jika hampir semua byte
+    non-ASCII membentuk sequence UTF-8 yang valid, selain itu cp1252 (atau
+    latin-1 jika ada byte yang tidak terdefinisi di cp1252).
+    """
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    sample = raw[:_SAMPLE_BYTES]
+    non_ascii = len(sample) - len(sample.decode('ascii', errors='ignore'))
+    if non_ascii == 0:
+        return 'utf-8'
+    decoded = sample.decode('utf-8', errors='replace')
+    # Sequence terakhir bisa terpotong di batas sampel, beri toleransi 5%
+    if decoded.count('�') - sample.count('�'.encode('utf-8')) <= non_ascii * 0.05:
+        return 'utf-8'
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def fix_header(name):
+    return _HEADER_BOM_PATTERN.sub('', name).strip()
+
+
+def _iter_text(path, encoding, report):
+    """
+    Decode file per blok tanpa membaca semuanya ke memori. Encoding ditebak
+    dari blok pertama (atau pakai `encoding`), byte NUL dibuang.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read(_SAMPLE_BYTES)
+        if encoding is None:
+            encoding = detect_encoding(raw)
+        report.encoding = encoding
+
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        tail = b''
+        while True:
+            final = not raw
+            text = decoder.decode(raw, final=final)
+            # '�' yang memang ada di file bukan hasil replace (tail: sequence di batas blok)
+            report.replaced_chars += text.count('\ufffd') - (tail + raw).count(_REPLACEMENT_BYTES)
+            nul_bytes = text.count('\x00')
+            if nul_bytes:
+                report.nul_bytes += nul_bytes
+                text = text.replace('\x00', '')
+            yield text
+            if final:
+                return
+            tail = raw[-2:]
+            raw = f.read(_BLOCK_BYTES)
+
+
+def _iter_blocks(path, encoding, report):
+    """
+    Teks file per blok yang berakhir di batas baris; yield terakhir adalah sisa
+    sesudah '\n' terakhir (bisa kosong). Baris dipisah '\n' saja ('\r\n'
+    dinormalisasi); '\r' yang berdiri sendiri di dalam komentar bukan akhir baris,
+    kecuali file memakai '\r' saja sebagai akhir baris (blok pertama tanpa '\n').
+    """
+    rest = ''
+    cr_only = None
+    for text in _iter_text(path, encoding, report):
+        if cr_only is None and text:
+            cr_only = '\n' not in text and '\r' in text
+        if cr_only:
+            text = (rest + text).replace('\r', '\n')
+        else:
+            # '\r' di ujung blok tetap di `rest` sampai '\n'-nya (di blok berikutnya) terbaca
+            text = (rest + text).replace('\r\n', '\n')
+        cut = text.rfind('\n') + 1
+        rest = text[cut:]
+        if cut:
+            yield text[:cut]
+    yield rest
+
+
+def _parse_header(header_line, report):
+    columns = next(csv.reader([header_line]))
+    fixed = [fix_header(column) for column in columns]
+    report.header_fixed = fixed != columns
+    return fixed
+
+
+def _scan_quotes(line, quoted=False):
+    """
+    True jika baris berakhir di dalam field yang dikutip. Aturannya sama dengan
+    parser C pandas: kutip hanya membuka field jika berada di awal field, kutip
+    di tengah field dianggap karakter biasa.
+    """
+    n = len(line)
+    pos = 0
+    while True:
+        if quoted or (pos < n and line[pos] == '"'):
+            pos = _QUOTED_CONTENT.match(line, pos + (not quoted)).end()
+            if pos == n:
+                return True
+            # Kutip penutup; sisa field sampai koma dianggap teks biasa
+            quoted = False
+        pos = line.find(',', pos)
+        if pos < 0:
+            return False
+        pos += 1
+
+
+def _looks_like_record(line, n_columns):
+    """Baris tanpa kutip dengan jumlah field pas dan kolom pertama (id) berupa satu token"""
+    if '"' in line or line.count(',') != n_columns - 1:
+        return False
+    key = line[:line.index(',')] if n_columns > 1 else line
+    return bool(key) and not any(char.isspace() for char in key)
+
+
+def _split_fields(record):
+    if '"' not in record:
+        return record.split(',')
+    # csv.reader menolak pindah baris di field tanpa kutip; titipkan dulu sebagai karakter lain
+    text = record.replace('\r', _CR).replace('\n', _LF)
+    fields = next(csv.reader([text]), [''])
+    return [field.replace(_CR, '\r').replace(_LF, '\n') for field in fields]
+
+
+def _strip_padding(fields, n_columns, force=False):
+    """
+    Buang field kosong di ujung baris yang kelebihan field (",,,," dari spreadsheet).
+    Padding ikut menempel di potongan komentar multi-baris, jadi semua field kosong
+    di ujung dibuang dan record disambung dulu sebelum dihitung ulang.
+    """
+    if not force and (len(fields) <= n_columns or any(fields[n_columns:])):
+        return False
+    while len(fields) > 1 and not fields[-1]:
+        fields.pop()
+    return True
+
+
+def _join_fields(fields):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(fields)
+    return buffer.getvalue()[:-1]
+
+
+def _record_patterns(n_columns, max_record_lines=MAX_RECORD_LINES):
+    """
+    Regex cek cepat untuk record yang hasil _resync_step-nya sudah pasti tanpa
+    menyusun ulang apa pun:
+
+    - tepat `n_columns` field, kutip seimbang dengan aturan yang sama seperti
+      _scan_quotes; pindah baris hanya di dalam kutip dan baris lanjutannya
+      tidak terlihat seperti record utuh (_looks_like_record)
+    - pindah baris per field dibatasi supaya satu record pasti tidak lebih dari
+      `max_record_lines` baris; record yang lebih panjang dicek lewat resync
+    - boleh diikuti field kosong berlebih (",,,,") selama field terakhirnya
+      berisi (jika kosong, resync masih mencoba menyambung baris berikutnya)
+    - bukan record yang disambung baris berikutnya (berakhir ',' dan baris
+      berikutnya diawali ',')
+
+    Return pola (deretan record tanpa padding, deretan record ber-padding,
+    satu record, satu record ber-padding dengan record-nya di grup 1).
+    """
+    content = r'[^"\n]*+(?:""[^"\n]*+)*+'
+    newline = rf'\n(?![^\s,"]+(?:,[^,"\n]*){{{n_columns - 1}}}(?:\n|\Z))'
+    # Atomic: field yang sudah cocok tidak di-backtrack, sehingga baris rusak cepat ditolak
+    breaks = (max_record_lines - 1) // n_columns
+    field = (rf'(?>"{content}(?:{newline}{content}){{0,{breaks}}}"(?!")[^,\n]*+'
+             rf'|[^,"\n][^,\n]*+|)')
+    record = rf'{field}(?:,{field}){{{n_columns - 1}}}'
+    end = r'(?:(?<!,)\n|\n(?!,))'
+    # Satu kolom: record kosong ber-padding ditulis ulang resync sebagai '""', bukan baris kosong
+    padding = r'(?<!,)(?<!,""),+' if n_columns > 1 else r'(?!)'
+    return (
+        re.compile(rf'(?:{record}{end})*+'),
+        re.compile(rf'(?:{record}{padding}{end})*+'),
+        re.compile(rf'{record}(?:{padding})?{end}'),
+        re.compile(rf'({record}){padding}\n'),
+    )
+
+
+def _resync_step(lines, i, n_columns, report, line_no, max_record_lines=MAX_RECORD_LINES):
+    """
+    Susun ulang satu record mulai dari lines[i]; return (record atau None, indeks
+    baris sesudahnya). `line_no` adalah nomor baris file dari lines[0], dan
+    `lines` harus memuat `max_record_lines` baris sesudah lines[i] (kecuali di akhir file).
+
+    Satu kutip yang tidak tertutup membuat parser CSV mana pun salah membaca
+    semua baris sesudahnya (kutip "terbalik"), sehingga ribuan baris bagus
+    ikut terbuang. Di sini record dicek jumlah field-nya dan diperbaiki
+    jika bisa:
+
+    - komentar multi-baris yang kutipnya hilang (field kurang) disambung
+      dengan baris berikutnya selama jumlah field-nya belum lewat
+    - field kosong berlebih di ujung baris (",,,,") dibuang, termasuk yang
+      menempel di potongan komentar multi-baris
+
+    Record yang tetap rusak dikarantina sendirian (None), pembacaan lanjut di
+    baris berikutnya. Record yang diperbaiki ditulis ulang dengan kutip yang benar.
+    """
+    record = lines[i]
+    end = i + 1
+    quoted = '"' in record and _scan_quotes(record)
+    while quoted and end < len(lines) and end - i < max_record_lines:
+        line = lines[end]
+        if _looks_like_record(line, n_columns):
+            # Baris utuh tanpa kutip: kutip di atasnya nyasar, bukan komentar multi-baris
+            break
+        record += '\n' + line
+        quoted = _scan_quotes(line, quoted=True) if '"' in line else True
+        end += 1
+
+    if quoted:
+        report.quarantined.append((line_no + i, 'unbalanced quote', lines[i]))
+        return None, i + 1
+    if not record:
+        return None, end
+    # Baris berikut yang kolom pertamanya (id) kosong adalah sambungan record ini
+    continued = record.endswith(',') and end < len(lines) and lines[end].startswith(',')
+    if '"' not in record and record.count(',') == n_columns - 1 and not continued:
+        return record, end
+
+    fields = _split_fields(record)
+    padded = _strip_padding(fields, n_columns, force=continued)
+    repaired = padded
+    joined = False
+    while len(fields) < n_columns and end < len(lines) and end - i < max_record_lines:
+        if '"' in lines[end] and _scan_quotes(lines[end]):
+            break
+        more = _split_fields(lines[end])
+        padded = _strip_padding(more, n_columns, force=more[-1] == '') or padded
+        if len(fields) + len(more) - 1 > n_columns:
+            break
+        fields[-1] += '\n' + more[0]
+        fields.extend(more[1:])
+        end += 1
+        joined = repaired = True
+    if padded and len(fields) == n_columns - 1:
+        # Kolom terakhir memang boleh kosong (mis. cleaned_comment_text)
+        fields.append('')
+
+    if len(fields) != n_columns:
+        raw = '\n'.join(lines[i:end])
+        report.quarantined.append((line_no + i, f'expected {n_columns} fields, saw {len(fields)}', raw))
+        # Record rusak: buang baris pertamanya saja, baris sesudahnya dicoba lagi
+        return None, i + 1
+    report.trailing_fields += padded
+    report.rejoined += joined
+    return (_join_fields(fields) if repaired else record), end
+
+
+def _resync_records(blocks, n_columns, report, max_record_lines=MAX_RECORD_LINES):
+    """
+    Body CSV sebagai potongan teks berisi record utuh (generator), siap dibaca parser C.
+
+    Deretan record yang sudah valid (atau cukup dibuang padding-nya) dicek
+    sekaligus oleh satu regex (_record_patterns) dan diteruskan ke parser C.
+    Resync per record (_resync_step) hanya jalan mulai dari baris pertama yang
+    gagal cek itu, sampai record berikutnya kembali valid. Yang dipegang hanya
+    blok sekarang plus lookahead `max_record_lines` baris untuk resync.
+    """
+    runs, padded_runs, valid, padding = _record_patterns(n_columns, max_record_lines)
+
+    body = ''
+    # Nomor baris file dari body[0]
+    line_no = 2
+    blocks = iter(blocks)
+    block = next(blocks, None)
+    while block is not None:
+        following = next(blocks, None)
+        final = following is None
+        body += block
+        # Baris body baru dipecah jika ada record yang perlu di-resync
+        lines = None
+        # Cek cepat berhenti di karakter pertama baris terakhir: record sebelumnya masih
+        # perlu melihat awal baris itu (sambungan ','), baris itu sendiri belum tentu lengkap
+        limit = len(body) if final else min(body.rfind('\n', 0, len(body) - 1) + 2, len(body))
+        # lines[i] dimulai di body[counted]; `pos` selalu di awal baris
+        pos = counted = i = 0
+        while pos < len(body):
+            end = runs.match(body, pos, limit).end()
+            if end > pos:
+                yield body[pos:end]
+            else:
+                end = padded_runs.match(body, pos, limit).end()
+                if end > pos:
+                    text, padded = padding.subn(r'\1\n', body[pos:end])
+                    report.trailing_fields += padded
+                    yield text
+            if end > pos:
+                pos = end
+                continue
+            if lines is None:
+                lines = body.split('\n')
+                if not final:
+                    # Body selalu berakhir '\n' sampai blok terakhir
+                    lines.pop()
+            i += body.count('\n', counted, pos)
+            counted = pos
+            if not final and len(lines) - i <= max_record_lines:
+                # Lookahead resync belum cukup, tunggu blok berikutnya
+                break
+            while i < len(lines) and (final or len(lines) - i > max_record_lines):
+                record, end = _resync_step(lines, i, n_columns, report, line_no, max_record_lines)
+                if record is not None:
+                    yield record + '\n'
+                pos += sum(len(line) + 1 for line in lines[i:end])
+                i = end
+                if valid.match(body, pos, limit):
+                    break
+            counted = pos
+        line_no += i + body.count('\n', counted, pos)
+        body = body[pos:]
+        block = following
+
+
+def write_quarantine(report, quarantine_path=None):
+    """Simpan baris yang dikarantina (nomor baris file, alasan, isi mentah) ke CSV"""
+    if not report.quarantined:
+        return None
+    if quarantine_path is None:
+        stem, _ = os.path.splitext(report.path)
+        quarantine_path = f"{stem}.quarantine.csv"
+    pd.DataFrame(report.quarantined, columns=['line', 'reason', 'raw']).sort_values('line').to_csv(
+        quarantine_path, index=False, encoding='utf-8'
+    )
+    report.quarantine_path = quarantine_path
+    return quarantine_path
+
+
+class _RecordReader(io.TextIOBase):
+    """File-like (read saja) di atas generator potongan teks, supaya parser C pandas membaca body bertahap"""
+
+    def __init__(self, records):
+        self._records = records
+        self._buffer = ''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + ''.join(self._records)
+            self._buffer = ''
+            return data
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while length < size:
+            text = next(self._records, None)
+            if text is None:
+                break
+            parts.append(text)
+            length += len(text)
+        data = ''.join(parts)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _prepare(path, encoding):
+    """Header bersih + reader record hasil resync (dibaca bertahap); return (columns, reader, report)"""
+    report = IngestReport(path, encoding)
+    blocks = _iter_blocks(path, encoding, report)
+    header, _, body = next(blocks).partition('\n')
+    columns = _parse_header(header, report)
+    if not columns:
+        # Sama seperti pd.read_csv untuk file kosong / tanpa header
+        raise pd.errors.EmptyDataError(f"No columns to parse from file: {path}")
+    return columns, _RecordReader(_resync_records(chain([body], blocks), len(columns), report)), report
+
+
+def _read_options(columns, read_csv_kwargs):
+    options = dict(read_csv_kwargs)
+    options.update(header=None, names=columns, engine='c', lineterminator='\n')
+    return options
+
+
+def _finish(report, quarantine, quarantine_path, verbose):
+    if quarantine or quarantine_path:
+        write_quarantine(report, quarantine_path)
+    if verbose and (report.quarantined or report.header_fixed or report.nul_bytes):
+        print(f"📥 {report}")
+
+
+def read_csv(path, usecols=None, encoding=None, quarantine=False, quarantine_path=None, verbose=True,
+             **read_csv_kwargs):
+    """
+    Baca CSV korpus komentar dengan parser C, file di-decode dan di-resync
+    per blok (memori tidak tergantung ukuran file selain DataFrame hasilnya):
+
+    - encoding dideteksi sekali dari blok pertama (atau pakai `encoding`)
+    - byte NUL dibuang, BOM/mojibake BOM di header dibersihkan
+    - record yang sudah valid langsung diteruskan ke parser C; hanya record yang
+      gagal cek cepat yang di-resync: field kosong berlebih di ujung baris dibuang,
+      komentar multi-baris yang kutipnya hilang disambung lagi (lihat _resync_step)
+    - baris rusak (kutip tidak tertutup, jumlah field salah) tidak dibuang diam-diam,
+      tapi dicatat di report.quarantined beserta nomor barisnya; dengan
+      quarantine=True ditulis ke `<file>.quarantine.csv` (atau `quarantine_path`)
+
+    Return (DataFrame, IngestReport).
+    """
+    columns, reader, report = _prepare(path, encoding)
+    df = pd.read_csv(reader, usecols=usecols, **_read_options(columns, read_csv_kwargs))
+    report.rows = len(df)
+    _finish(report, quarantine, quarantine_path, verbose)
+    return df, report
+
+
+def iter_csv(path, chunksize, usecols=None, encoding=None, quarantine=False, quarantine_path=None,
+             verbose=True, **read_csv_kwargs):
+    """
+    Versi chunked dari read_csv (sama-sama memakai deteksi encoding dan karantina).
+    Yield DataFrame per chunk; file karantina (jika diminta) ditulis setelah chunk terakhir.
+    """
+    columns, reader, report = _prepare(path, encoding)
+    options = _read_options(columns, read_csv_kwargs)
+    for chunk in pd.read_csv(reader, usecols=usecols, chunksize=chunksize, **options):
+        report.rows += len(chunk)
+        yield chunk
+    _finish(report, quarantine, quarantine_path, verbose)
@@ -0,0 +1,183 @@
+# Entry point prediksi komentar judol (library + CLI).
+#
+#     import judol
+#     judol.predict("depo 50rb wd 500rb di pulauwin")          # rule/skor, tanpa TensorFlow
+#     judol.predict(texts, bundle='bundles/judol-v1')           # model LSTM dari bundle artefak
+#
+# Modul ini sengaja hanya meng-import stdlib di top level: pandas, featuring,
+# TensorFlow, dll di-import (dan artefak di-load) saat pertama kali dipakai.
+# `python judol.py --check-startup` mengukur cold start di interpreter baru.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Budget cold start (ms), diukur di interpreter baru (lihat check_startup)
+IMPORT_BUDGET_MS = 100
+PREDICT_BUDGET_MS = 1500
+# Modul yang tidak boleh ter-import oleh jalur rule-only
+HEAVY_MODULES = ('tensorflow', 'keras', 'sklearn', 'imblearn', 'Sastrawi', 'torch')
+SCORE_COLUMNS = ['judol_score', 'risk_level', 'action', 'confidence']
+
+_detector = None
+_rules = None
+_scorers = {}
+
+
+def get_detector():
+    global _detector
+    if _detector is None:
+        from featuring import FinalProductionJudolDetector
+        _detector = FinalProductionJudolDetector()
+    return _detector
+
+
+def get_rules():
+    global _rules
+    if _rules is None:
+        from rules import RuleSet
+        _rules = RuleSet()
+    return _rules
+
+
+def get_scorer(bundle, bucketing='auto'):
+    """KerasScorer dari bundle artefak, di-load sekali per path"""
+    if bundle not in _scorers:
+        from artifacts import ArtifactBundle
+        from serving import KerasScorer
+        _scorers[bundle] = KerasScorer.from_bundle(ArtifactBundle.load(bundle), bucketing)
+    return _scorers[bundle]
+
+
+def score_rules(texts, explain=False):
+    """
+    Skor FinalProductionJudolDetector untuk teks mentah (tanpa TensorFlow).
+    Skor dan --explain sama-sama memakai teks hasil serving.clean_text, seperti RuleScorer.
+    """
+    from serving import clean_text
+    cleaned = [clean_text(text) for text in texts]
+    records = get_detector().score_texts(cleaned)
+    results = [{column: record[column] for column in SCORE_COLUMNS} for record in records]
+    if explain:
+        _, fired = get_rules().evaluate(cleaned)
+        for result, ids in zip(results, fired):
+            result['rules'] = list(ids)
+    return results
+
+
+def predict(texts, bundle=None, explain=False):
+    """
+    Prediksi satu teks (return dict) atau list teks (return list dict).
+
+    Tanpa bundle: skor rule-based (judol_score 0-10, risk_level, action).
+    Dengan bundle: probabilitas model LSTM (prob, label, clean).
+    """
+    single = isinstance(texts, str)
+    texts = [texts] if single else ['' if text is None else str(text) for text in texts]
+    results = get_scorer(bundle)(texts) if bundle else score_rules(texts, explain)
+    for text, result in zip(texts, results):
+        result['text'] = text
+    return results[0] if single else results
+
+
+# ===== STARTUP CHECK =====
+_STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import judol
+imported = time.perf_counter()
+import_modules = sorted(m for m in sys.modules if m.split('.')[0] in ('pandas', 'numpy') + judol.HEAVY_MODULES)
+judol.predict(['depo 50rb wd 500rb di pulauwin gacor'])
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'predict_ms': (done - start) * 1000,
+    'import_pulled': sorted({m.split('.')[0] for m in import_modules}),
+    'heavy': sorted({m.split('.')[0] for m in sys.modules if m.split('.')[0] in judol.HEAVY_MODULES}),
+}))
+"""
+
+
+def check_startup(runs=3, import_budget_ms=IMPORT_BUDGET_MS, predict_budget_ms=PREDICT_BUDGET_MS):
+    """
+    Ukur cold start `import judol` + satu prediksi rule-only di interpreter
+    baru (waktu terbaik dari `runs`). Return (ok, hasil, list masalah).
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _STARTUP_PROBE], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    result = {
+        'import_ms': round(min(sample['import_ms'] for sample in samples), 1),
+        'predict_ms': round(min(sample['predict_ms'] for sample in samples), 1),
+        'import_pulled': samples[0]['import_pulled'],
+        'heavy': samples[0]['heavy'],
+    }
+
+    problems = []
+    if result['import_ms'] > import_budget_ms:
+        problems.append(f"import judol {result['import_ms']} ms > budget {import_budget_ms} ms")
+    if result['import_pulled']:
+        problems.append(f"import judol sudah meng-import {', '.join(result['import_pulled'])}")
+    if result['predict_ms'] > predict_budget_ms:
+        problems.append(f"import + prediksi pertama {result['predict_ms']} ms > budget {predict_budget_ms} ms")
+    if result['heavy']:
+        problems.append(f"jalur rule-only meng-import {', '.join(result['heavy'])}")
+    return not problems, result, problems
+
+
+def _read_texts(args):
+    if args.input:
+        from storage import read_table
+        return read_table(args.input, columns=[args.column])[args.column].fillna('').astype(str).tolist()
+    if args.texts:
+        return args.texts
+    return [line.rstrip('\n') for line in sys.stdin if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prediksi komentar judol (rule-based, atau model dari bundle)")
+    parser.add_argument('texts', nargs='*', help="Teks komentar (default: baca per baris dari stdin)")
+    parser.add_argument('--input', default=None, help="CSV/Parquet berisi komentar")
+    parser.add_argument('--column', default='comment_text', help="Kolom teks untuk --input")
+    parser.add_argument('--output', default=None, help="Simpan hasil ke CSV/Parquet (default: JSON lines ke stdout)")
+    parser.add_argument('--bundle', default=None, help="Bundle artefak model (artifacts.py); tanpa ini rule-only")
+    parser.add_argument('--explain', action='store_true', help="Tambah ID aturan yang terpenuhi (rule-only)")
+    parser.add_argument('--check-startup', action='store_true',
+                        help="Ukur cold start rule-only di interpreter baru, exit 1 jika melewati budget")
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--predict-budget-ms', type=float, default=PREDICT_BUDGET_MS)
+    args = parser.parse_args()
+
+    if args.check_startup:
+        ok, result, problems = check_startup(import_budget_ms=args.import_budget_ms,
+                                             predict_budget_ms=args.predict_budget_ms)
+        print(f"⏱️  import judol: {result['import_ms']} ms (budget {args.import_budget_ms:g}), "
+              f"import + prediksi pertama: {result['predict_ms']} ms (budget {args.predict_budget_ms:g})")
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not ok:
+            raise SystemExit(1)
+        print("✅ Cold start dalam budget, TensorFlow tidak ter-import")
+        return
+
+    start = time.perf_counter()
+    results = predict(_read_texts(args), bundle=args.bundle, explain=args.explain)
+    if args.output:
+        import pandas as pd
+        from storage import write_table
+        write_table(pd.DataFrame(results), args.output)
+        print(f"✅ {len(results):,} prediksi ({time.perf_counter() - start:.2f}s) disimpan ke: {args.output}")
+        return
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,95 +1,39 @@
+import argparse
 import pandas as pd
-import re
 
-def improved_label_gambling_comments(csv_file_path, output_file_path=None):
+from rules import RuleSet, rule_counts
+from storage import default_format, read_table, stage_file, write_table
+
+def label_comments(df, rules=None, explain=False):
+    """
+    Kolom target (dan rules_fired jika explain) dari cleaned_comment_text, in place.
+    Sekali jalan per kolom, tiap teks unik dievaluasi sekali. Return (df, fired).
+    """
+    rules = rules or RuleSet()
+    labels, fired = rules.evaluate(df['cleaned_comment_text'])
+    df['target'] = labels
+    if explain:
+        df['rules_fired'] = ['|'.join(ids) for ids in fired]
+    return df, fired
+
+def improved_label_gambling_comments(csv_file_path, output_file_path=None, columns=None, explain=False,
+                                     rules=None, quarantine=False):
     """
-    Melabeli komentar judi dengan algoritma yang lebih akurat
+    Melabeli komentar judi dengan algoritma yang lebih akurat.
+    Input/output boleh .csv atau .parquet; `columns` membatasi kolom yang dimuat.
+    Aturan labeling ada di rules.GAMBLING_RULES; explain=True menambah kolom
+    `rules_fired` berisi ID aturan yang terpenuhi (dipisah '|').
+    quarantine=True menulis baris CSV rusak ke `<input>.quarantine.csv`.
     """
+    rules = rules or RuleSet()
     
-    # Baca file
-    try:
-        df = pd.read_csv(csv_file_path, encoding='latin-1', engine='python', on_bad_lines='skip')
-    except:
-        df = pd.read_csv(csv_file_path, encoding='latin-1', error_bad_lines=False)
+    # Baca file (CSV: encoding dideteksi otomatis, baris rusak dikarantina)
+    df = read_table(csv_file_path, columns=columns, quarantine=quarantine)
     
     print(f"File berhasil dibaca. Total baris: {len(df)}")
     
-    # Kata kunci judi yang lebih spesifik
-    gambling_platforms = [
-        # Platform/situs judi
-        'lazadatoto', 'pstoto99', 'mini1221', 'kyt4d', 'togel62', 'bukit4d', 
-        'pelatih4d', 'sajak4d', 'sendal4d', 'gelora4d', 'mona4d', 'sgi88',
-        'garudahoki', 'arwanatoto', 'plazabola', 'insan4d', 'berkahslot',
-        'pulauwin', 'paste4d', 'kurirslot', 'traxearn', 'biptrade', 'garuda69', 'phoenix638',
-        'mbak4d2', 'gaspol 168', 'mega177', 'upahslot', 'sikat88', 'pesiar88', 'grok681h', 'timo4d',
-        'bet4d', 'dibet4d', 'denyut69', 'squad777', 'pr0be 855', 'pr0be', 'spin68', 'pulauwin', 'pulau777' 
-    ]
-    
-    gambling_terms = [
-        # Istilah teknis perjudian
-        'depo', 'deposit', 'wd', 'withdraw', 'modal', 'saldo', 'maxwin', 'scatter',
-        'jepe', 'gacor', 'hoki', 'jackpot', 'bet', 'taruhan', 'slot', 'togel',
-        'casino', 'poker', 'bandar', 'agen', 'bonus', 'freechip', 'turnover',
-        'rollingan', 'cashback', 'rebate', 'situs', 'platform', 'permainan uang',
-        'investasi', 'profit', 'cuan', 'pasang', 'wede', 'jp', 'pragmatic', 'rtp'
-    ]
-    
-    def is_gambling_comment(text):
-        """
-        Fungsi yang lebih akurat untuk mendeteksi komentar judi
-        """
-        if not isinstance(text, str):
-            return 0
-        
-        text_lower = text.lower()
-        
-        # 1. Cek platform judi - jika ada, langsung label 1
-        for platform in gambling_platforms:
-            if platform in text_lower:
-                return 1
-        
-        # 2. Cek kombinasi istilah judi + konteks uang
-        gambling_terms_found = []
-        for term in gambling_terms:
-            if term in text_lower:
-                gambling_terms_found.append(term)
-        
-        # Jika ada istilah judi, cek konteksnya
-        if gambling_terms_found:
-            # Pattern untuk nominal uang
-            money_patterns = [
-                r'\d+[km]',  # 100k, 50m
-                r'\d+\s*(rb|ribu|jt|juta|k|m)',  # 100 rb, 50 juta
-                r'rp\s*\d+',  # Rp 100000
-                r'\d+\s*(rupiah|perak)'  # 100 ribu rupiah
-            ]
-            
-            # Cek apakah ada pattern uang
-            has_money = any(re.search(pattern, text_lower) for pattern in money_patterns)
-            
-            # Kata-kata yang bisa menyebabkan false positive
-            false_positive_triggers = ['game', 'main', 'mlbb', 'mobile legend', 'turnamen', 'tournament']
-            has_false_positive = any(trigger in text_lower for trigger in false_positive_triggers)
-            
-            # Jika ada uang DAN tidak ada konteks game, label sebagai judi
-            if has_money and not has_false_positive:
-                return 1
-            
-            # Jika ada kombinasi istilah judi yang spesifik
-            strong_combinations = [
-                ['depo', 'wd'], ['modal', 'wd'], ['saldo', 'wd'],
-                ['maxwin', 'depo'], ['gacor', 'depo'], ['jepe', 'modal'], ['rtp','slot']
-            ]
-            
-            for combo in strong_combinations:
-                if all(term in gambling_terms_found for term in combo):
-                    return 1
-        
-        return 0
-    
-    # Terapkan labeling
     print("Melabeli komentar dengan algoritma improved...")
-    df['target'] = df['cleaned_comment_text'].apply(is_gambling_comment)
+    df, fired = label_comments(df, rules, explain)
     
     # Statistik
     total = len(df)
@@ -101,6 +45,9 @@ def improved_label_gambling_comments(csv_file_path, output_file_path=None):
     print(f"Komentar judi (target=1): {judi} ({judi/total*100:.2f}%)")
     print(f"Komentar normal (target=0): {normal} ({normal/total*100:.2f}%)")
     
+    print(f"\n=== ATURAN YANG TERPENUHI ===")
+    print(rule_counts(fired).head(15).to_string())
+    
     # Test case untuk komentar yang bermasalah
     test_cases = [
         "sonic cuma divisi ml divisi laen kalah",
@@ -111,19 +58,19 @@ def improved_label_gambling_comments(csv_file_path, output_file_path=None):
     ]
     
     print(f"\n=== TEST CASE ===")
-    for test in test_cases:
-        result = is_gambling_comment(test)
-        print(f"'{test}' -> {result}")
+    test_labels, test_fired = rules.evaluate(test_cases)
+    for test, result, ids in zip(test_cases, test_labels, test_fired):
+        print(f"'{test}' -> {result} {list(ids)}")
     
     # Simpan hasil
     if output_file_path:
-        df.to_csv(output_file_path, index=False, encoding='utf-8')
+        write_table(df, output_file_path)
         print(f"\nFile disimpan sebagai: {output_file_path}")
     
     return df
 
 # Analisis false positive
-def analyze_false_positives(df):
+def analyze_false_positives(df, rules=None):
     """
     Menganalisis komentar yang mungkin salah label
     """
@@ -139,13 +86,39 @@ def analyze_false_positives(df):
     # Cari komentar yang mengandung kata "game" tapi dilabeli judi
     game_comments = df[df['cleaned_comment_text'].str.contains('game', na=False) & (df['target'] == 1)]
     print(f"\nKomentar dengan kata 'game' yang dilabeli judi: {len(game_comments)}")
+    
+    # Aturan mana yang membuat komentar di atas dilabeli judi
+    suspects = pd.concat([kalah_comments, game_comments])
+    if len(suspects):
+        if 'rules_fired' in suspects.columns:
+            fired = [ids.split('|') if ids else [] for ids in suspects['rules_fired']]
+        else:
+            fired = (rules or RuleSet()).evaluate(suspects['cleaned_comment_text'])[1]
+        print(f"Aturan penyebab:")
+        print(rule_counts(fired).to_string())
 
 # Jalankan program
 if __name__ == "__main__":
-    input_file = "cleaned_comments.csv"
-    output_file = "labeled_comments.csv"
-    
-    df = improved_label_gambling_comments(input_file, output_file)
+    parser = argparse.ArgumentParser(description="Labeling komentar judi")
+    parser.add_argument('--input', default=None,
+                        help="cleaned_comments.parquet/.csv (default: yang tersedia)")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default=None,
+                        help="Format output jika --output tidak diisi (default: parquet jika pyarrow ada)")
+    parser.add_argument('--columns', default=None,
+                        help="Kolom input yang dimuat, pisahkan dengan koma (wajib ada cleaned_comment_text)")
+    parser.add_argument('--explain', action='store_true',
+                        help="Tambah kolom rules_fired (ID aturan yang membuat komentar dilabeli judi)")
+    parser.add_argument('--quarantine', action='store_true',
+                        help="Tulis baris CSV rusak di input ke <input>.quarantine.csv")
+    args = parser.parse_args()
+    
+    input_file = args.input or stage_file('cleaned_comments')
+    output_file = args.output or stage_file('labeled_comments', args.format or default_format())
+    columns = args.columns.split(',') if args.columns else None
+    
+    df = improved_label_gambling_comments(input_file, output_file, columns, explain=args.explain,
+                                          quarantine=args.quarantine)
     
     # Analisis false positive
     analyze_false_positives(df)
@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from langdetect import DetectorFactory, detect, LangDetectException
+from langdetect.detector_factory import init_factory
+
+# Kata fungsi / slang yang (hampir) hanya muncul di bahasa Indonesia informal.
+# Kata yang juga umum di bahasa Melayu (tak, boleh, sangat, ...) sengaja tidak
+# dimasukkan supaya prefilter tidak meloloskan komentar yang oleh langdetect
+# dianggap "ms".
+INDONESIAN_FUNCTION_WORDS = frozenset([
+    "yang", "dan", "di", "ke", "dari", "ini", "itu", "tidak", "gak", "ga", "nggak", "ngga", "enggak",
+    "aku", "gue", "gw", "lu", "lo", "kamu", "kalian", "dia", "mereka", "kita", "kami",
+    "banget", "bgt", "udah", "udh", "sudah", "belum", "blm", "lagi", "aja", "saja", "juga", "jg",
+    "sih", "dong", "deh", "kok", "nih", "tuh", "kan", "ya", "yg", "dgn", "dengan", "untuk", "buat",
+    "ada", "bisa", "jadi", "kalau", "kalo", "klo", "tapi", "tp", "karena", "krn", "sama", "atau",
+    "mau", "pengen", "pingin", "bang", "bro", "kak", "min", "mas", "mbak", "wkwk", "wkwkwk",
+    "gimana", "gmn", "kenapa", "knp", "apa", "siapa", "terus", "trus", "semua", "semoga",
+    "emang", "memang", "pas", "lebih", "sekali", "banyak", "hari", "orang", "nya",
+])
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """
+    Kunci cache: whitespace dirapikan. Huruf besar/kecil sengaja dipertahankan
+    karena langdetect memberi hasil berbeda untuk "Mantap" dan "mantap".
+    """
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def looks_indonesian(text, min_hits=2, min_ratio=0.25):
+    """
+    Prefilter murah: cukup banyak kata fungsi bahasa Indonesia -> pasti "id"
+    tanpa perlu langdetect. Teks ambigu tetap dikirim ke detector.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return False
+    hits = [token for token in tokens if token in INDONESIAN_FUNCTION_WORDS]
+    return len(set(hits)) >= min_hits and len(hits) / len(tokens) >= min_ratio
+
+
+def _init_detector_worker(seed):
+    DetectorFactory.seed = seed
+    init_factory()
+
+
+def _detect_batch(texts):
+    languages = []
+    for text in texts:
+        try:
+            languages.append(detect(text))
+        except LangDetectException:
+            languages.append(None)
+    return languages
+
+
+class LanguageFilter:
+    """
+    Deteksi bahasa bertahap untuk komentar:
+
+    1. teks sangat pendek (emoji, dll) -> lolos
+    2. prefilter kata fungsi bahasa Indonesia -> lolos tanpa langdetect
+    3. cache LRU berdasarkan teks yang sudah dinormalisasi
+    4. sisanya dideteksi langdetect per batch di process pool
+
+    `DetectorFactory.seed` diset di setiap proses sehingga hasil deterministik.
+    Aman dipanggil dari banyak thread sekaligus.
+    """
+
+    def __init__(self, target="id", min_length=5, cache_size=100_000, workers=None, batch_size=32,
+                 seed=0, prefilter=True):
+        self.target = target
+        self.min_length = min_length
+        self.cache_size = cache_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.seed = seed
+        self.prefilter = prefilter
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self.reset_metrics()
+
+        DetectorFactory.seed = seed
+        init_factory()
+
+    def reset_metrics(self):
+        self.languages = Counter()
+        self.sources = Counter()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.workers > 1:
+                # spawn: pool bisa dibuat dari dalam thread scraper, fork di proses multi-thread rawan deadlock
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_detector_worker,
+                    initargs=(self.seed,)
+                )
+            return self._executor
+
+    def _detect_many(self, texts):
+        executor = self._get_executor()
+        if executor is None or len(texts) <= self.batch_size:
+            return _detect_batch(texts)
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        return [language for result in executor.map(_detect_batch, batches) for language in result]
+
+    def detect_languages(self, texts):
+        """Return kode bahasa per teks ("short" / "prefilter" dihitung sebagai target)"""
+        results = [None] * len(texts)
+        pending = {}
+        stage_counts = Counter()
+
+        with self._lock:
+            for i, text in enumerate(texts):
+                text = text.strip()
+                if len(text) < self.min_length:
+                    results[i] = self.target
+                    stage_counts["short"] += 1
+                    continue
+                key = normalize_text(text)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[i] = self._cache[key]
+                    stage_counts["cache"] += 1
+                elif self.prefilter and looks_indonesian(key):
+                    results[i] = self.target
+                    stage_counts["prefilter"] += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+
+        if pending:
+            keys = list(pending)
+            detected = self._detect_many(keys)
+            with self._lock:
+                for key, language in zip(keys, detected):
+                    self._cache[key] = language
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                    for i in pending[key]:
+                        results[i] = language
+            stage_counts["detector"] += sum(len(indices) for indices in pending.values())
+
+        with self._lock:
+            self.sources.update(stage_counts)
+            self.languages.update(language or "unknown" for language in results)
+        return results
+
+    def filter(self, texts):
+        """List bool: teks dianggap bahasa target (gagal deteksi -> True, biar gak di-drop diam-diam)"""
+        return [language in (self.target, None) for language in self.detect_languages(texts)]
+
+    def is_target(self, text):
+        return self.filter([text])[0]
+
+    def metrics(self):
+        with self._lock:
+            total = sum(self.languages.values())
+            rejected = total - self.languages[self.target] - self.languages["unknown"]
+            return {
+                "total": total,
+                "accepted": total - rejected,
+                "rejected": rejected,
+                "rejection_rate": rejected / total if total else 0.0,
+                "languages": dict(self.languages.most_common()),
+                "sources": dict(self.sources),
+                "cache_entries": len(self._cache),
+            }
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,164 @@
+from collections import deque
+
+import numpy as np
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton untuk mencari banyak kata kunci sekaligus.
+
+    Semua lexicon (situs judi, istilah finansial, frasa, dll) dimasukkan ke
+    satu automaton, lalu setiap komentar cukup di-scan SATU kali secara linear,
+    berapa pun jumlah kata kuncinya. Hasil match sama persis dengan
+    `term in text` (substring, termasuk yang overlap).
+    """
+
+    def __init__(self, lexicons=None):
+        # goto[state] = {char: next_state}
+        self._goto = [{}]
+        self._fail = [0]
+        # terminal[state] = (term, category) yang berakhir tepat di state ini,
+        # output[state] = terminal + output dari failure chain (diisi build)
+        self._terminal = [[]]
+        self._output = [[]]
+        # output_columns[state] = index kolom hit_matrix dari output[state]
+        self._output_columns = [[]]
+        self._built = False
+        self.categories = {}
+
+        if lexicons:
+            for category, terms in lexicons.items():
+                self.add_terms(terms, category)
+            self.build()
+
+    def add_terms(self, terms, category):
+        """Tambahkan daftar term ke satu kategori (case dipertahankan apa adanya)"""
+        for term in terms:
+            self.add(term, category)
+
+    def add(self, term, category):
+        """Tambahkan satu term; term duplikat dalam kategori yang sama diabaikan"""
+        if not term:
+            return
+        known = self.categories.setdefault(category, [])
+        if term in known:
+            return
+        known.append(term)
+
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append([])
+            state = next_state
+        self._terminal[state].append((term, category))
+        self._built = False
+
+    def build(self):
+        """Hitung failure links (BFS) dan gabungkan output dari suffix state"""
+        self._output = [list(terminal) for terminal in self._terminal]
+        queue = deque()
+        for next_state in self._goto[0].values():
+            self._fail[next_state] = 0
+            queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+        index = {column: col for col, column in enumerate(self.columns())}
+        self._output_columns = [sorted({index[category, term] for term, category in output})
+                                for output in self._output]
+        self._built = True
+        return self
+
+    def iter_matches(self, text):
+        """Yield (term, category, offset) untuk setiap kemunculan term di text"""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for term, category in output[state]:
+                    yield term, category, index - len(term) + 1
+
+    def find_all(self, text):
+        """Semua hit dalam satu pass: list of (term, category, offset)"""
+        return list(self.iter_matches(text))
+
+    def found_terms(self, text):
+        """Dict {category: [term unik yang ditemukan, urut kemunculan pertama]}"""
+        found = {}
+        for term, category, _ in self.iter_matches(text):
+            terms = found.setdefault(category, [])
+            if term not in terms:
+                terms.append(term)
+        return found
+
+    def contains_any(self, text, category=None):
+        """True jika ada minimal satu term (opsional: dari kategori tertentu)"""
+        for _, hit_category, _ in self.iter_matches(text):
+            if category is None or hit_category == category:
+                return True
+        return False
+
+    def columns(self):
+        """(category, term) untuk setiap term, urutan kolom hit_matrix"""
+        return [(category, term) for category, terms in self.categories.items() for term in terms]
+
+    def hit_matrix(self, texts):
+        """
+        Versi kolumnar untuk satu pandas Series: array bool (len(texts), n_terms)
+        plus (category, term) tiap kolom. Setiap teks unik di-scan SATU kali
+        dengan automaton; teks duplikat memakai hasil scan yang sama.
+        """
+        columns = self.columns()
+        hits = np.zeros((len(texts), len(columns)), dtype=bool)
+        if len(texts) == 0 or not columns:
+            return hits, columns
+        if not self._built:
+            self.build()
+
+        scanned = {}
+        for row, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            cols = scanned.get(text)
+            if cols is None:
+                cols = scanned[text] = self._match_columns(text)
+            if cols:
+                hits[row, cols] = True
+        return hits, columns
+
+    def _match_columns(self, text):
+        """Index kolom hit_matrix yang muncul di text (satu pass automaton)"""
+        goto = self._goto
+        fail = self._fail
+        output_columns = self._output_columns
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output_columns[state]:
+                found.update(output_columns[state])
+        return list(found)
+
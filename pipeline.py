@@ -0,0 +1,271 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from storage import EXTENSIONS, coerce_types, default_format, read_table, stage_file, write_table
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_CACHE_DIR = '.pipeline_cache'
+
+
+def load_script(path, name):
+    """Import script yang nama filenya tidak valid sebagai modul (mis. 'text preprocessing.py')"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Didaftarkan dulu supaya fungsi di dalamnya bisa di-pickle ke worker process
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+# ===== STAGES =====
+def scrape(df, offline=False, workers=None, checkpoint=None, incremental=False):
+    import scraping
+    service_factory = None
+    if offline:
+        from fake_youtube import FakeYouTube
+        service_factory = FakeYouTube().service
+    comments, _ = scraping.main(
+        service_factory=service_factory,
+        workers=workers or scraping.max_workers,
+        output_file=None,
+        checkpoint_path=checkpoint,
+        incremental=incremental,
+    )
+    return pd.DataFrame(comments)
+
+
+def clean(df, cleaner='nlp', workers=None):
+    """
+    cleaned_comment_text dari comment_text. cleaner='nlp' memakai
+    `text preprocessing.py` (yang menghasilkan cleaned_comments selama ini),
+    'judol' memakai JudolTextCleaner dari code/Data Cleaning.py.
+    """
+    if cleaner == 'judol':
+        cleaning = load_script(os.path.join(ROOT, 'code', 'Data Cleaning.py'), 'data_cleaning')
+        return cleaning.clean_comments(df.copy(), new_column='cleaned_comment_text', workers=workers)
+    preprocessing = load_script(os.path.join(ROOT, 'text preprocessing.py'), 'text_preprocessing')
+    return preprocessing.preprocess_comments(df)
+
+
+def label(df, explain=False):
+    from labeling import label_comments
+    return label_comments(df.copy(), explain=explain)[0]
+
+
+def score(df, cache_path=None):
+    from featuring import FinalProductionJudolDetector
+    from score_cache import ScoreCache
+    detector = FinalProductionJudolDetector()
+    cache = ScoreCache(detector.version, path=cache_path) if cache_path else None
+    return detector.score_dataframe(df.copy(), cache=cache)
+
+
+class Stage:
+    """
+    Satu stage pipeline: fungsi DataFrame -> DataFrame plus file kode/data
+    yang menentukan versinya. Versi berubah -> cache stage ini (dan stage
+    sesudahnya) tidak terpakai lagi.
+    """
+
+    def __init__(self, name, func, sources, input_stem, output_stem, options=(), cacheable=True):
+        self.name = name
+        self.func = func
+        self.sources = sources
+        self.input_stem = input_stem
+        self.output_stem = output_stem
+        self.options = options
+        self.cacheable = cacheable
+
+    def version(self, options):
+        digest = hashlib.sha256(self.name.encode('utf-8'))
+        for source in self.sources:
+            path = os.path.join(ROOT, source)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(source.encode('utf-8') + b'\x00' + f.read())
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def run(self, df, options):
+        return self.func(df, **options)
+
+
+STAGES = {
+    'scrape': Stage('scrape', scrape, ['scraping.py', 'language_filter.py'], None, 'comments_from_scraping',
+                    options=('offline', 'workers', 'checkpoint', 'incremental'), cacheable=False),
+    'clean': Stage('clean', clean, ['text preprocessing.py', 'code/Data Cleaning.py', 'stemming.py'],
+                   'comments_from_scraping', 'cleaned_comments', options=('cleaner', 'workers')),
+    'label': Stage('label', label, ['labeling.py', 'rules.py', 'matcher.py'],
+                   'cleaned_comments', 'labeled_comments', options=('explain',)),
+    'score': Stage('score', score, ['featuring.py', 'matcher.py', 'judol_score_scale.txt'],
+                   'labeled_comments', 'final_production_judol_detection', options=('cache_path',)),
+}
+STAGE_ORDER = list(STAGES)
+
+
+def frame_hash(df):
+    """Hash isi DataFrame (kolom + nilai, tanpa index)"""
+    digest = hashlib.sha256(json.dumps([str(column) for column in df.columns]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def run_pipeline(stage_names, df=None, input_file=None, options=None, output_file=None,
+                 cache_dir=PIPELINE_CACHE_DIR, use_cache=True, save_intermediate=None, quarantine=False):
+    """
+    Jalankan stage berurutan di satu proses; DataFrame diteruskan di memori.
+
+    Cache: output stage disimpan di cache_dir dengan key = hash(input stage
+    pertama) + versi kode setiap stage sampai stage itu. Stage yang tidak
+    bisa di-cache (scrape) memulai key baru dari hash output-nya. Rerun dengan input
+    dan kode yang sama melewati stage yang tidak berubah. save_intermediate
+    (format 'parquet'/'csv'/...) juga menulis output tiap stage ke nama file
+    stage yang biasa (cleaned_comments, labeled_comments, ...). quarantine=True
+    menulis baris CSV rusak di input_file ke `<input>.quarantine.csv`.
+    """
+    options = options or {}
+    stages = [STAGES[name] for name in stage_names]
+    if df is None and input_file is None and stages[0].input_stem:
+        input_file = stage_file(stages[0].input_stem)
+    if df is None and input_file:
+        df = read_table(input_file, quarantine=quarantine)
+
+    if input_file:
+        key = file_hash(input_file)
+    elif df is not None:
+        key = frame_hash(df)
+    else:
+        key = None
+    cache_ext = EXTENSIONS[default_format()]
+    report = []
+
+    for stage in stages:
+        stage_options = {name: options[name] for name in stage.options if options.get(name) is not None}
+        key = hashlib.sha256(f"{key}:{stage.version(stage_options)}".encode('utf-8')).hexdigest()[:16] \
+            if key and stage.cacheable else None
+        cache_path = os.path.join(cache_dir, f"{stage.name}-{key}{cache_ext}") if key else None
+
+        start = time.perf_counter()
+        # Tipe kolom yang dikenal disamakan, supaya output stage yang baru dijalankan
+        # identik dengan yang dibaca dari cache (mis. like_count Int64, target int8)
+        if use_cache and cache_path and os.path.exists(cache_path):
+            df = coerce_types(read_table(cache_path))
+            status = 'cache'
+        else:
+            df = coerce_types(stage.run(df, stage_options))
+            status = 'run'
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                write_table(df, cache_path)
+        if not stage.cacheable:
+            # Stage sesudahnya tetap bisa di-cache, dengan key dari isi output stage ini
+            key = frame_hash(df)
+        seconds = time.perf_counter() - start
+        report.append({'stage': stage.name, 'status': status, 'rows': len(df), 'seconds': round(seconds, 3),
+                       'key': key})
+        print(f"{'⏭️ ' if status == 'cache' else '▶️ '} {stage.name:<6} {status:<5} {len(df):>8,} baris "
+              f"{seconds:>8.2f}s")
+
+        if save_intermediate:
+            write_table(df, stage_file(stage.output_stem, save_intermediate))
+
+    if output_file:
+        write_table(df, output_file)
+        print(f"✅ Output disimpan ke: {output_file}")
+    return df, report
+
+
+def select_stages(stages=None, start=None, stop=None):
+    """Daftar stage dari --stages, atau rentang --from/--to (urutan pipeline tetap)"""
+    if stages:
+        names = stages.split(',')
+    else:
+        # Tanpa --stages: default clean,label,score, tapi --from/--to memilih dari semua stage
+        names = STAGE_ORDER if start or stop else STAGE_ORDER[1:]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Stage tidak dikenal: {', '.join(unknown)} (pilih {', '.join(STAGE_ORDER)})")
+    if start:
+        names = [name for name in names if STAGE_ORDER.index(name) >= STAGE_ORDER.index(start)]
+    if stop:
+        names = [name for name in names if STAGE_ORDER.index(name) <= STAGE_ORDER.index(stop)]
+    return sorted(names, key=STAGE_ORDER.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline scrape -> clean -> label -> score dalam satu proses")
+    parser.add_argument('--stages', default=None,
+                        help=f"Stage yang dijalankan, pisahkan dengan koma (default: clean,label,score; "
+                             f"pilihan: {','.join(STAGE_ORDER)})")
+    parser.add_argument('--from', dest='start', choices=STAGE_ORDER, default=None, help="Mulai dari stage ini")
+    parser.add_argument('--to', dest='stop', choices=STAGE_ORDER, default=None, help="Berhenti setelah stage ini")
+    parser.add_argument('--input', default=None,
+                        help="Input stage pertama (default: file stage sebelumnya yang tersedia)")
+    parser.add_argument('--output', default=None,
+                        help="Output stage terakhir (default: nama file stage terakhir)")
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default=None,
+                        help="Format output (default: parquet jika pyarrow ada)")
+    parser.add_argument('--cache-dir', default=PIPELINE_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help="Jalankan ulang semua stage")
+    parser.add_argument('--save-intermediate', action='store_true',
+                        help="Tulis juga output setiap stage (cleaned_comments, labeled_comments, ...)")
+    parser.add_argument('--cleaner', choices=['nlp', 'judol'], default=None,
+                        help="nlp = text preprocessing.py (default), judol = JudolTextCleaner")
+    parser.add_argument('--workers', type=int, default=None, help="Worker untuk scrape/clean judol")
+    parser.add_argument('--explain', action='store_true', help="Tambah kolom rules_fired di stage label")
+    parser.add_argument('--offline', action='store_true', help="Stage scrape memakai fake_youtube")
+    parser.add_argument('--score-cache', default=None, help="ScoreCache SQLite untuk stage score")
+    parser.add_argument('--checkpoint', default=None, help="Checkpoint SQLite untuk stage scrape")
+    parser.add_argument('--incremental', action='store_true', help="Scrape hanya komentar baru (butuh --checkpoint)")
+    parser.add_argument('--quarantine', action='store_true',
+                        help="Tulis baris CSV rusak di --input ke <input>.quarantine.csv")
+    args = parser.parse_args()
+
+    stage_names = select_stages(args.stages, args.start, args.stop)
+    if not stage_names:
+        parser.error("Tidak ada stage yang dipilih")
+    fmt = args.format or default_format()
+    options = {
+        'cleaner': args.cleaner,
+        'workers': args.workers,
+        'explain': args.explain or None,
+        'offline': args.offline or None,
+        'checkpoint': args.checkpoint,
+        'incremental': args.incremental or None,
+        'cache_path': args.score_cache,
+    }
+    run_pipeline(
+        stage_names,
+        input_file=args.input,
+        options=options,
+        output_file=args.output or stage_file(STAGES[stage_names[-1]].output_stem, fmt),
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        save_intermediate=fmt if args.save_intermediate else None,
+        quarantine=args.quarantine,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import json
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+class StepProfiler:
+    """
+    Profil per step pipeline: jumlah panggilan, total waktu, p95, seberapa
+    sering step benar-benar mengubah teks, dan berapa kali step dilewati.
+
+    Durasi disimpan per panggilan (detik) agar p95 bisa dihitung; profil dari
+    proses lain (worker) bisa digabung lewat `merge(profiler.records())`.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._durations = defaultdict(list)
+        self._changed = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._skipped = defaultdict(int)
+
+    def record(self, step, seconds, changed, error=False):
+        self._durations[step].append(seconds)
+        if changed:
+            self._changed[step] += 1
+        if error:
+            self._errors[step] += 1
+
+    def record_skip(self, step):
+        # Pastikan step tetap muncul di summary walau selalu dilewati
+        self._durations[step]
+        self._skipped[step] += 1
+
+    def records(self):
+        """Data mentah yang bisa di-pickle (untuk dikirim dari worker)"""
+        return {
+            'durations': dict(self._durations),
+            'changed': dict(self._changed),
+            'errors': dict(self._errors),
+            'skipped': dict(self._skipped),
+        }
+
+    def merge(self, records):
+        for step, durations in records['durations'].items():
+            self._durations[step].extend(durations)
+        for step, count in records['changed'].items():
+            self._changed[step] += count
+        for step, count in records['errors'].items():
+            self._errors[step] += count
+        for step, count in records['skipped'].items():
+            self._skipped[step] += count
+
+    def summary(self):
+        """List of dict per step, urut sesuai kemunculan pertama di pipeline"""
+        rows = []
+        for step, durations in self._durations.items():
+            durations = np.asarray(durations)
+            calls = len(durations)
+            rows.append({
+                'step': step,
+                'calls': calls,
+                'total_s': float(durations.sum()),
+                'mean_ms': float(durations.mean() * 1000) if calls else 0.0,
+                'p95_ms': float(np.percentile(durations, 95) * 1000) if calls else 0.0,
+                'changed': self._changed[step],
+                'changed_rate': self._changed[step] / calls if calls else 0.0,
+                'errors': self._errors[step],
+                'skipped': self._skipped[step],
+            })
+        return rows
+
+    def to_frame(self):
+        return pd.DataFrame(self.summary())
+
+    def save(self, path):
+        """Simpan profil ke .json atau .csv (ditentukan dari ekstensi file)"""
+        if path.lower().endswith('.csv'):
+            self.to_frame().to_csv(path, index=False)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, indent=2)
+
+    def report(self, top=None):
+        """Ringkasan tabel, diurutkan dari step dengan total waktu terbesar"""
+        frame = self.to_frame()
+        if frame.empty:
+            return "No profile data"
+        frame = frame.sort_values('total_s', ascending=False)
+        if top:
+            frame = frame.head(top)
+        return frame.to_string(index=False, float_format=lambda value: f"{value:.4f}")
@@ -0,0 +1,130 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from matcher import TermMatcher
+
+# Aturan labeling judi dalam bentuk data. Ubah di sini, bukan di kode labeling.
+# Label 1 jika salah satu aturan ini terpenuhi (teks sudah di-lowercase):
+#
+#   platform:<nama>     ada nama platform/situs judi
+#   money:<pattern>     ada istilah judi + nominal uang + tidak ada konteks game
+#   combo:<a>+<b>       semua istilah dalam kombinasi muncul
+GAMBLING_RULES = {
+    'platforms': [
+        # Platform/situs judi
+        'lazadatoto', 'pstoto99', 'mini1221', 'kyt4d', 'togel62', 'bukit4d',
+        'pelatih4d', 'sajak4d', 'sendal4d', 'gelora4d', 'mona4d', 'sgi88',
+        'garudahoki', 'arwanatoto', 'plazabola', 'insan4d', 'berkahslot',
+        'pulauwin', 'paste4d', 'kurirslot', 'traxearn', 'biptrade', 'garuda69', 'phoenix638',
+        'mbak4d2', 'gaspol 168', 'mega177', 'upahslot', 'sikat88', 'pesiar88', 'grok681h', 'timo4d',
+        'bet4d', 'dibet4d', 'denyut69', 'squad777', 'pr0be 855', 'pr0be', 'spin68', 'pulauwin', 'pulau777'
+    ],
+    'terms': [
+        # Istilah teknis perjudian
+        'depo', 'deposit', 'wd', 'withdraw', 'modal', 'saldo', 'maxwin', 'scatter',
+        'jepe', 'gacor', 'hoki', 'jackpot', 'bet', 'taruhan', 'slot', 'togel',
+        'casino', 'poker', 'bandar', 'agen', 'bonus', 'freechip', 'turnover',
+        'rollingan', 'cashback', 'rebate', 'situs', 'platform', 'permainan uang',
+        'investasi', 'profit', 'cuan', 'pasang', 'wede', 'jp', 'pragmatic', 'rtp'
+    ],
+    # Pattern nominal uang (regex)
+    'money_patterns': {
+        'km': r'\d+[km]',  # 100k, 50m
+        'satuan': r'\d+\s*(?:rb|ribu|jt|juta|k|m)',  # 100 rb, 50 juta
+        'rp': r'rp\s*\d+',  # Rp 100000
+        'rupiah': r'\d+\s*(?:rupiah|perak)',  # 100 ribu rupiah
+    },
+    # Kata-kata yang bisa menyebabkan false positive (membatalkan aturan money)
+    'false_positive_triggers': ['game', 'main', 'mlbb', 'mobile legend', 'turnamen', 'tournament'],
+    # Kombinasi istilah judi yang spesifik
+    'strong_combinations': [
+        ('depo', 'wd'), ('modal', 'wd'), ('saldo', 'wd'),
+        ('maxwin', 'depo'), ('gacor', 'depo'), ('jepe', 'modal'), ('rtp', 'slot')
+    ],
+}
+
+
+class RuleSet:
+    """
+    Rule set labeling yang dikompilasi sekali: satu TermMatcher untuk
+    platform/istilah/trigger false positive, regex nominal uang, dan
+    kombinasi istilah sebagai indeks kolom hit matrix.
+
+    `evaluate` jalan per kolom (vectorized, tiap teks unik dievaluasi sekali)
+    dan memberi label plus ID aturan yang terpenuhi.
+    """
+
+    def __init__(self, rules=GAMBLING_RULES):
+        self.rules = rules
+        self.matcher = TermMatcher({
+            'platform': rules['platforms'],
+            'term': rules['terms'],
+            'fp_trigger': rules['false_positive_triggers'],
+        })
+        self.money_patterns = {name: re.compile(pattern) for name, pattern in rules['money_patterns'].items()}
+        self._columns = self.matcher.columns()
+        self._index = {column: i for i, column in enumerate(self._columns)}
+        self._categories = np.array([category for category, _ in self._columns])
+        self.combinations = [
+            ('combo:' + '+'.join(combo), [self._index['term', term] for term in combo])
+            for combo in rules['strong_combinations']
+        ]
+        self.rule_ids = (
+            [f'platform:{term}' for term in self.matcher.categories['platform']]
+            + [f'money:{name}' for name in self.money_patterns]
+            + [rule_id for rule_id, _ in self.combinations]
+        )
+
+    def _rule_matrix(self, texts):
+        """Bool array (len(texts), len(rule_ids)) untuk Series teks lowercase tanpa NaN"""
+        hits, _ = self.matcher.hit_matrix(texts)
+        platform = hits[:, self._categories == 'platform']
+        terms = hits[:, self._categories == 'term']
+        false_positive = hits[:, self._categories == 'fp_trigger'].any(axis=1)
+
+        # Pattern uang hanya dicek pada teks yang punya istilah judi tanpa konteks game.
+        # Pakai `re` Python (\d/\s Unicode: NBSP, digit fullwidth, dll), bukan kernel Arrow/RE2
+        money = np.zeros((len(texts), len(self.money_patterns)), dtype=bool)
+        candidates = np.flatnonzero(terms.any(axis=1) & ~false_positive)
+        if len(candidates):
+            candidate_texts = pd.Series(texts.iloc[candidates], dtype=object)
+            for col, pattern in enumerate(self.money_patterns.values()):
+                money[candidates, col] = candidate_texts.map(pattern.search).notna().to_numpy(dtype=bool)
+
+        combos = np.column_stack(
+            [hits[:, indices].all(axis=1) for _, indices in self.combinations]
+        ) if self.combinations else np.zeros((len(texts), 0), dtype=bool)
+        return np.hstack([platform, money, combos])
+
+    def evaluate(self, texts):
+        """
+        Label (array int 0/1) dan tuple ID aturan yang terpenuhi per teks.
+        Nilai yang bukan string (NaN, dll) selalu label 0.
+        """
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        is_text = texts.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        lowered = texts.where(is_text, '').astype(str).str.lower()
+
+        codes, uniques = pd.factorize(lowered)
+        matrix = self._rule_matrix(pd.Series(uniques, dtype=object))
+        fired_unique = [()] * len(uniques)
+        for row in np.flatnonzero(matrix.any(axis=1)):
+            fired_unique[row] = tuple(self.rule_ids[col] for col in np.flatnonzero(matrix[row]))
+
+        labels = (matrix.any(axis=1)[codes] & is_text).astype(int)
+        fired = [fired_unique[code] if ok else () for code, ok in zip(codes, is_text)]
+        return labels, fired
+
+    def label(self, texts):
+        return self.evaluate(texts)[0]
+
+    def explain(self, text):
+        """ID aturan yang terpenuhi untuk satu teks (kosong = bukan judi)"""
+        return self.evaluate([text])[1][0]
+
+
+def rule_counts(fired):
+    """Berapa kali tiap aturan terpenuhi, dari list/Series tuple ID aturan"""
+    return pd.Series([rule_id for ids in fired for rule_id in ids], dtype=object).value_counts()
@@ -0,0 +1,175 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class ScoreCache:
+    """
+    Content-addressed cache untuk hasil scoring per komentar.
+
+    Key = sha256(version + teks). `version` harus berubah setiap kali model,
+    lexicon, bobot, atau pipeline cleaning berubah, sehingga entry lama
+    otomatis tidak terpakai lagi. Entry versi lain di tier disk dibiarkan
+    (file yang sama bisa dipakai beberapa versi); hapus dengan `prune` atau
+    `python score_cache.py CACHE --prune --keep VERSION`.
+
+    Dua tier:
+    - memory: LRU dengan batas `maxsize` entry
+    - disk (opsional): SQLite di `path`, bertahan antar run
+    Value harus bisa di-serialize ke JSON (dict fitur, score, action, dll).
+    """
+
+    def __init__(self, version, maxsize=100_000, path=None):
+        self.version = str(version)
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, version TEXT, value TEXT)"
+            )
+            self._db.commit()
+
+    def key(self, text):
+        payload = self.version + '\x00' + text
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, text):
+        """Value untuk text, atau None jika belum ada di cache"""
+        return self.get_many([text])[0]
+
+    def put(self, text, value):
+        self.put_many([text], [value])
+
+    def get_many(self, texts):
+        keys = [self.key(text) for text in texts]
+        values = [None] * len(keys)
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    values[i] = value
+                else:
+                    missing.append(i)
+
+            if missing and self._db is not None:
+                found = {}
+                unique_keys = list({keys[i] for i in missing})
+                # Batasi jumlah parameter per query SQLite
+                for start in range(0, len(unique_keys), 500):
+                    batch = unique_keys[start:start + 500]
+                    placeholders = ','.join('?' * len(batch))
+                    rows = self._db.execute(
+                        f"SELECT key, value FROM scores WHERE version = ? AND key IN ({placeholders})",
+                        [self.version, *batch],
+                    )
+                    for key, value in rows:
+                        found[key] = json.loads(value)
+                still_missing = []
+                for i in missing:
+                    value = found.get(keys[i])
+                    if value is None:
+                        still_missing.append(i)
+                    else:
+                        values[i] = value
+                        self._remember(keys[i], value)
+                missing = still_missing
+
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+        return values
+
+    def put_many(self, texts, values):
+        rows = []
+        with self._lock:
+            for text, value in zip(texts, values):
+                key = self.key(text)
+                self._remember(key, value)
+                rows.append((key, self.version, json.dumps(value)))
+            if self._db is not None and rows:
+                self._db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)", rows)
+                self._db.commit()
+
+    def lookup_or_compute(self, texts, compute_batch):
+        """
+        Ambil hasil untuk semua texts; yang belum ada dihitung SEKALI per teks
+        unik lewat compute_batch(list_of_texts) -> list_of_values, lalu disimpan.
+        """
+        texts = list(texts)
+        values = self.get_many(texts)
+        pending = list(dict.fromkeys(text for text, value in zip(texts, values) if value is None))
+        if pending:
+            computed = dict(zip(pending, compute_batch(pending)))
+            self.put_many(pending, [computed[text] for text in pending])
+            values = [computed[text] if value is None else value for text, value in zip(texts, values)]
+        return values
+
+    def prune(self):
+        """Hapus entry tier disk dari versi selain `version`; return jumlah yang dihapus"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM scores WHERE version != ?", (self.version,)).rowcount
+            self._db.commit()
+        return deleted
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'memory_entries': len(self._memory),
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def version_counts(path):
+    """Jumlah entry per versi di file cache SQLite"""
+    with sqlite3.connect(path) as db:
+        return dict(db.execute("SELECT version, COUNT(*) FROM scores GROUP BY version ORDER BY version"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lihat atau bersihkan tier disk ScoreCache")
+    parser.add_argument('path', help="File SQLite cache")
+    parser.add_argument('--prune', action='store_true', help="Hapus semua entry kecuali versi di --keep")
+    parser.add_argument('--keep', action='append', default=[], help="Versi yang dipertahankan (boleh berulang)")
+    args = parser.parse_args()
+
+    if args.prune:
+        if not args.keep:
+            parser.error("--prune butuh minimal satu --keep VERSION")
+        with sqlite3.connect(args.path) as db:
+            placeholders = ','.join('?' * len(args.keep))
+            deleted = db.execute(f"DELETE FROM scores WHERE version NOT IN ({placeholders})", args.keep).rowcount
+        print(f"🧹 {deleted:,} entry dari versi lain dihapus")
+    for version, count in version_counts(args.path).items():
+        print(f"{version}  {count:>10,} entry")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,20 @@
+import argparse
+import json
 import os
+import sqlite3
+import sys
 import time
-import random
 import ssl
+import threading
 import urllib3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from tqdm import tqdm
-from googleapiclient.discovery import build
-from langdetect import detect, LangDetectException
 import pandas as pd
 
+from language_filter import LanguageFilter
+from storage import default_format, stage_file, write_table
+
 # =============================
 # LIST API KEYS
 # =============================
@@ -15,22 +22,6 @@ API_KEYS = [
     "API_KEY"
 ]
 
-current_key_index = 0
-
-def get_youtube_service():
-    global current_key_index
-    key = API_KEYS[current_key_index]
-    return build("youtube", "v3", developerKey=key)
-
-youtube = get_youtube_service()
-
-def switch_api_key():
-    """Ganti API key ke berikutnya kalau kuota habis."""
-    global current_key_index, youtube
-    current_key_index = (current_key_index + 1) % len(API_KEYS)
-    youtube = get_youtube_service()
-    print(f"🔄 Ganti ke API key #{current_key_index + 1}")
-
 # =============================
 # KONFIGURASI
 # =============================
@@ -38,25 +29,384 @@ ssl._create_default_https_context = ssl._create_unverified_context
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 keywords = ["slot", "toto", "casino", "poker", "rtp", "jackpot", "gacor", "zeus"]
-custom_video_ids = ["YZ4N8jH5R_M", "s9OU_mLo-KU", "1msXOdJcG9s", "Nkh1KiTS5CM", 
-                   "rkoymgMW-8M", "7TsgXbRGOQo", "yY76VsIplzo", "JpaK8OhL4FI", 
+custom_video_ids = ["YZ4N8jH5R_M", "s9OU_mLo-KU", "1msXOdJcG9s", "Nkh1KiTS5CM",
+                   "rkoymgMW-8M", "7TsgXbRGOQo", "yY76VsIplzo", "JpaK8OhL4FI",
                    "UnVihN2_M2U", "GHbSjBdMB8E", "4k6rzuj0bWI", "FpSJFqYaRb8", "dXtcUtRJO0g"]
 
 max_videos_per_keyword = 100
 max_comments_per_video = 500
 
+# Konkurensi & rate limit (request per detik untuk SEMUA thread bersama)
+max_workers = 8
+requests_per_second = 8.0
+
+# Biaya kuota YouTube Data API per request (unit) & kuota harian default per key
+UNIT_COSTS = {"search": 100, "commentThreads": 1}
+daily_quota_per_key = 10_000
+
+# =============================
+# YOUTUBE CLIENT
+# =============================
+def build_youtube_service(key):
+    """Service googleapiclient untuk satu API key (import di sini agar mode offline tidak butuh googleapiclient)"""
+    from googleapiclient.discovery import build
+    return build("youtube", "v3", developerKey=key)
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: rata-rata `rate` request per detik dengan burst
+    maksimal `capacity`. Menggantikan time.sleep acak per halaman.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def next_quota_reset(now=None):
+    """Kuota YouTube Data API di-reset setiap tengah malam waktu Pasifik"""
+    try:
+        from zoneinfo import ZoneInfo
+        pacific = ZoneInfo("America/Los_Angeles")
+    except Exception:
+        pacific = timezone(timedelta(hours=-8))
+    now = now or datetime.now(timezone.utc)
+    local_now = now.astimezone(pacific)
+    midnight = (local_now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.astimezone(timezone.utc)
+
+
+class QuotaExhausted(Exception):
+    """Semua API key di pool kehabisan kuota"""
+
+
+class KeyPool:
+    """
+    Pool API key dengan budget kuota harian per key, aman dipakai banyak thread:
+    - setiap request dibebankan sesuai UNIT_COSTS (search=100, commentThreads=1)
+    - request memakai key dengan sisa budget terbesar
+    - jika semua key habis: tunggu sampai kuota di-reset (wait=True) atau
+      raise QuotaExhausted (wait=False)
+    - service per key di-build sekali per thread lalu di-cache
+      (objek googleapiclient tidak thread-safe)
+    """
+
+    def __init__(self, api_keys=None, service_factory=None, budget_per_key=None, wait=True):
+        self.api_keys = list(api_keys or API_KEYS)
+        self.service_factory = service_factory or build_youtube_service
+        self.budget_per_key = budget_per_key or daily_quota_per_key
+        self.wait = wait
+        self.remaining = {key: self.budget_per_key for key in self.api_keys}
+        self.used = {key: 0 for key in self.api_keys}
+        self.reset_at = next_quota_reset()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    def label(self, key):
+        return f"#{self.api_keys.index(key) + 1}"
+
+    def acquire(self, cost):
+        """Pesan `cost` unit dari key dengan headroom terbesar; return key tersebut"""
+        with self._condition:
+            while True:
+                if datetime.now(timezone.utc) >= self.reset_at:
+                    self._reset()
+                key = max(self.api_keys, key=lambda k: self.remaining[k])
+                if self.remaining[key] >= cost:
+                    self.remaining[key] -= cost
+                    self.used[key] += cost
+                    return key
+                if not self.wait:
+                    raise QuotaExhausted(
+                        f"Semua {len(self.api_keys)} API key kehabisan kuota (reset {self.reset_at:%Y-%m-%d %H:%M} UTC)"
+                    )
+                seconds = max(1.0, (self.reset_at - datetime.now(timezone.utc)).total_seconds())
+                print(f"⏸️ Semua API key kehabisan kuota, tunggu reset {seconds / 3600:.1f} jam lagi...")
+                self._condition.wait(timeout=seconds)
+
+    def mark_exhausted(self, key):
+        """API bilang quotaExceeded -> budget key ini dianggap habis sampai reset"""
+        with self._condition:
+            if self.remaining[key]:
+                print(f"⚠️ Kuota habis di key {self.label(key)}, pindah ke key lain...")
+            self.remaining[key] = 0
+
+    def _reset(self):
+        self.remaining = {key: self.budget_per_key for key in self.api_keys}
+        self.reset_at = next_quota_reset()
+        print("🔄 Kuota harian di-reset")
+        self._condition.notify_all()
+
+    def service(self, key):
+        services = getattr(self._local, "services", None)
+        if services is None:
+            services = self._local.services = {}
+        if key not in services:
+            services[key] = self.service_factory(key)
+        return services[key]
+
+    def usage(self):
+        with self._condition:
+            return {self.label(key): {"used": self.used[key], "remaining": self.remaining[key]}
+                    for key in self.api_keys}
+
+
+class YouTubeClient:
+    """
+    Akses YouTube Data API yang aman dipakai banyak thread sekaligus:
+    - key & service dari KeyPool (budget kuota per key)
+    - rate limit global lewat TokenBucket
+    - hitung pemakaian kuota (unit) per endpoint
+    """
+
+    def __init__(self, key_pool=None, service_factory=None, rate=None):
+        self.key_pool = key_pool or KeyPool(service_factory=service_factory)
+        self.rate_limiter = TokenBucket(rate or requests_per_second)
+        self.units_used = {endpoint: 0 for endpoint in UNIT_COSTS}
+        self._lock = threading.Lock()
+
+    def execute(self, endpoint, **params):
+        """Jalankan <endpoint>().list(**params).execute() dengan budget kuota & rate limit"""
+        cost = UNIT_COSTS[endpoint]
+        while True:
+            key = self.key_pool.acquire(cost)
+            self.rate_limiter.acquire()
+            resource = getattr(self.key_pool.service(key), endpoint)()
+            try:
+                response = resource.list(**params).execute()
+            except Exception as e:
+                if "quotaExceeded" in str(e):
+                    self.key_pool.mark_exhausted(key)
+                    continue
+                raise
+            with self._lock:
+                self.units_used[endpoint] += cost
+            return response
+
+# =============================
+# CHECKPOINT
+# =============================
+class ScrapeCheckpoint:
+    """
+    Checkpoint SQLite agar scraping bisa dilanjutkan setelah crash.
+
+    - videos: per video status (in_progress / done / skipped), nextPageToken
+      terakhir, jumlah halaman & komentar, dan published_at terbaru yang pernah dilihat
+    - comments: komentar disimpan per halaman, satu transaksi bersama update
+      state video (tidak pernah ada halaman tersimpan tanpa token-nya)
+    - searches: hasil pencarian per keyword (search = 100 unit, jangan diulang)
+
+    `generation` naik setiap fetch inkremental; komentar generasi terbaru
+    (lebih baru) ditaruh di depan agar urutan tetap terbaru-dulu seperti API.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY, status TEXT, next_page_token TEXT,
+                pages_tried INTEGER, comment_count INTEGER, last_published_at TEXT,
+                newer_than TEXT, generation INTEGER, reason TEXT
+            );
+            CREATE TABLE IF NOT EXISTS comments (
+                video_id TEXT, generation INTEGER, seq INTEGER, author TEXT, comment_text TEXT,
+                published_at TEXT, like_count INTEGER, is_promo INTEGER,
+                PRIMARY KEY (video_id, generation, seq)
+            );
+            CREATE TABLE IF NOT EXISTS searches (keyword TEXT PRIMARY KEY, video_ids TEXT);
+            CREATE TABLE IF NOT EXISTS seen_videos (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT UNIQUE, source TEXT
+            );
+        """)
+        self._db.commit()
+
+    def video_state(self, video_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, next_page_token, pages_tried, comment_count, last_published_at, newer_than, "
+                "generation, reason FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ["status", "next_page_token", "pages_tried", "comment_count", "last_published_at",
+                "newer_than", "generation", "reason"]
+        return dict(zip(keys, row))
+
+    def generation_count(self, video_id, generation):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM comments WHERE video_id = ? AND generation = ?", (video_id, generation)
+            ).fetchone()[0]
+
+    def start_video(self, video_id):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO videos VALUES (?, 'in_progress', NULL, 0, 0, NULL, NULL, 0, NULL)",
+                (video_id,)
+            )
+
+    def start_incremental(self, video_id):
+        """Mulai generasi baru: ambil ulang dari halaman pertama, hanya komentar > last_published_at"""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE videos SET status = 'in_progress', next_page_token = NULL, newer_than = last_published_at, "
+                "generation = generation + 1 WHERE video_id = ?", (video_id,)
+            )
+
+    def save_page(self, video_id, comments, next_page_token, pages_tried, last_published_at, finished,
+                  reason=None):
+        """Simpan satu halaman komentar + state pagination dalam satu transaksi"""
+        with self._lock, self._db:
+            generation, total = self._db.execute(
+                "SELECT generation, comment_count FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            start = self._db.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM comments WHERE video_id = ? AND generation = ?",
+                (video_id, generation)
+            ).fetchone()[0]
+            self._db.executemany(
+                "INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(video_id, generation, start + i, c["author"], c["comment_text"], c["published_at"],
+                  c["like_count"], int(c["is_promo"])) for i, c in enumerate(comments)]
+            )
+            total += len(comments)
+            status = "in_progress"
+            if finished:
+                status = "done" if total else "skipped"
+                reason = None if total else (reason or "unknown_empty")
+            self._db.execute(
+                "UPDATE videos SET status = ?, next_page_token = ?, pages_tried = ?, comment_count = ?, "
+                "last_published_at = ?, reason = ? WHERE video_id = ?",
+                (status, next_page_token, pages_tried, total, last_published_at, reason, video_id)
+            )
+
+    def finish(self, video_id, reason, pages_tried):
+        """Tutup video yang berhenti karena error (komentar dimatikan, 403, ...)"""
+        self.save_page(video_id, [], None, pages_tried, self.video_state(video_id)["last_published_at"],
+                       finished=True, reason=reason)
+
+    def load_video(self, video_id):
+        """Return (comments, skipped) dengan format yang sama seperti get_comments"""
+        state = self.video_state(video_id)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT author, comment_text, published_at, like_count, is_promo FROM comments "
+                "WHERE video_id = ? ORDER BY generation DESC, seq", (video_id,)
+            ).fetchall()
+        comments = [{
+            "video_id": video_id,
+            "author": author,
+            "comment_text": text,
+            "published_at": published_at,
+            "like_count": like_count,
+            "is_promo": bool(is_promo)
+        } for author, text, published_at, like_count, is_promo in rows]
+        skipped = None
+        if state["status"] == "skipped":
+            skipped = {"video_id": video_id, "reason": state["reason"], "pages_tried": state["pages_tried"]}
+        return comments, skipped
+
+    def search_results(self, keyword):
+        with self._lock:
+            row = self._db.execute("SELECT video_ids FROM searches WHERE keyword = ?", (keyword,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_search(self, keyword, video_ids):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO searches VALUES (?, ?)", (keyword, json.dumps(video_ids)))
+
+    def seen_videos(self):
+        """[(video_id, source), ...] urut sesuai pertama kali terlihat"""
+        with self._lock:
+            return self._db.execute("SELECT video_id, source FROM seen_videos ORDER BY seq").fetchall()
+
+    def mark_seen(self, entries):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR IGNORE INTO seen_videos (video_id, source) VALUES (?, ?)", entries)
+
+    def close(self):
+        self._db.close()
+
+
+class SeenVideoIndex:
+    """
+    Index video yang sudah pernah terlihat (custom, hasil search, termasuk yang
+    di-skip / tanpa komentar): video_id -> sumber pertama, lookup O(1).
+
+    Urutan pertama kali terlihat dipertahankan; jika ada checkpoint, index
+    disimpan di sana sehingga video dari run sebelumnya tidak dianggap baru.
+    """
+
+    def __init__(self, checkpoint=None):
+        self.checkpoint = checkpoint
+        self._sources = {}
+        if checkpoint is not None:
+            self._sources.update(checkpoint.seen_videos())
+
+    def __contains__(self, video_id):
+        return video_id in self._sources
+
+    def __len__(self):
+        return len(self._sources)
+
+    def __iter__(self):
+        return iter(self._sources)
+
+    def source(self, video_id):
+        return self._sources.get(video_id)
+
+    def add_many(self, video_ids, source):
+        """Tambahkan video yang belum terlihat; return list video_id yang baru"""
+        new_ids = []
+        for vid in video_ids:
+            if vid not in self._sources:
+                self._sources[vid] = source
+                new_ids.append(vid)
+        if self.checkpoint is not None and new_ids:
+            self.checkpoint.mark_seen([(vid, source) for vid in new_ids])
+        return new_ids
+
 # =============================
 # FUNGSI BANTU
 # =============================
+language_filter = None
+
+def init_language_detector(workers=None):
+    """
+    Siapkan LanguageFilter bersama sebelum thread dimulai. Profil langdetect
+    dimuat sekali di sini karena lazy init bawaan langdetect tidak thread-safe:
+    thread lain bisa memakai factory yang profilnya baru separuh dimuat.
+    """
+    global language_filter
+    if language_filter is None:
+        language_filter = LanguageFilter(workers=workers)
+    return language_filter
+
+def filter_indonesian(texts):
+    """List bool per teks; pendek/ambigu/gagal deteksi dianggap Indonesia (biar gak di-drop diam-diam)"""
+    return init_language_detector().filter(texts)
+
 def is_indonesian(text):
     """Coba deteksi bahasa; fallback ke True jika pendek/ambigu."""
-    text = text.strip()
-    if len(text) < 5:  # komentar sangat pendek (emoji, dll)
-        return True
-    try:
-        return detect(text) == "id"
-    except LangDetectException:
-        return True  # biar gak di-drop diam-diam
+    return filter_indonesian([text])[0]
 
 def is_promo_comment(text):
     promo_words = [
@@ -67,12 +417,13 @@ def is_promo_comment(text):
     t = text.lower()
     return any(word in t for word in promo_words)
 
-def search_videos(keyword):
+def search_videos(client, keyword):
     vids = []
     next_page_token = None
     while len(vids) < max_videos_per_keyword:
         try:
-            req = youtube.search().list(
+            res = client.execute(
+                "search",
                 q=keyword,
                 part="id",
                 type="video",
@@ -80,7 +431,6 @@ def search_videos(keyword):
                 pageToken=next_page_token,
                 regionCode="ID"
             )
-            res = req.execute()
             for item in res.get("items", []):
                 vids.append(item["id"]["videoId"])
                 if len(vids) >= max_videos_per_keyword:
@@ -88,144 +438,337 @@ def search_videos(keyword):
             next_page_token = res.get("nextPageToken")
             if not next_page_token:
                 break
+        except QuotaExhausted:
+            raise
         except Exception as e:
-            msg = str(e)
-            if "quotaExceeded" in msg:
-                print("⚠️ Kuota habis, ganti API key...")
-                switch_api_key()
-                continue
-            print(f"⚠️ Error cari video: {msg}")
+            print(f"⚠️ Error cari video: {e}")
             break
-        time.sleep(random.uniform(0.5, 1.2))
     return vids
 
-def get_comments(video_id):
+def get_comments(client, video_id, checkpoint=None, incremental=False):
+    """
+    Return (comments, skipped) -- skipped berisi alasan jika video tidak menghasilkan komentar.
+
+    Dengan checkpoint: setiap halaman langsung disimpan, video in_progress
+    dilanjutkan dari nextPageToken terakhir, dan pada mode incremental video
+    yang sudah selesai hanya diambil komentar yang lebih baru dari
+    published_at terakhir yang pernah dilihat.
+    """
     comments = []
     skipped_reason = None
     next_token = None
     page_counter = 0
+    limit = max_comments_per_video
+    newer_than = None
+    latest_seen = None
 
-    with tqdm(total=max_comments_per_video, desc=f"💬 {video_id}", leave=False) as pbar:
-        while len(comments) < max_comments_per_video:
-            try:
-                req = youtube.commentThreads().list(
-                    part="snippet",
-                    videoId=video_id,
-                    textFormat="plainText",
-                    maxResults=100,
-                    pageToken=next_token
-                )
-                res = req.execute()
-                items = res.get("items", [])
-                page_counter += 1
-
-                if not items:
-                    skipped_reason = "no_items"
-                    break
+    if checkpoint is not None:
+        state = checkpoint.video_state(video_id)
+        if state is None:
+            checkpoint.start_video(video_id)
+        elif incremental and state["status"] == "done":
+            checkpoint.start_incremental(video_id)
+        state = checkpoint.video_state(video_id)
+        # Lanjutkan dari halaman terakhir yang tersimpan
+        next_token = state["next_page_token"]
+        page_counter = state["pages_tried"]
+        newer_than = state["newer_than"]
+        latest_seen = state["last_published_at"]
+        limit -= checkpoint.generation_count(video_id, state["generation"])
 
-                for item in items:
-                    snippet = item["snippet"]["topLevelComment"]["snippet"]
-                    text = snippet["textOriginal"].strip()
-                    if is_indonesian(text):
-                        comments.append({
-                            "video_id": video_id,
-                            "author": snippet["authorDisplayName"],
-                            "comment_text": text,
-                            "published_at": snippet["publishedAt"],
-                            "like_count": snippet.get("likeCount", 0),
-                            "is_promo": is_promo_comment(text)
-                        })
-                        pbar.update(1)
-                        if len(comments) >= max_comments_per_video:
-                            break
-
-                next_token = res.get("nextPageToken")
-                if not next_token:
-                    break
+    while len(comments) < limit:
+        try:
+            params = dict(
+                part="snippet",
+                videoId=video_id,
+                textFormat="plainText",
+                maxResults=100,
+                pageToken=next_token
+            )
+            if newer_than:
+                params["order"] = "time"
+            res = client.execute("commentThreads", **params)
+            items = res.get("items", [])
+            page_counter += 1
 
-            except Exception as e:
-                msg = str(e)
-                if "commentsDisabled" in msg:
-                    skipped_reason = "comments_disabled"
-                    print(f"🚫 Komentar dimatikan: {video_id}")
-                    break
-                elif "forbidden" in msg or "403" in msg:
-                    skipped_reason = "forbidden"
-                    print(f"🚫 Akses dilarang (403): {video_id}")
+            if not items:
+                skipped_reason = "no_items"
+                if checkpoint is not None:
+                    checkpoint.save_page(video_id, [], None, page_counter, latest_seen, True, skipped_reason)
+                break
+
+            snippets = []
+            reached_seen = False
+            for item in items:
+                snippet = item["snippet"]["topLevelComment"]["snippet"]
+                published_at = snippet["publishedAt"]
+                # Mode incremental: komentar urut terbaru dulu, berhenti di yang sudah pernah dilihat
+                if newer_than and published_at <= newer_than:
+                    reached_seen = True
                     break
-                elif "quotaExceeded" in msg:
-                    print(f"⚠️ Kuota habis di key #{current_key_index + 1}, ganti...")
-                    switch_api_key()
-                    continue
-                else:
-                    skipped_reason = msg
-                    print(f"⚠️ Error ambil komentar {video_id}: {msg}")
-                    time.sleep(1)
-                    continue
-            time.sleep(random.uniform(0.6, 1.2))
+                latest_seen = max(latest_seen or published_at, published_at)
+                snippets.append(snippet)
+
+            # Deteksi bahasa satu halaman sekaligus (batch)
+            texts = [snippet["textOriginal"].strip() for snippet in snippets]
+            page_comments = []
+            for snippet, text, indonesian in zip(snippets, texts, filter_indonesian(texts)):
+                if indonesian:
+                    page_comments.append({
+                        "video_id": video_id,
+                        "author": snippet["authorDisplayName"],
+                        "comment_text": text,
+                        "published_at": snippet["publishedAt"],
+                        "like_count": snippet.get("likeCount", 0),
+                        "is_promo": is_promo_comment(text)
+                    })
+                    if len(comments) + len(page_comments) >= limit:
+                        break
+            comments.extend(page_comments)
+
+            next_token = res.get("nextPageToken")
+            finished = not next_token or reached_seen or len(comments) >= limit
+            if checkpoint is not None:
+                checkpoint.save_page(video_id, page_comments, None if finished else next_token,
+                                     page_counter, latest_seen, finished)
+            if finished:
+                break
+
+        except QuotaExhausted:
+            raise
+        except Exception as e:
+            msg = str(e)
+            if "commentsDisabled" in msg:
+                skipped_reason = "comments_disabled"
+                print(f"🚫 Komentar dimatikan: {video_id}")
+            elif "forbidden" in msg or "403" in msg:
+                skipped_reason = "forbidden"
+                print(f"🚫 Akses dilarang (403): {video_id}")
+            else:
+                skipped_reason = msg
+                print(f"⚠️ Error ambil komentar {video_id}: {msg}")
+                time.sleep(1)
+                continue
+            if checkpoint is not None:
+                checkpoint.finish(video_id, skipped_reason, page_counter)
+            break
+    else:
+        # Batas komentar sudah tercapai sebelum halaman pertama (resume)
+        if checkpoint is not None:
+            checkpoint.save_page(video_id, [], None, page_counter, latest_seen, True, skipped_reason)
+
+    if checkpoint is not None:
+        return checkpoint.load_video(video_id)
 
     # Catat kalau tidak ada hasil sama sekali
+    skipped = None
     if len(comments) == 0:
         reason = skipped_reason or "unknown_empty"
-        skipped_log.append({"video_id": video_id, "reason": reason, "pages_tried": page_counter})
+        skipped = {"video_id": video_id, "reason": reason, "pages_tried": page_counter}
 
-    return comments
+    return comments, skipped
 
 # =============================
-# MAIN LOOP
+# FETCH PARALEL
 # =============================
-all_comments = []
-skipped_log = []
+def search_all_keywords(client, keywords, workers, checkpoint=None, refresh=False):
+    """
+    Cari video untuk semua keyword sekaligus; return {keyword: [video_id, ...]} (urutan keyword tetap).
+    Hasil yang sudah ada di checkpoint dipakai ulang kecuali refresh=True.
+    """
+    keyword_videos = {}
+    if checkpoint is not None and not refresh:
+        for kw in keywords:
+            stored = checkpoint.search_results(kw)
+            if stored is not None:
+                keyword_videos[kw] = stored
 
-# Ambil komentar dari video yang dipilih sendiri
-print("🎯 Mengambil komentar dari video yang ditentukan...")
-for i, vid in enumerate(custom_video_ids, start=1):
-    print(f"🧩 Ambil komentar dari video {i}/{len(custom_video_ids)}: {vid}")
-    cmts = get_comments(vid)
-    if cmts:
-        all_comments.extend(cmts)
-        print(f"✅ Dapat {len(cmts)} komentar dari {vid}")
-    else:
-        print(f"⚠️ Tidak ada komentar dari video {vid}")
-
-# Ambil komentar dari pencarian keyword (opsional)
-print("\n🎯 Mencari video dengan kata kunci...")
-for kw in keywords:
-    print(f"\n🔍 Mencari video dengan kata kunci: '{kw}'")
-    vids = search_videos(kw)
-    print(f"📹 Ditemukan {len(vids)} video untuk keyword '{kw}'")
-    
-    for i, vid in enumerate(vids, start=1):
-        # Skip jika video ID sudah diambil sebelumnya
-        if any(comment['video_id'] == vid for comment in all_comments):
-            print(f"⏭️ Video {vid} sudah diambil, skip...")
-            continue
-            
-        print(f"🧩 Ambil komentar dari video {i}/{len(vids)}: {vid}")
-        cmts = get_comments(vid)
+    pending = [kw for kw in keywords if kw not in keyword_videos]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {kw: executor.submit(search_videos, client, kw) for kw in pending}
+        for kw in pending:
+            keyword_videos[kw] = futures[kw].result()
+            if checkpoint is not None:
+                checkpoint.save_search(kw, keyword_videos[kw])
+    return {kw: keyword_videos[kw] for kw in keywords}
+
+def fetch_all_comments(client, video_ids, workers, checkpoint=None, incremental=False):
+    """
+    Ambil komentar setiap video unik tepat sekali secara paralel; return {video_id: (comments, skipped)}.
+    Video yang sudah selesai di checkpoint diambil dari checkpoint tanpa request API
+    (mode incremental: video selesai tetap dicek untuk komentar baru).
+    """
+    unique_ids = list(dict.fromkeys(video_ids))
+    results = {}
+    to_fetch = []
+    for vid in unique_ids:
+        state = checkpoint.video_state(vid) if checkpoint is not None else None
+        if state is None or state["status"] == "in_progress" or (incremental and state["status"] == "done"):
+            to_fetch.append(vid)
+        else:
+            results[vid] = checkpoint.load_video(vid)
+    if checkpoint is not None:
+        print(f"♻️ {len(results)} video diambil dari checkpoint, {len(to_fetch)} video di-fetch")
+
+    init_language_detector()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(get_comments, client, vid, checkpoint, incremental): vid for vid in to_fetch}
+        try:
+            for future in tqdm(as_completed(futures), total=len(futures), desc="💬 Ambil komentar"):
+                results[futures[future]] = future.result()
+        except QuotaExhausted:
+            # Jangan jalankan sisa antrean jika semua key sudah habis
+            for future in futures:
+                future.cancel()
+            raise
+    return results
+
+def build_seen_index(custom_video_ids, keyword_videos, checkpoint=None):
+    """Dedupe video custom + hasil semua keyword sebelum ada request komentar"""
+    seen = SeenVideoIndex(checkpoint)
+    previous = len(seen)
+    if previous:
+        print(f"♻️ {previous} video sudah tercatat dari run sebelumnya")
+
+    new_custom = seen.add_many(custom_video_ids, "custom")
+    print(f"🎯 {len(custom_video_ids)} video custom ({len(new_custom)} baru)")
+    for kw, vids in keyword_videos.items():
+        new_ids = seen.add_many(vids, f"keyword:{kw}")
+        print(f"📹 Ditemukan {len(vids)} video untuk keyword '{kw}' ({len(new_ids)} baru)")
+    print(f"🧮 Total {len(seen)} video unik")
+    return seen
+
+def collect_comments(seen, fetched):
+    """
+    Susun hasil per video unik sesuai urutan pertama kali terlihat; setiap
+    video muncul tepat sekali, video tanpa komentar dicatat di skipped_log.
+    """
+    all_comments = []
+    skipped_log = []
+
+    for i, vid in enumerate(seen, start=1):
+        cmts, skipped = fetched[vid]
         if cmts:
             all_comments.extend(cmts)
-            print(f"✅ Dapat {len(cmts)} komentar dari {vid}")
+            print(f"✅ [{i}/{len(seen)}] Dapat {len(cmts)} komentar dari {vid} ({seen.source(vid)})")
         else:
-            print(f"⚠️ Tidak ada komentar dari video {vid}")
+            print(f"⚠️ [{i}/{len(seen)}] Tidak ada komentar dari video {vid} ({seen.source(vid)})")
+        if skipped:
+            skipped_log.append(dict(skipped))
+
+    return all_comments, skipped_log
 
 # =============================
 # SIMPAN HASIL
 # =============================
-df = pd.DataFrame(all_comments)
-df.to_csv("comments_from_scraping.csv", index=False, encoding="utf-8-sig")
+def save_results(all_comments, skipped_log, output_file="comments_from_scraping.csv",
+                 skipped_file="skipped_videos.csv"):
+    df = pd.DataFrame(all_comments)
+    write_table(df, output_file, csv_encoding="utf-8-sig")
+
+    if skipped_log:
+        pd.DataFrame(skipped_log).to_csv(skipped_file, index=False, encoding="utf-8-sig")
+        print(f"\n⚠️ {len(skipped_log)} video gagal diambil, disimpan ke {skipped_file}")
+
+    print(f"\n✅ Total komentar terkumpul: {len(all_comments)}")
+    print(f"💾 Disimpan ke {output_file}")
+
+    # Tampilkan statistik
+    if len(all_comments) > 0:
+        promo_count = sum(1 for comment in all_comments if comment['is_promo'])
+        print(f"📊 Statistik:")
+        print(f"   - Total komentar: {len(all_comments)}")
+        print(f"   - Komentar promosi: {promo_count} ({promo_count/len(all_comments)*100:.1f}%)")
+        print(f"   - Video unik: {len(set(comment['video_id'] for comment in all_comments))}")
+
+# =============================
+# MAIN
+# =============================
+def main(service_factory=None, workers=max_workers, rate=requests_per_second,
+         output_file="comments_from_scraping.csv", skipped_file="skipped_videos.csv",
+         api_keys=None, quota_per_key=None, wait_for_quota=True, checkpoint_path=None, incremental=False,
+         lang_workers=None):
+    init_language_detector(lang_workers)
+    key_pool = KeyPool(api_keys, service_factory, budget_per_key=quota_per_key, wait=wait_for_quota)
+    client = YouTubeClient(key_pool, rate=rate)
+    checkpoint = ScrapeCheckpoint(checkpoint_path) if checkpoint_path else None
+
+    print(f"🔍 Mencari video untuk {len(keywords)} kata kunci...")
+    keyword_videos = search_all_keywords(client, keywords, workers, checkpoint, refresh=incremental)
+
+    seen = build_seen_index(custom_video_ids, keyword_videos, checkpoint)
+    fetched = fetch_all_comments(client, list(seen), workers, checkpoint, incremental)
+    if checkpoint is not None:
+        checkpoint.close()
+
+    all_comments, skipped_log = collect_comments(seen, fetched)
+    # output_file None: hasil hanya dikembalikan (mis. dipakai pipeline.py di memori)
+    if output_file:
+        save_results(all_comments, skipped_log, output_file, skipped_file)
+    print(f"📈 Kuota terpakai: {sum(client.units_used.values())} unit {client.units_used}")
+    print(f"🔑 Per API key: {key_pool.usage()}")
+    lang = language_filter.metrics()
+    print(f"🌐 Deteksi bahasa: {lang['total']} komentar, ditolak {lang['rejected']} "
+          f"({lang['rejection_rate']:.1%}), sumber {lang['sources']}")
+    print(f"   Bahasa terbanyak: {dict(list(lang['languages'].items())[:10])}")
+    language_filter.close()
+    return all_comments, skipped_log
 
-if skipped_log:
-    pd.DataFrame(skipped_log).to_csv("skipped_videos.csv", index=False, encoding="utf-8-sig")
-    print(f"\n⚠️ {len(skipped_log)} video gagal diambil, disimpan ke skipped_videos.csv")
 
-print(f"\n✅ Total komentar terkumpul: {len(all_comments)}")
-print("💾 Disimpan ke comments_from_scraping.csv")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping komentar YouTube")
+    parser.add_argument('--workers', type=int, default=max_workers,
+                        help="Jumlah request paralel")
+    parser.add_argument('--rate', type=float, default=requests_per_second,
+                        help="Batas request per detik (semua thread)")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default=None,
+                        help="Format output jika --output tidak diisi (default: parquet jika pyarrow ada)")
+    parser.add_argument('--skipped-output', default=None)
+    parser.add_argument('--quota-per-key', type=int, default=daily_quota_per_key,
+                        help="Budget kuota harian (unit) per API key")
+    parser.add_argument('--no-wait', action='store_true',
+                        help="Berhenti (bukan menunggu reset) jika semua API key kehabisan kuota")
+    parser.add_argument('--checkpoint', default=None,
+                        help="File SQLite checkpoint (default: scraping_checkpoint.sqlite)")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="Jangan simpan/lanjutkan checkpoint")
+    parser.add_argument('--fresh', action='store_true',
+                        help="Hapus checkpoint lama dan mulai dari awal")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Ulangi pencarian & ambil hanya komentar yang lebih baru dari checkpoint")
+    parser.add_argument('--lang-workers', type=int, default=None,
+                        help="Jumlah proses langdetect (default: jumlah CPU)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Pakai fake_youtube (tanpa jaringan/API key) untuk uji coba")
+    args = parser.parse_args()
 
-# Tampilkan statistik
-if len(all_comments) > 0:
-    promo_count = sum(1 for comment in all_comments if comment['is_promo'])
-    print(f"📊 Statistik:")
-    print(f"   - Total komentar: {len(all_comments)}")
-    print(f"   - Komentar promosi: {promo_count} ({promo_count/len(all_comments)*100:.1f}%)")
-    print(f"   - Video unik: {len(set(comment['video_id'] for comment in all_comments))}")
+    service_factory = None
+    suffix = ""
+    if args.offline:
+        from fake_youtube import FakeYouTube
+        service_factory = FakeYouTube().service
+        suffix = "_offline"
+
+    checkpoint_path = None
+    if not args.no_checkpoint:
+        checkpoint_path = args.checkpoint or f"scraping_checkpoint{suffix}.sqlite"
+        if args.fresh and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    try:
+        main(
+            service_factory=service_factory,
+            workers=args.workers,
+            rate=args.rate,
+            output_file=args.output or stage_file(f"comments_from_scraping{suffix}", args.format or default_format()),
+            skipped_file=args.skipped_output or f"skipped_videos{suffix}.csv",
+            quota_per_key=args.quota_per_key,
+            wait_for_quota=not args.no_wait,
+            checkpoint_path=checkpoint_path,
+            incremental=args.incremental,
+            lang_workers=args.lang_workers,
+        )
+    except QuotaExhausted as e:
+        print(f"❌ {e}")
+        sys.exit(1)
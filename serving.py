@@ -0,0 +1,499 @@
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import socketserver
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from artifacts import MAX_LEN, THRESHOLD_FILE, ArtifactBundle, file_sha256, load_keras_model, read_threshold
+from score_cache import ScoreCache
+from vocab import CompactTokenizer, load_tokenizer
+
+MODEL_PATH = 'judol_detection_augmented_smote_robust.keras'
+TOKENIZER_PATH = 'tokenizer_augmented_robust.pickle'
+
+# Batas panjang bucket untuk padding per bucket (bentuk input tetap -> Keras tidak retrace tiap batch)
+LENGTH_BUCKETS = (8, 16, 32, 64, MAX_LEN)
+PADDING_ATOL = 1e-5
+PROBE_SIZE = 256
+
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 5.0
+MAX_QUEUE = 10_000
+
+# Batas bucket histogram (inklusif atas), bucket terakhir = +inf
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+LATENCY_MS_BUCKETS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+def clean_text(text):
+    """Cleaning yang sama dengan predict helper di modelling.ipynb / fix ini mah.ipynb"""
+    text = str(text).lower()
+    text = re.sub(r"http\S+|www\S+|https\S+", "", text)
+    # Normalisasi Unicode
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8', 'ignore')
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+# ===== PADDING =====
+def pad_pre(sequences, length):
+    """Setara pad_sequences(sequences, maxlen=length) default Keras: padding & truncating 'pre', nilai 0"""
+    padded = np.zeros((len(sequences), length), dtype='int32')
+    for row, sequence in enumerate(sequences):
+        sequence = sequence[-length:]
+        if len(sequence):
+            padded[row, length - len(sequence):] = sequence
+    return padded
+
+
+def bucket_bounds(max_len=MAX_LEN, buckets=LENGTH_BUCKETS):
+    return sorted({min(bound, max_len) for bound in buckets} | {max_len})
+
+
+def predict_bucketed(predict_fn, sequences, max_len=MAX_LEN, buckets=LENGTH_BUCKETS):
+    """
+    Kelompokkan sequence per bucket panjang token, pad tiap bucket hanya
+    sampai batas bucket-nya, satu forward pass per bucket. Hasil dikembalikan
+    dalam urutan input.
+    """
+    bounds = bucket_bounds(max_len, buckets)
+    lengths = np.array([min(len(sequence), max_len) for sequence in sequences], dtype=int)
+    bucket_of = np.searchsorted(bounds, lengths)
+    probs = np.empty(len(sequences), dtype='float32')
+    for index, bound in enumerate(bounds):
+        rows = np.flatnonzero(bucket_of == index)
+        if len(rows):
+            padded = pad_pre([sequences[row] for row in rows], bound)
+            probs[rows] = np.asarray(predict_fn(padded)).reshape(-1)
+    return probs
+
+
+def masks_padding(model):
+    """True jika model melewati token 0 (Embedding mask_zero=True), jadi panjang padding tidak berpengaruh"""
+    return any(getattr(layer, 'mask_zero', False) for layer in getattr(model, 'layers', []))
+
+
+def probe_sequences(vocab_size, n=PROBE_SIZE, max_len=MAX_LEN, seed=0):
+    """Sequence acak (token 1..vocab_size-1) dengan panjang tersebar 1..max_len untuk cek padding"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, max_len + 1, size=n)
+    return [rng.integers(1, max(vocab_size, 2), size=length).tolist() for length in lengths]
+
+
+def check_padding_equivalence(predict_fn, sequences, max_len=MAX_LEN, buckets=LENGTH_BUCKETS, atol=PADDING_ATOL):
+    """
+    Bandingkan probabilitas padding penuh (max_len) dengan padding per bucket.
+    Model tanpa masking (Embedding tanpa mask_zero) tetap memproses token 0
+    di depan sequence, jadi hasilnya biasanya berbeda. Return (ok, selisih max).
+    """
+    if not len(sequences):
+        return True, 0.0
+    full = np.asarray(predict_fn(pad_pre(sequences, max_len))).reshape(-1)
+    bucketed = predict_bucketed(predict_fn, sequences, max_len, buckets)
+    diff = float(np.max(np.abs(full - bucketed)))
+    return diff <= atol, diff
+
+
+class Histogram:
+    """Histogram bucket tetap (thread-safe) untuk ukuran batch dan latency antrian"""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Perkiraan quantile: batas atas bucket tempat quantile jatuh"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + [self.max], self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+            return {
+                'count': self.count,
+                'mean': round(self.total / self.count, 3) if self.count else 0.0,
+                'p50': self.quantile(0.5),
+                'p99': self.quantile(0.99),
+                'max': round(self.max, 3),
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+# ===== SCORER =====
+class KerasScorer:
+    """
+    Model LSTM Keras + tokenizer (pickle Keras atau direktori .vocab),
+    CPU-only. Satu forward pass per batch (predict_on_batch, tanpa overhead
+    model.predict per komentar).
+
+    bucketing='auto' memakai padding per bucket panjang hanya jika
+    check_padding_equivalence lolos untuk model ini; 'on'/'off' memaksa.
+
+    Dengan `cache` (ScoreCache dengan versi `self.version`), probabilitas
+    disimpan per teks bersih dan teks yang berulang tidak di-predict lagi.
+    """
+
+    def __init__(self, model, tokenizer, threshold=None, max_len=MAX_LEN, bucketing='auto', version=None,
+                 cache=None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.threshold = read_threshold() if threshold is None else threshold
+        self.max_len = max_len
+        self.padding_check = self.check_padding() if bucketing == 'auto' else None
+        self.bucketing = bucketing == 'on' or bool(self.padding_check and self.padding_check[0])
+        # Versi artefak (model + tokenizer + max_len) untuk key cache; padding per bucket bisa menggeser prob
+        self.version = f"{version}:{'bucketed' if self.bucketing else 'padded'}" if version else None
+        self.cache = cache
+
+    @classmethod
+    def from_files(cls, model_path=MODEL_PATH, tokenizer_path=TOKENIZER_PATH, threshold=None, max_len=MAX_LEN,
+                   bucketing='auto'):
+        for path in (model_path, tokenizer_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+        version = hashlib.sha256(
+            f"{file_sha256(model_path)}:{file_sha256(tokenizer_path)}:{max_len}".encode('utf-8')
+        ).hexdigest()[:16]
+        return cls(load_keras_model(model_path), load_tokenizer(tokenizer_path), threshold, max_len, bucketing,
+                   version)
+
+    @classmethod
+    def from_bundle(cls, bundle, bucketing='auto'):
+        """Model, tokenizer, threshold dan MAX_LEN dari satu ArtifactBundle"""
+        return cls(bundle.model, bundle.tokenizer, bundle.threshold, bundle.max_len, bucketing, bundle.version)
+
+    def check_padding(self):
+        if masks_padding(self.model):
+            return True, 0.0
+        if isinstance(self.tokenizer, CompactTokenizer):
+            vocab_size = int(self.tokenizer.ids.max()) + 1
+        else:
+            vocab_size = len(self.tokenizer.word_index) + 1
+        if self.tokenizer.num_words:
+            vocab_size = min(vocab_size, self.tokenizer.num_words)
+        probes = probe_sequences(vocab_size, max_len=self.max_len)
+        return check_padding_equivalence(self.model.predict_on_batch, probes, self.max_len)
+
+    def predict_probs(self, cleaned):
+        """Probabilitas judol untuk list teks yang sudah dibersihkan (tanpa cache)"""
+        sequences = self.tokenizer.texts_to_sequences(cleaned)
+        if self.bucketing:
+            return predict_bucketed(self.model.predict_on_batch, sequences, self.max_len)
+        return np.asarray(self.model.predict_on_batch(pad_pre(sequences, self.max_len))).reshape(-1)
+
+    def __call__(self, texts):
+        cleaned = [clean_text(text) for text in texts]
+        if self.cache is None:
+            probs = self.predict_probs(cleaned)
+        else:
+            values = self.cache.lookup_or_compute(
+                cleaned, lambda batch: [{'prob': float(prob)} for prob in self.predict_probs(batch)]
+            )
+            probs = [value['prob'] for value in values]
+        return [
+            {'clean': clean, 'prob': float(prob), 'label': int(prob > self.threshold)}
+            for clean, prob in zip(cleaned, probs)
+        ]
+
+
+class RuleScorer:
+    """Fallback tanpa TensorFlow: rule set labeling (prob = 0/1) dengan interface yang sama"""
+
+    def __init__(self, rules=None):
+        from rules import RuleSet
+        self.rules = rules or RuleSet()
+
+    def __call__(self, texts):
+        cleaned = [clean_text(text) for text in texts]
+        labels, fired = self.rules.evaluate(cleaned)
+        return [
+            {'clean': clean, 'prob': float(label), 'label': int(label), 'rules': list(ids)}
+            for clean, label, ids in zip(cleaned, labels, fired)
+        ]
+
+
+# ===== MICRO-BATCHING =====
+class MicroBatcher:
+    """
+    Kumpulkan komentar tunggal menjadi micro-batch: batch dijalankan saat
+    sudah `max_batch_size` komentar, atau `max_wait_ms` setelah komentar
+    pertama di batch masuk antrian. Satu thread worker memanggil scorer
+    sekali per batch; tiap request menunggu Future miliknya sendiri.
+    """
+
+    def __init__(self, scorer, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, max_queue=MAX_QUEUE):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_latency_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.inference_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.errors = 0
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Masukkan satu komentar ke antrian; return Future berisi dict hasil"""
+        future = Future()
+        try:
+            self.queue.put_nowait((text, time.perf_counter(), future))
+        except queue.Full:
+            future.set_exception(RuntimeError("Antrian inference penuh"))
+        return future
+
+    def predict(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    def predict_many(self, texts, timeout=None):
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    def _collect(self):
+        first = self.queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first[1] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Sinyal stop: selesaikan batch ini dulu
+                self.queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for _, enqueued, _ in batch:
+                self.queue_latency_ms.observe((started - enqueued) * 1000)
+            try:
+                results = self.scorer([text for text, _, _ in batch])
+            except Exception as e:
+                self.errors += 1
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.inference_ms.observe((time.perf_counter() - started) * 1000)
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def close(self):
+        self.queue.put(None)
+        self._worker.join()
+
+    def metrics(self):
+        return {
+            'queued': self.queue.qsize(),
+            'errors': self.errors,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_latency_ms': self.queue_latency_ms.snapshot(),
+            'inference_ms': self.inference_ms.snapshot(),
+        }
+
+
+# ===== HTTP =====
+class ScoringHandler(BaseHTTPRequestHandler):
+    """
+    POST /predict  {"text": "..."} atau {"texts": ["...", ...]}
+    GET  /metrics  histogram ukuran batch dan latency antrian
+    GET  /health
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/metrics':
+            self._send_json(200, self.server.batcher.metrics())
+        else:
+            self._send_json(404, {'error': f"Path tidak dikenal: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Path tidak dikenal: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {'error': f"JSON tidak valid: {e}"})
+            return
+
+        # Body JSON yang bukan object ([], "x", 1, null) juga 400, bukan error di dalam batcher
+        payload = payload if isinstance(payload, dict) else {}
+        batcher = self.server.batcher
+        try:
+            if isinstance(payload.get('texts'), list):
+                self._send_json(200, {'results': batcher.predict_many(payload['texts'], self.server.timeout_s)})
+            elif isinstance(payload.get('text'), str):
+                self._send_json(200, batcher.predict(payload['text'], self.server.timeout_s))
+            else:
+                self._send_json(400, {'error': "Body harus berisi 'text' (string) atau 'texts' (list)"})
+        except Exception as e:
+            self._send_json(503, {'error': str(e)})
+
+    def address_string(self):
+        # Unix socket tidak punya (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+# Backlog default socketserver (5) terlalu kecil untuk banyak client yang connect bersamaan
+REQUEST_QUEUE_SIZE = 1024
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def make_server(batcher, host='127.0.0.1', port=8000, unix_socket=None, timeout_s=30.0, verbose=False):
+    if unix_socket:
+        server = UnixHTTPServer(unix_socket, ScoringHandler)
+    else:
+        server = ScoringHTTPServer((host, port), ScoringHandler)
+    server.batcher = batcher
+    server.timeout_s = timeout_s
+    server.verbose = verbose
+    return server
+
+
+def load_scorer(backend='keras', model_path=MODEL_PATH, tokenizer_path=TOKENIZER_PATH, threshold=None,
+                max_len=MAX_LEN, bucketing='auto', bundle=None, cache_path=None):
+    if backend == 'rules':
+        return RuleScorer()
+    if bundle:
+        bundle = ArtifactBundle.load(bundle)
+        if bundle.cleaning_stale:
+            print("⚠️  Cleaning di kode berbeda dengan saat bundle dibuat; hasil bisa bergeser")
+        scorer = KerasScorer.from_bundle(bundle, bucketing)
+    else:
+        scorer = KerasScorer.from_files(model_path, tokenizer_path, threshold, max_len, bucketing)
+    if cache_path:
+        scorer.cache = ScoreCache(scorer.version, path=cache_path)
+    return scorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service scoring judol dengan micro-batching (CPU-only)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix-socket', default=None, help="Serve di Unix socket ini, bukan TCP")
+    parser.add_argument('--backend', choices=['keras', 'rules'], default='keras',
+                        help="keras = model LSTM, rules = rule set labeling (tanpa TensorFlow)")
+    parser.add_argument('--bundle', default=None,
+                        help="Direktori bundle artefak (artifacts.py); menggantikan --model/--tokenizer/--threshold")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--tokenizer', default=TOKENIZER_PATH)
+    parser.add_argument('--threshold', type=float, default=None, help=f"Default: isi {THRESHOLD_FILE}")
+    parser.add_argument('--max-len', type=int, default=MAX_LEN)
+    parser.add_argument('--bucketing', choices=['auto', 'on', 'off'], default='auto',
+                        help="Padding per bucket panjang token (auto = hanya jika cek equivalence lolos)")
+    parser.add_argument('--check-padding', action='store_true',
+                        help="Cek equivalence padding per bucket untuk model lalu keluar")
+    parser.add_argument('--max-batch-size', type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    parser.add_argument('--timeout', type=float, default=30.0, help="Batas tunggu hasil per request (detik)")
+    parser.add_argument('--score-cache', default=None,
+                        help="ScoreCache SQLite untuk probabilitas LSTM per teks bersih (backend keras)")
+    parser.add_argument('--verbose', action='store_true', help="Log setiap request")
+    args = parser.parse_args()
+
+    scorer = load_scorer(args.backend, args.model, args.tokenizer, args.threshold, args.max_len, args.bucketing,
+                         args.bundle, args.score_cache)
+    if args.check_padding:
+        if args.backend != 'keras':
+            parser.error("--check-padding butuh --backend keras")
+        ok, diff = scorer.padding_check or scorer.check_padding()
+        print(f"{'✅' if ok else '❌'} Padding per bucket {'setara' if ok else 'TIDAK setara'} "
+              f"dengan padding {args.max_len} (selisih probabilitas max {diff:.2e}, toleransi {PADDING_ATOL:g})")
+        return
+    if args.backend == 'keras':
+        status = 'aktif' if scorer.bucketing else 'nonaktif'
+        if scorer.padding_check:
+            status += f" (selisih max {scorer.padding_check[1]:.2e})"
+        print(f"📏 Padding per bucket {LENGTH_BUCKETS}: {status}")
+    batcher = MicroBatcher(scorer, args.max_batch_size, args.max_wait_ms)
+    server = make_server(batcher, args.host, args.port, args.unix_socket, args.timeout, args.verbose)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"🚀 Scoring service ({args.backend}) di {where} "
+          f"(batch <= {args.max_batch_size}, tunggu <= {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        print(json.dumps(batcher.metrics(), indent=2))
+        if getattr(scorer, 'cache', None) is not None:
+            print(f"Score cache: {scorer.cache.stats()}")
+            scorer.cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import json
+import os
+from collections import OrderedDict
+
+from Sastrawi.Dictionary.ArrayDictionary import ArrayDictionary
+from Sastrawi.Stemmer.CachedStemmer import CachedStemmer
+from Sastrawi.Stemmer.Stemmer import Stemmer
+from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+
+class SetDictionary(ArrayDictionary):
+    """
+    Kamus kata dasar Sastrawi dengan lookup O(1).
+
+    ArrayDictionary bawaan menyimpan ~30rb kata dasar di list, sehingga setiap
+    `contains` (dipanggil puluhan kali per kata) adalah scan linear.
+    """
+
+    def __init__(self, words=None):
+        self.words = set()
+        if words:
+            self.add_words(words)
+
+    def add(self, word):
+        if not word or word.strip() == '':
+            return
+        self.words.add(word)
+
+
+class StemCache:
+    """
+    Cache kata -> kata dasar untuk CachedStemmer Sastrawi (interface has/get/set).
+
+    - bounded: LRU dengan batas `maxsize` kata
+    - persisten (opsional): load/save ke file JSON agar cache hangat antar run
+    - `pop_new_entries` mengambil entry baru sejak pemanggilan terakhir, untuk
+      menggabungkan cache dari proses worker ke proses utama
+    """
+
+    def __init__(self, maxsize=200_000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._new_entries = {}
+
+        if path:
+            self.load(path)
+
+    def has(self, key):
+        if key in self._data:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._remember(key, value)
+        self._new_entries[key] = value
+
+    def _remember(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def update(self, entries):
+        """Gabungkan entry dari luar (file atau worker lain) tanpa menandainya baru"""
+        for key, value in entries.items():
+            self._remember(key, value)
+
+    def pop_new_entries(self):
+        new_entries, self._new_entries = self._new_entries, {}
+        return new_entries
+
+    def load(self, path=None):
+        path = path or self.path
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.update(json.load(f))
+        return self
+
+    def save(self, path=None):
+        """Tulis cache ke JSON secara atomik (tulis file sementara lalu rename)"""
+        path = path or self.path
+        if not path:
+            return
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self._data), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._data),
+        }
+
+
+# Satu stemmer per proses, dipakai bersama oleh semua cleaner/preprocessor
+_shared_stemmer = None
+
+
+def create_stemmer(cache=None):
+    """Stemmer Sastrawi dengan kamus berbasis set dan word-level StemCache"""
+    words = StemmerFactory().get_words()
+    return CachedStemmer(cache or StemCache(), Stemmer(SetDictionary(words)))
+
+
+def get_stemmer(cache_path=None):
+    """
+    Stemmer bersama untuk proses ini. `cache_path` (opsional) memuat cache
+    kata dasar dari disk; panggil `save_stem_cache()` untuk menyimpannya lagi.
+    """
+    global _shared_stemmer
+    if _shared_stemmer is None:
+        _shared_stemmer = create_stemmer()
+    if cache_path:
+        cache = _shared_stemmer.get_cache()
+        cache.path = cache_path
+        cache.load(cache_path)
+    return _shared_stemmer
+
+
+def get_stem_cache():
+    return get_stemmer().get_cache()
+
+
+def save_stem_cache(path=None):
+    get_stem_cache().save(path)
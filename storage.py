@@ -0,0 +1,195 @@
+import os
+
+import pandas as pd
+
+import ingest
+
+# Tipe kolom korpus komentar saat disimpan ke format kolumnar (Parquet/Arrow).
+# CSV tetap ditulis apa adanya agar output lama tidak berubah.
+COLUMN_TYPES = {
+    'published_at': 'timestamp',
+    'like_count': 'int64',
+    'is_promo': 'bool',
+    'target': 'int8',
+}
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.csv': 'csv',
+}
+EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+
+
+def has_arrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _require_arrow(path):
+    if not has_arrow():
+        raise ImportError(
+            f"pyarrow dibutuhkan untuk membaca/menulis {path}; install dengan `pip install pyarrow` "
+            f"atau pakai format csv"
+        )
+
+
+def table_format(path):
+    """Format file ditentukan dari ekstensinya"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Format file tidak dikenal: {path} (pilih {', '.join(FORMATS)})")
+    return FORMATS[ext]
+
+
+def default_format():
+    return 'parquet' if has_arrow() else 'csv'
+
+
+def stage_file(stem, fmt=None):
+    """
+    Nama file untuk satu stage pipeline (mis. 'cleaned_comments').
+
+    fmt None: pakai file yang sudah ada (parquet lebih dulu, lalu csv); kalau
+    belum ada sama sekali, pakai format default.
+    """
+    if fmt:
+        return stem + EXTENSIONS[fmt]
+    for candidate in ('parquet', 'csv'):
+        path = stem + EXTENSIONS[candidate]
+        if os.path.exists(path):
+            return path
+    return stem + EXTENSIONS[default_format()]
+
+
+def coerce_types(df):
+    """Cast kolom yang dikenal ke tipe di COLUMN_TYPES (nullable jika ada nilai kosong)"""
+    df = df.copy()
+    for column, kind in COLUMN_TYPES.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if kind == 'timestamp':
+            df[column] = pd.to_datetime(values, utc=True, format='mixed', errors='coerce')
+        elif kind == 'bool':
+            if not pd.api.types.is_bool_dtype(values):
+                values = values.map({'True': True, 'False': False, True: True, False: False})
+            df[column] = values.astype('boolean') if values.isna().any() else values.astype(bool)
+        else:
+            values = pd.to_numeric(values, errors='coerce')
+            # Pecahan (baris CSV rusak, mis. like_count 3.000004) diperlakukan seperti nilai tak terbaca
+            values = values.where(values % 1 == 0)
+            df[column] = values.astype(kind.capitalize()) if values.isna().any() else values.astype(kind)
+    return df
+
+
+def read_table(path, columns=None, **csv_kwargs):
+    """
+    Baca satu tabel stage. Parquet/Feather hanya memuat `columns` yang diminta;
+    file .csv dibaca lewat ingest.read_csv (deteksi encoding, baris rusak dikarantina),
+    `csv_kwargs` (encoding, quarantine, dtype, ...) hanya dipakai untuk file .csv.
+    """
+    fmt = table_format(path)
+    if fmt == 'csv':
+        return ingest.read_csv(path, usecols=columns, **csv_kwargs)[0]
+    _require_arrow(path)
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
+
+
+def write_table(df, path, csv_encoding='utf-8'):
+    fmt = table_format(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=False, encoding=csv_encoding)
+        return
+    _require_arrow(path)
+    df = coerce_types(df).reset_index(drop=True)
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False, compression='zstd')
+    else:
+        df.to_feather(path, compression='zstd')
+
+
+def iter_chunks(path, chunksize, columns=None, **csv_kwargs):
+    """Baca tabel per chunk berisi `chunksize` baris (memori terbatas)"""
+    fmt = table_format(path)
+    if fmt == 'csv':
+        yield from ingest.iter_csv(path, chunksize, usecols=columns, **csv_kwargs)
+        return
+    _require_arrow(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=columns)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+
+
+def arrow_schema(df):
+    """
+    Skema Arrow dari tipe kolom DataFrame (setelah coerce_types). Kolom yang
+    di chunk ini kosong semua tidak punya tipe (null) dan dianggap string,
+    supaya chunk berikutnya yang berisi teks tetap cocok dengan skemanya.
+    """
+    import pyarrow as pa
+    schema = pa.Schema.from_pandas(coerce_types(df), preserve_index=False)
+    for index, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(index, field.with_type(pa.string()))
+    return schema
+
+
+class ChunkWriter:
+    """
+    Tulis tabel chunk demi chunk (append). Untuk Parquet/Arrow, skema diambil
+    dari `schema` atau dari tipe kolom chunk pertama (arrow_schema), dan
+    chunk berikutnya di-cast ke skema yang sama.
+    """
+
+    def __init__(self, path, csv_encoding='utf-8', schema=None):
+        self.path = path
+        self.format = table_format(path)
+        self.csv_encoding = csv_encoding
+        self.rows = 0
+        self._writer = None
+        self._schema = schema
+        if self.format != 'csv':
+            _require_arrow(path)
+
+    def write(self, df):
+        if self.format == 'csv':
+            df.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False,
+                      encoding=self.csv_encoding)
+        else:
+            import pyarrow as pa
+            if self._schema is None:
+                self._schema = arrow_schema(df)
+            table = pa.Table.from_pandas(coerce_types(df), schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                if self.format == 'parquet':
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression='zstd')
+                    self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
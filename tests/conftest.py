@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul repo ada di root (tanpa package); supaya `pytest` dari mana pun bisa meng-import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from artifacts import MANIFEST_FILE, ArtifactBundle, ArtifactError, build_bundle, load_keras_model
+
+WORD_INDEX = {'<OOV>': 1, 'depo': 2, 'wd': 3, 'gacor': 4}
+
+
+@pytest.fixture
+def bundle_dir(tmp_path):
+    config = {'word_index': json.dumps(WORD_INDEX), 'num_words': None, 'oov_token': '<OOV>',
+              'filters': '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n', 'lower': True, 'split': ' ', 'char_level': False}
+    tokenizer_path = str(tmp_path / 'tokenizer.json')
+    with open(tokenizer_path, 'w', encoding='utf-8') as f:
+        json.dump({'class_name': 'Tokenizer', 'config': config}, f)
+    path = str(tmp_path / 'bundle')
+    build_bundle(path, tokenizer_path, threshold=0.7)
+    return path
+
+
+def test_bundle_round_trip(bundle_dir):
+    bundle = ArtifactBundle.load(bundle_dir)
+    assert bundle.check() == []
+    assert bundle.threshold == 0.7 and not bundle.has_model
+    assert bundle.tokenizer.texts_to_sequences(['Depo WD gacor, slot']) == [[2, 3, 4, 1]]
+    with pytest.raises(ArtifactError):
+        bundle.model
+
+
+def test_edited_tokenizer_file_is_rejected(bundle_dir):
+    ids_path = os.path.join(bundle_dir, 'tokenizer.vocab', 'ids.npy')
+    with open(ids_path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 1]))
+
+    bundle = ArtifactBundle.load(bundle_dir)
+    problems = bundle.check()
+    assert len(problems) == 1 and 'tidak cocok' in problems[0]
+    with pytest.raises(ArtifactError, match='tidak cocok'):
+        bundle.tokenizer
+    # verify=False melewati cek hash (mis. untuk debugging)
+    assert ArtifactBundle.load(bundle_dir, verify=False).tokenizer is not None
+
+
+def test_missing_tokenizer_is_rejected(bundle_dir):
+    shutil.rmtree(os.path.join(bundle_dir, 'tokenizer.vocab'))
+    bundle = ArtifactBundle.load(bundle_dir)
+    assert any('tidak ditemukan' in problem for problem in bundle.check())
+    with pytest.raises(ArtifactError, match='tidak ditemukan'):
+        bundle.tokenizer
+
+
+def test_stale_cleaning_is_reported(bundle_dir):
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['cleaning_version'] = '0' * 16
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    bundle = ArtifactBundle.load(bundle_dir)
+    assert bundle.cleaning_stale
+    assert bundle.check() == ["Versi cleaning berbeda dengan kode sekarang (serving.clean_text berubah)"]
+
+
+def test_unsupported_manifest_format(bundle_dir):
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['format_version'] = 99
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    with pytest.raises(ArtifactError):
+        ArtifactBundle.load(bundle_dir)
+    with pytest.raises(ArtifactError):
+        ArtifactBundle.load(os.path.dirname(bundle_dir))
+
+
+def test_only_keras_models_are_loaded(tmp_path):
+    # .h5 tidak dilindungi safe_mode; ditolak sebelum TensorFlow di-import
+    tensorflow_loaded = 'tensorflow' in sys.modules
+    for name in ('model.h5', 'model.pkl', 'saved_model'):
+        with pytest.raises(ValueError, match='tidak didukung'):
+            load_keras_model(str(tmp_path / name))
+    with pytest.raises(ArtifactError, match='tidak didukung'):
+        build_bundle(str(tmp_path / 'bundle'), str(tmp_path / 'tokenizer.json'), model_path=str(tmp_path / 'model.pkl'))
+    assert ('tensorflow' in sys.modules) == tensorflow_loaded
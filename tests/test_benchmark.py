@@ -0,0 +1,20 @@
+from benchmark import compare_to_baseline, time_repeats
+
+
+def test_time_repeats_until_min_seconds():
+    calls = []
+    samples = time_repeats(lambda: calls.append(1), repeats=3, min_seconds=0.0)
+    assert len(samples) == len(calls) == 3
+
+    samples = time_repeats(lambda: None, repeats=1, min_seconds=1.0, max_repeats=7)
+    assert len(samples) == 7
+
+
+def test_gate_uses_reported_rows_per_sec():
+    baseline = {'runs': [{'stage': 'label', 'rows': 100, 'status': 'ok', 'rows_per_sec': 1000.0,
+                          'peak_rss_mb': 100.0}]}
+    ok = {'runs': [dict(baseline['runs'][0], rows_per_sec=850.0)]}
+    slow = {'runs': [dict(baseline['runs'][0], rows_per_sec=700.0)]}
+    assert compare_to_baseline(ok, baseline, tolerance=0.2) == []
+    assert [regression['metric'] for regression in compare_to_baseline(slow, baseline, tolerance=0.2)] == \
+        ['rows_per_sec']
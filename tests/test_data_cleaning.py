@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pipeline import ROOT, load_script
+
+cleaning = load_script(os.path.join(ROOT, 'code', 'Data Cleaning.py'), 'data_cleaning')
+
+# Kasus pinggir untuk guard fast path: teks ASCII polos, non-ASCII, emoji, URL
+SAMPLE = [
+    'mantap bang videonya',
+    'Halo semua!!! kunjungi PULAUWIN sekarang',
+    'café résumé naïve Ångström',
+    'ＤＥＰＯ ５０ＲＢ ＷＤ ５００ＲＢ',
+    '𝗴𝗮𝗰𝗼𝗿 𝗯𝗮𝗻𝗴𝗲𝘁 𝗵𝗮𝗿𝗶 𝗶𝗻𝗶',
+    'ｍａｘｗｉｎ di 𝓅𝓊𝓁𝒶𝓊𝓌𝒾𝓃',
+    'gа\u0301сor pakai huruf Кирилица',
+    'zero\u200bwidth\u200djoiner\ufefftext',
+    'e\u0301 combining a\u0308 marks',
+    'مرحبا depo ٥٠٠ ribu',
+    'Ã©mojibake Ã¢â‚¬â„¢ rusak',
+    'ketawa 😂😂😂 sampai nangis 😭',
+    'keluarga 👨‍👩‍👧‍👦 dan jempol 👍🏽 bendera 🇮🇩',
+    '🔥🔥🔥',
+    'cek https://bit.ly/3xYz gacor',
+    'daftar di www.pulauwin.com atau http://sgi88.net/daftar?ref=abc',
+    'link: pulauwin.com/wd, t.me/admin_slot',
+    '@admin123 #gacor #maxwin depo 50k',
+    'wkwkwkwk bangeeeeet   spasi   banyak',
+    'angka 100.000 dan 50rb dan 1jt',
+    '&amp; &lt;b&gt;html&lt;/b&gt; entity',
+    'baris\nbaru\tdan tab',
+    '   ',
+    'x',
+]
+
+
+@pytest.mark.parametrize('aggressive', [True, False])
+def test_fast_path_matches_full_pipeline(tmp_path, aggressive):
+    path = str(tmp_path / 'comments.csv')
+    # Kolom id supaya baris yang isinya spasi saja tidak dianggap baris kosong oleh parser CSV
+    pd.DataFrame({'comment_id': range(len(SAMPLE)), 'comment_text': SAMPLE}).to_csv(path, index=False)
+    assert cleaning.verify_fast_path(path, aggressive=aggressive) == []
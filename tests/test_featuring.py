@@ -0,0 +1,80 @@
+import io
+import re
+
+import pandas as pd
+
+from featuring import FinalProductionJudolDetector, action_counts, score_streaming
+from storage import coerce_types, read_table
+
+FEATURES = ['has_judi_site', 'financial_term_count', 'has_high_confidence_phrase', 'has_currency', 'has_large_number']
+# Term yang overlap (pstoto/pstoto99, sgi/sgi88, garuda hoki/hoki, judi/judol), teks kosong/NaN, duplikat,
+# dan angka di dalam teks non-ASCII (\b engine regex Arrow berbeda dengan re Python)
+SAMPLE = pd.DataFrame({
+    'comment_text': ['Main di PSTOTO99 minimal depo 50rb', 'garuda hoki jepe maxwin', None, 'videonya bagus',
+                     'sgi88 auto wd 2 juta', 'judol judi rugi terus', float('nan'), 'Main di PSTOTO99 minimal depo 50rb',
+                     'skor 1000 lawan 05', 'modal receh hasil besar 100k', 'aå777 bonus', '2023æú'],
+    'cleaned_comment_text': ['main pstoto minimal depo rb', None, 'wd cepat', 'videonya bagus', 'sgi auto wd juta',
+                             'judol judi rugi', float('nan'), 'main pstoto minimal depo rb', 'skor lawan',
+                             'modal receh hasil besar k', 'aå777 bonus', None],
+})
+
+COMMENTS = pd.DataFrame({
+    'video_id': ['v1', 'v2', 'v3', 'v4', 'v5', 'v6', 'v7'],
+    'comment_text': ['DEPO 10K WD lancar di situs gacor', 'videonya bagus', '12345', 'slot maxwin hari ini',
+                     None, 'modal receh jp besar pasti wd', 'mantap bang'],
+    'like_count': [1, 2, None, 4, 5, 6, 7],
+    'cleaned_comment_text': ['depo k wd lancar situs gacor', 'videonya bagus', '12345', 'slot maxwin hari',
+                             None, 'modal receh jp besar pasti wd', 'mantap bang'],
+    'target': [1, 0, 0, 1, 0, 1, 0],
+})
+
+
+def test_streaming_matches_whole_file(tmp_path):
+    input_file = str(tmp_path / 'labeled.csv')
+    output_file = str(tmp_path / 'scored.csv')
+    COMMENTS.to_csv(input_file, index=False)
+    detector = FinalProductionJudolDetector()
+
+    # Chunk kedua hanya berisi angka dan like_count kosong: tipe kolom tetap sama dengan chunk pertama
+    counts = score_streaming(detector, input_file, output_file, chunksize=2)
+    whole = detector.score_dataframe(coerce_types(read_table(input_file, verbose=False)))
+
+    assert counts == action_counts(whole)
+    assert sum(counts.values()) == len(COMMENTS)
+    streamed = pd.read_csv(output_file)
+    expected = pd.read_csv(io.StringIO(whole.to_csv(index=False)))
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def reference_features(detector, df):
+    """Logika per baris sebelum TermMatcher / fitur kolumnar"""
+    texts = (df['cleaned_comment_text'].fillna('').astype(str) + ' '
+             + df['comment_text'].fillna('').astype(str)).str.lower()
+    return pd.DataFrame({
+        'has_judi_site': texts.apply(lambda x: any(site in x for site in detector.judi_sites)).astype(int),
+        'financial_term_count': texts.apply(lambda x: sum(1 for term in detector.financial_terms if term in x)),
+        'has_high_confidence_phrase': texts.apply(
+            lambda x: any(re.search(phrase, x) for phrase in detector.high_confidence_phrases)
+        ).astype(int),
+        'has_currency': texts.str.contains(r'\d+\s*(?:jt|rb|k|juta|ribu)', na=False).astype(int),
+        'has_large_number': texts.str.contains(r'\b[1-9]\d{2,}\b', na=False).astype(int),
+    })
+
+
+def test_features_match_per_row_reference():
+    detector = FinalProductionJudolDetector()
+    features = detector.extract_final_features(SAMPLE)
+    expected = reference_features(detector, SAMPLE)
+    pd.testing.assert_frame_equal(features[FEATURES], expected, check_dtype=False)
+
+
+def test_score_does_not_depend_on_batch():
+    detector = FinalProductionJudolDetector()
+    whole = detector.score_dataframe(SAMPLE)
+    chunks = pd.concat([detector.score_dataframe(SAMPLE.iloc[start:start + 3]) for start in range(0, len(SAMPLE), 3)])
+    single = pd.concat([detector.score_dataframe(SAMPLE.iloc[[row]]) for row in range(len(SAMPLE))])
+
+    pd.testing.assert_series_equal(chunks['judol_score'], whole['judol_score'])
+    pd.testing.assert_series_equal(single['judol_score'], whole['judol_score'])
+    assert chunks['action'].tolist() == whole['action'].tolist()
+    assert whole['judol_score'].between(0, 10).all()
@@ -0,0 +1,87 @@
+import os
+
+import pandas as pd
+import pytest
+
+import ingest
+from storage import read_table
+
+ROWS = [
+    'video_id,comment_text,like_count',
+    'a1,halo semua,1',
+    'a2,"komentar\nmulti baris",2',
+    'a3,"kutip tidak tertutup,3',
+    'a4,padding di ujung,4,,,,',
+    'a5,komentar yang kutipnya hilang',
+    'lanjutan baris kedua,5',
+    'a6,terakhir éè,6',
+]
+
+
+def write_csv(path, encoding='utf-8', newline='\n'):
+    with open(path, 'wb') as f:
+        f.write(newline.join(ROWS).encode(encoding) + newline.encode())
+
+
+def test_streaming_matches_small_blocks(tmp_path, monkeypatch):
+    path = str(tmp_path / 'comments.csv')
+    write_csv(path, encoding='cp1252', newline='\r\n')
+    df, report = ingest.read_csv(path, verbose=False)
+
+    # Blok/jendela sekecil mungkin: batas blok jatuh di tengah '\r\n' dan di tengah record
+    monkeypatch.setattr(ingest, '_BLOCK_BYTES', 3)
+    small, small_report = ingest.read_csv(path, verbose=False)
+    pd.testing.assert_frame_equal(df, small)
+    assert report.summary() == small_report.summary()
+
+    assert report.encoding == 'cp1252'
+    assert df['video_id'].tolist() == ['a1', 'a2', 'a4', 'a5', 'a6']
+    assert df['comment_text'].tolist()[1] == 'komentar\nmulti baris'
+    assert df['comment_text'].tolist()[3] == 'komentar yang kutipnya hilang\nlanjutan baris kedua'
+    # Nomor baris file (header = baris 1, record a2 memakai baris 3-4)
+    assert [line for line, _, _ in report.quarantined] == [5]
+
+
+def test_chunks_and_no_quarantine_file_by_default(tmp_path):
+    path = str(tmp_path / 'comments.csv')
+    write_csv(path)
+    chunks = list(ingest.iter_csv(path, 2, verbose=False))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert os.listdir(tmp_path) == ['comments.csv']
+
+    quarantine_path = str(tmp_path / 'out' / 'rejected.csv')
+    os.makedirs(os.path.dirname(quarantine_path))
+    _, report = ingest.read_csv(path, quarantine_path=quarantine_path, verbose=False)
+    assert report.quarantine_path == quarantine_path
+    assert pd.read_csv(quarantine_path)['line'].tolist() == [5]
+
+
+def test_read_table_quarantine_opt_in(tmp_path):
+    path = str(tmp_path / 'comments.csv')
+    write_csv(path)
+    df = read_table(path, columns=['video_id'], quarantine=True)
+    assert df['video_id'].tolist() == ['a1', 'a2', 'a4', 'a5', 'a6']
+    assert pd.read_csv(str(tmp_path / 'comments.quarantine.csv'))['line'].tolist() == [5]
+
+
+@pytest.mark.parametrize('data', [b'', b'\n'])
+def test_empty_file_raises_empty_data_error(tmp_path, data):
+    path = str(tmp_path / 'empty.csv')
+    with open(path, 'wb') as f:
+        f.write(data)
+    with pytest.raises(pd.errors.EmptyDataError):
+        ingest.read_csv(path, verbose=False)
+    with pytest.raises(pd.errors.EmptyDataError):
+        read_table(path)
+
+
+def test_cr_only_line_endings(tmp_path):
+    path = str(tmp_path / 'mac.csv')
+    # Semua akhir baris '\r', termasuk yang di dalam komentar multi-baris
+    with open(path, 'wb') as f:
+        f.write('\r'.join(ROWS).replace('\n', '\r').encode('utf-8') + b'\r')
+    df, report = ingest.read_csv(path, verbose=False)
+    assert df['video_id'].tolist() == ['a1', 'a2', 'a4', 'a5', 'a6']
+    assert df['like_count'].tolist() == [1, 2, 4, 5, 6]
+    assert df['comment_text'].tolist()[1] == 'komentar\nmulti baris'
+    assert [line for line, _, _ in report.quarantined] == [5]
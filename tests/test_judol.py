@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+
+import judol
+from featuring import FinalProductionJudolDetector
+from rules import RuleSet
+from serving import clean_text
+
+# URL dibuang dan huruf fullwidth dinormalisasi oleh clean_text: skor/explain dari teks mentah akan berbeda
+TEXTS = [
+    'depo 50rb wd 500rb di pulauwin gacor', 'Mantap bang videonya', 'link https://pulauwin.com maxwin',
+    '\uff44\uff45\uff50\uff4f \uff15\uff10\uff52\uff42 \uff57\uff44',
+]
+
+
+def test_import_does_not_load_heavy_modules():
+    code = (
+        "import json, sys\n"
+        "import judol\n"
+        "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=judol.ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    loaded = set(json.loads(output.strip().splitlines()[-1]))
+    assert not loaded & {'pandas', 'numpy', 'Sastrawi', 'tensorflow', 'keras'}
+
+
+def test_score_and_explain_use_the_same_input():
+    results = judol.predict(TEXTS, explain=True)
+    cleaned = [clean_text(text) for text in TEXTS]
+    expected = FinalProductionJudolDetector().score_texts(cleaned)
+    _, fired = RuleSet().evaluate(cleaned)
+    for result, record, ids in zip(results, expected, fired):
+        assert result['judol_score'] == record['judol_score']
+        assert result['rules'] == list(ids)
+    assert 'combo:depo+wd' in results[3]['rules']
+
+
+def test_check_startup_within_generous_budget():
+    # Budget longgar (mesin CI lambat); yang diuji: tidak ada modul berat dan probe berjalan
+    ok, result, problems = judol.check_startup(runs=1, import_budget_ms=30000, predict_budget_ms=60000)
+    assert ok, problems
+    assert result['import_pulled'] == [] and result['heavy'] == []
+    assert 0 < result['import_ms'] <= result['predict_ms']
@@ -0,0 +1,84 @@
+import pytest
+from langdetect import DetectorFactory, LangDetectException, detect
+
+import language_filter
+from language_filter import LanguageFilter, looks_indonesian
+
+TEXTS = [
+    "this is the best video I have watched all week, thanks a lot",
+    "who is still listening to this song in the middle of the night",
+    "semoga sehat selalu dan terus berkarya",
+    "rtp slot lagi tinggi, buruan main sebelum turun lagi",
+    "c'est la meilleure chanson que j'ai jamais entendue",
+    "esta canción me recuerda a mi infancia en el pueblo",
+    "wkwk",
+    "12345 67890 !!!",
+]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("aku udah nonton dari awal sampai akhir", True),
+    ("Kenapa ya hari ini susah banget", True),
+    ("halo bosku", False),  # satu kata fungsi saja belum cukup
+    ("the video di ya is one of the best I have seen this year", False),  # rasio kata fungsi terlalu kecil
+    ("this is the best video I have watched", False),
+    ("🔥🔥 123", False),
+])
+def test_looks_indonesian(text, expected):
+    assert looks_indonesian(text) is expected
+
+
+def test_cached_texts_are_not_detected_again(monkeypatch):
+    sent = []
+    detect_batch = language_filter._detect_batch
+
+    def recording_detect_batch(texts):
+        sent.extend(texts)
+        return detect_batch(texts)
+
+    monkeypatch.setattr(language_filter, '_detect_batch', recording_detect_batch)
+    detector = LanguageFilter(workers=1, prefilter=False)
+    first = detector.detect_languages(TEXTS[:2])
+    assert sent == TEXTS[:2]
+
+    # Whitespace berbeda tetap kunci cache yang sama
+    second = detector.detect_languages(["  " + TEXTS[0], TEXTS[1].replace(" ", "   ")])
+    assert second == first
+    assert sent == TEXTS[:2]
+    assert detector.metrics()['sources'] == {'detector': 2, 'cache': 2}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batched_detection_matches_per_text_detect(workers):
+    texts = [text for text in TEXTS if len(text) >= 5] * 3
+    detector = LanguageFilter(workers=workers, batch_size=2, prefilter=False, seed=0)
+    try:
+        languages = detector.detect_languages(texts)
+    finally:
+        detector.close()
+
+    DetectorFactory.seed = 0
+    expected = []
+    for text in texts:
+        try:
+            expected.append(detect(text))
+        except LangDetectException:
+            expected.append(None)
+    assert languages == expected
+
+
+def test_metrics_add_up():
+    detector = LanguageFilter(workers=1)
+    keep = detector.filter(TEXTS)
+    detector.filter(TEXTS[:4])
+    metrics = detector.metrics()
+
+    total = len(TEXTS) + 4
+    assert metrics['total'] == total
+    assert metrics['accepted'] + metrics['rejected'] == total
+    assert sum(metrics['languages'].values()) == total
+    assert sum(metrics['sources'].values()) == total
+    assert metrics['rejected'] == 2 * keep[:4].count(False) + keep[4:].count(False)
+    assert metrics['rejection_rate'] == metrics['rejected'] / total
+    # Panggilan kedua: teks yang dulu dikirim ke langdetect sekarang dari cache
+    assert metrics['sources'] == {'short': 1, 'prefilter': 2, 'detector': 6, 'cache': 3}
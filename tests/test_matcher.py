@@ -0,0 +1,28 @@
+import numpy as np
+
+from matcher import TermMatcher
+
+LEXICONS = {
+    # Term yang saling overlap / menjadi bagian term lain
+    'site': ['pstoto', 'pstoto99', 'toto', 'sgi', 'sgi88', 'garuda hoki'],
+    'financial': ['wd', 'hoki', 'jp', 'jepe', 'depo', 'deposit'],
+    'phrase': ['wd lancar', 'depo kecil', 'minimal depo'],
+}
+TEXTS = [
+    'pstoto99 wd lancar', 'garuda hoki jepe', 'minimal depo kecil deposit', 'sgi88sgi', '',
+    'tidak ada apa apa', 'wdwdwd jpjp', 'PSTOTO99 huruf besar', 'toto',
+]
+
+
+def test_hit_matrix_matches_substring_search():
+    matcher = TermMatcher(LEXICONS)
+    hits, columns = matcher.hit_matrix(TEXTS + TEXTS[:2])
+    expected = np.array([[term in text for _, term in columns] for text in TEXTS + TEXTS[:2]])
+    assert columns == [(category, term) for category, terms in LEXICONS.items() for term in terms]
+    assert (hits == expected).all()
+
+    for text in TEXTS:
+        found = matcher.found_terms(text)
+        for category, terms in LEXICONS.items():
+            assert sorted(found.get(category, [])) == sorted(term for term in terms if term in text)
+        assert matcher.contains_any(text, 'site') == any(term in text for term in LEXICONS['site'])
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+import pipeline
+from pipeline import Stage, run_pipeline
+
+pytest.importorskip('pyarrow')
+
+SCRAPED = pd.DataFrame({
+    'video_id': ['v1', 'v2', 'v3'],
+    'comment_text': ['DEPO 10K WD lancar', 'videonya bagus', 'slot gacor maxwin'],
+    'published_at': ['2024-01-01T10:00:00Z', '2024-01-02T10:00:00Z', None],
+    'like_count': [1, None, 3],
+    'cleaned_comment_text': ['depo k wd lancar', 'videonya bagus', 'slot gacor maxwin'],
+})
+
+
+def test_cached_run_matches_fresh_run(tmp_path, monkeypatch):
+    calls = []
+
+    def scrape(df):
+        calls.append(1)
+        return SCRAPED.copy()
+
+    # Stage scrape palsu (tidak bisa di-cache), stage label sesudahnya tetap di-cache
+    monkeypatch.setitem(pipeline.STAGES, 'scrape', Stage('scrape', scrape, [], None, 'comments_from_scraping',
+                                                         cacheable=False))
+    cache_dir = str(tmp_path / 'cache')
+    fresh, first = run_pipeline(['scrape', 'label'], cache_dir=cache_dir)
+    cached, second = run_pipeline(['scrape', 'label'], cache_dir=cache_dir)
+
+    assert len(calls) == 2
+    assert [row['status'] for row in first] == ['run', 'run']
+    assert [row['status'] for row in second] == ['run', 'cache']
+    pd.testing.assert_frame_equal(fresh, cached)
+    assert str(fresh['like_count'].dtype) == 'Int64'
+    assert str(fresh['target'].dtype) == 'int8'
+    assert isinstance(fresh['published_at'].dtype, pd.DatetimeTZDtype)
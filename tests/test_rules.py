@@ -0,0 +1,45 @@
+import re
+
+import pandas as pd
+import pytest
+
+from rules import GAMBLING_RULES, RuleSet
+
+
+def baseline_label(text):
+    """Labeling lama (loop Python + `re`), acuan untuk RuleSet"""
+    text = text.lower()
+    if any(platform in text for platform in GAMBLING_RULES['platforms']):
+        return 1
+    has_term = any(term in text for term in GAMBLING_RULES['terms'])
+    has_money = any(re.search(pattern, text) for pattern in GAMBLING_RULES['money_patterns'].values())
+    has_fp = any(trigger in text for trigger in GAMBLING_RULES['false_positive_triggers'])
+    if has_term and has_money and not has_fp:
+        return 1
+    if any(all(term in text for term in combo) for combo in GAMBLING_RULES['strong_combinations']):
+        return 1
+    return 0
+
+
+@pytest.mark.parametrize('text, rule_id', [
+    ('depo rp\u00a0500 langsung cair', 'money:rp'),  # NBSP
+    ('modal 500\u00a0rb aja', 'money:satuan'),  # NBSP
+    ('bonus 100\u2003ribu', 'money:satuan'),  # em space
+    ('depo \uff15\uff10\uff10ribu', 'money:satuan'),  # digit fullwidth
+    ('saldo \u0665\u0660\u0660k', 'money:km'),  # digit Arab-Indic
+])
+def test_money_patterns_unicode(text, rule_id):
+    labels, fired = RuleSet().evaluate([text])
+    assert labels[0] == baseline_label(text) == 1
+    assert rule_id in fired[0]
+
+
+def test_matches_baseline():
+    texts = [
+        'Depo 50rb WD 500rb di PULAUWIN', 'gacor banget depo dulu', 'main game dapat 100k', 'rtp slot hari ini',
+        'Rp\u00a0500rb depo', 'bagus videonya', '', 'modal 10\u00a0ribu jadi jutaan', 'turnamen mlbb hadiah 5jt',
+        'slot \uff11\uff10\uff10k', None, float('nan'), 'wd\u3000500 ribu',
+    ]
+    labels, _ = RuleSet().evaluate(pd.Series(texts, dtype=object))
+    expected = [baseline_label(text) if isinstance(text, str) else 0 for text in texts]
+    assert list(labels) == expected
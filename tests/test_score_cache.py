@@ -0,0 +1,53 @@
+import numpy as np
+
+from score_cache import ScoreCache, version_counts
+from serving import KerasScorer
+from vocab import CompactTokenizer
+
+
+def test_versions_share_disk_tier_until_pruned(tmp_path):
+    path = str(tmp_path / 'scores.sqlite')
+    old = ScoreCache('v1', path=path)
+    old.put('depo wd', {'score': 1})
+    old.close()
+
+    new = ScoreCache('v2', path=path)
+    assert new.get('depo wd') is None
+    new.put('depo wd', {'score': 2})
+    assert version_counts(path) == {'v1': 1, 'v2': 1}
+
+    # Membuka versi lain tidak menghapus apa pun; entry v1 masih terbaca
+    assert ScoreCache('v1', path=path).get('depo wd') == {'score': 1}
+    assert new.prune() == 1
+    assert version_counts(path) == {'v2': 1}
+    assert ScoreCache('v2', path=path).get('depo wd') == {'score': 2}
+
+
+class FakeModel:
+    """predict_on_batch = rata-rata id token / 10, plus penghitung baris yang di-predict"""
+
+    layers = []
+
+    def __init__(self):
+        self.rows = 0
+
+    def predict_on_batch(self, padded):
+        self.rows += len(padded)
+        return (padded.mean(axis=1) / 10).reshape(-1, 1)
+
+
+def test_keras_scorer_serves_repeats_from_cache():
+    config = {'word_index': {'depo': 1, 'wd': 2, 'gacor': 3}, 'num_words': None, 'oov_token': None,
+              'filters': '', 'lower': True, 'split': ' ', 'char_level': False, 'analyzer': None}
+    model = FakeModel()
+    scorer = KerasScorer(model, CompactTokenizer.from_config(config), threshold=0.05, max_len=4, bucketing='off',
+                         version='v1')
+    expected = scorer(['Depo WD', 'gacor'])
+    assert model.rows == 2
+
+    scorer.cache = ScoreCache(scorer.version)
+    assert scorer(['depo wd', 'gacor', 'DEPO  wd']) == [expected[0], expected[1], expected[0]]
+    assert model.rows == 4
+    assert scorer(['gacor', 'depo wd']) == [expected[1], expected[0]]
+    assert model.rows == 4
+    assert np.isclose(expected[1]['prob'], 0.075)
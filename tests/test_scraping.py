@@ -0,0 +1,190 @@
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import scraping
+from fake_youtube import FakeYouTube
+from scraping import (KeyPool, QuotaExhausted, ScrapeCheckpoint, SeenVideoIndex, YouTubeClient, fetch_all_comments,
+                      get_comments)
+
+# 424 komentar (5 halaman), komentarnya tidak dimatikan/dilarang
+VIDEO_ID = 'fakevid0000'
+
+
+class Interrupted(BaseException):
+    """Meniru proses yang mati (Ctrl+C / crash): tidak ditangkap `except Exception` di get_comments"""
+
+
+class RecordingClient:
+    """YouTubeClient offline yang mencatat pageToken tiap request, opsional berhenti setelah `stop_after` halaman"""
+
+    def __init__(self, backend, stop_after=None):
+        self.client = YouTubeClient(KeyPool(['key'], service_factory=backend.service), rate=1000)
+        self.stop_after = stop_after
+        self.page_tokens = []
+
+    def execute(self, endpoint, **params):
+        if self.stop_after is not None and len(self.page_tokens) == self.stop_after:
+            raise Interrupted()
+        self.page_tokens.append(params.get('pageToken'))
+        return self.client.execute(endpoint, **params)
+
+
+@pytest.fixture(autouse=True)
+def keep_all_languages(monkeypatch):
+    # Deteksi bahasa bukan yang diuji di sini; semua komentar dianggap Indonesia
+    monkeypatch.setattr(scraping, 'filter_indonesian', lambda texts: [True] * len(texts))
+
+
+def test_interrupted_video_resumes_from_stored_page_token(tmp_path):
+    backend = FakeYouTube()
+    expected, _ = get_comments(RecordingClient(backend), VIDEO_ID)
+
+    path = str(tmp_path / 'checkpoint.sqlite')
+    checkpoint = ScrapeCheckpoint(path)
+    interrupted = RecordingClient(backend, stop_after=2)
+    with pytest.raises(Interrupted):
+        get_comments(interrupted, VIDEO_ID, checkpoint=checkpoint)
+    state = checkpoint.video_state(VIDEO_ID)
+    assert state['status'] == 'in_progress' and state['pages_tried'] == 2
+    assert state['comment_count'] == 200
+    checkpoint.close()
+
+    checkpoint = ScrapeCheckpoint(path)
+    resumed = RecordingClient(backend)
+    comments, skipped = get_comments(resumed, VIDEO_ID, checkpoint=checkpoint)
+    # Halaman yang sudah tersimpan tidak diminta lagi
+    assert resumed.page_tokens == [state['next_page_token'], 'p300', 'p400']
+    assert skipped is None
+    assert comments == expected
+    assert len(comments) == 424
+    assert checkpoint.video_state(VIDEO_ID)['status'] == 'done'
+    checkpoint.close()
+
+
+def test_incremental_run_fetches_only_new_comments(tmp_path):
+    backend = FakeYouTube()
+    checkpoint = ScrapeCheckpoint(str(tmp_path / 'checkpoint.sqlite'))
+    old, _ = get_comments(RecordingClient(backend), VIDEO_ID, checkpoint=checkpoint)
+    assert checkpoint.video_state(VIDEO_ID)['status'] == 'done'
+    pages = checkpoint.video_state(VIDEO_ID)['pages_tried']
+
+    backend.add_comments(VIDEO_ID, ['komentar baru pertama', 'komentar baru kedua'])
+    client = RecordingClient(backend)
+    comments, skipped = get_comments(client, VIDEO_ID, checkpoint=checkpoint, incremental=True)
+
+    # Satu halaman (terbaru dulu), berhenti di komentar pertama yang sudah pernah dilihat
+    assert client.page_tokens == [None]
+    assert skipped is None
+    assert [c['comment_text'] for c in comments[:2]] == ['komentar baru kedua', 'komentar baru pertama']
+    assert comments[2:] == old
+    state = checkpoint.video_state(VIDEO_ID)
+    assert state['status'] == 'done' and state['generation'] == 1 and state['pages_tried'] == pages + 1
+    assert state['last_published_at'] == '2025-11-01T00:01:00Z'
+
+    # Tanpa komentar baru: satu halaman lagi, tidak ada yang ditambahkan
+    again, _ = get_comments(RecordingClient(backend), VIDEO_ID, checkpoint=checkpoint, incremental=True)
+    assert again == comments
+    checkpoint.close()
+
+
+def test_parallel_fetch_matches_serial_and_fetches_each_video_once():
+    # Termasuk video yang komentarnya dimatikan / dilarang, dan video id ganda
+    video_ids = [f'fakevid{i:04d}' for i in range(16)]
+    backend = FakeYouTube(latency=0.002)
+    requests = Counter()
+    lock = threading.Lock()
+
+    class CountingClient(YouTubeClient):
+        def execute(self, endpoint, **params):
+            with lock:
+                requests[params['videoId'], params.get('pageToken')] += 1
+            return super().execute(endpoint, **params)
+
+    client = CountingClient(KeyPool(['a', 'b'], service_factory=backend.service), rate=1000)
+    results = fetch_all_comments(client, video_ids + video_ids[::-1], workers=4)
+
+    serial_client = YouTubeClient(KeyPool(['key'], service_factory=FakeYouTube().service), rate=1000)
+    expected = {vid: get_comments(serial_client, vid) for vid in video_ids}
+    assert results == expected
+    assert any(skipped for _, skipped in results.values())
+    # Setiap video unik di-fetch sekali: halaman pertamanya (dan halaman lain) diminta tepat sekali
+    assert {vid for vid, token in requests if token is None} == set(video_ids)
+    assert set(requests.values()) == {1}
+
+
+def test_key_pool_charges_endpoint_costs_to_key_with_most_headroom():
+    backend = FakeYouTube()
+    pool = KeyPool(['a', 'b'], service_factory=backend.service, budget_per_key=250)
+    client = YouTubeClient(pool, rate=1000)
+
+    client.execute('search', q='slot', part='id', maxResults=5)
+    client.execute('search', q='gacor', part='id', maxResults=5)
+    assert pool.used == {'a': 100, 'b': 100}
+    client.execute('commentThreads', part='snippet', videoId=VIDEO_ID, maxResults=100)
+    pool.mark_exhausted('a')
+    client.execute('commentThreads', part='snippet', videoId=VIDEO_ID, maxResults=100)
+
+    assert pool.used == {'a': 101, 'b': 101}
+    assert pool.remaining == {'a': 0, 'b': 149}
+    assert backend.units_used == pool.used
+    assert client.units_used == {'search': 200, 'commentThreads': 2}
+
+
+def test_key_pool_switches_key_on_quota_exceeded():
+    # Backend lebih ketat dari budget: key yang ditolak API dianggap habis, request pindah ke key lain
+    backend = FakeYouTube(quota_per_key=100)
+    pool = KeyPool(['a', 'b'], service_factory=backend.service, budget_per_key=1000, wait=False)
+    client = YouTubeClient(pool, rate=1000)
+    client.execute('search', q='slot', part='id', maxResults=5)
+    client.execute('commentThreads', part='snippet', videoId=VIDEO_ID, maxResults=100)
+    assert backend.units_used == {'a': 100, 'b': 1}
+
+    # b (headroom terbesar) ditolak, lalu a juga ditolak: tanpa wait langsung QuotaExhausted
+    with pytest.raises(QuotaExhausted):
+        client.execute('search', q='toto', part='id', maxResults=5)
+    assert pool.remaining == {'a': 0, 'b': 0}
+    assert backend.units_used == {'a': 100, 'b': 1}
+
+
+def test_key_pool_waits_for_reset_when_all_keys_exhausted():
+    pool = KeyPool(['a', 'b'], service_factory=FakeYouTube().service, budget_per_key=100)
+    pool.acquire(100)
+    pool.acquire(100)
+
+    waits = []
+    wait = pool._condition.wait
+
+    def counting_wait(timeout=None):
+        waits.append(timeout)
+        return wait(timeout)
+
+    pool._condition.wait = counting_wait
+    pool.reset_at = datetime.now(timezone.utc) + timedelta(milliseconds=200)
+    result = []
+    thread = threading.Thread(target=lambda: result.append(pool.acquire(1)))
+    thread.start()
+    thread.join(timeout=10)
+
+    assert result == ['a']
+    # Tidur sampai reset (sekali), bukan loop sibuk
+    assert len(waits) == 1 and waits[0] >= 1.0
+    assert pool.remaining == {'a': 99, 'b': 100}
+
+
+def test_seen_video_index_persists_first_source_in_order(tmp_path):
+    path = str(tmp_path / 'checkpoint.sqlite')
+    checkpoint = ScrapeCheckpoint(path)
+    seen = SeenVideoIndex(checkpoint)
+    assert seen.add_many(['v1', 'v2'], 'custom') == ['v1', 'v2']
+    assert seen.add_many(['v2', 'v3', 'v3'], 'slot') == ['v3']
+    checkpoint.close()
+
+    checkpoint = ScrapeCheckpoint(path)
+    reloaded = SeenVideoIndex(checkpoint)
+    assert list(reloaded) == ['v1', 'v2', 'v3']
+    assert reloaded.source('v2') == 'custom' and reloaded.source('v3') == 'slot'
+    assert reloaded.add_many(['v1', 'v4'], 'gacor') == ['v4']
+    checkpoint.close()
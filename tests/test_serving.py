@@ -0,0 +1,80 @@
+import http.client
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from serving import (MAX_LEN, MicroBatcher, RuleScorer, check_padding_equivalence, make_server, pad_pre,
+                     predict_bucketed, probe_sequences)
+
+
+@pytest.fixture(scope='module')
+def server():
+    batcher = MicroBatcher(RuleScorer(), max_wait_ms=1)
+    server = make_server(batcher, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    batcher.close()
+
+
+def post(server, body):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    connection.request('POST', '/predict', body=body, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+
+@pytest.mark.parametrize('body', ['[]', '"x"', '1', 'null', '{}', '{"texts": "depo"}'])
+def test_non_object_or_missing_text_is_400(server, body):
+    status, payload = post(server, body)
+    assert status == 400
+    assert payload == {'error': "Body harus berisi 'text' (string) atau 'texts' (list)"}
+
+
+def test_predict(server):
+    status, payload = post(server, json.dumps({'texts': ['depo 50rb wd 500rb di pulauwin', 'mantap bang']}))
+    assert status == 200
+    assert [result['label'] for result in payload['results']] == [1, 0]
+
+
+class MaskedModel:
+    """Seperti Embedding mask_zero=True: token 0 (padding) diabaikan, urutan token tetap berpengaruh"""
+
+    def __init__(self):
+        self.widths = []
+
+    def predict_on_batch(self, padded):
+        self.widths.append(padded.shape[1])
+        weights = np.arange(padded.shape[1], 0, -1)
+        # Bobot dihitung dari ujung kanan, jadi lebar padding di kiri tidak mengubah hasil
+        return ((padded / weights).sum(axis=1) / 1000).reshape(-1, 1)
+
+
+def padding_dependent(padded):
+    """Model tanpa masking: rata-rata ikut menghitung token 0 di depan sequence"""
+    return (padded.mean(axis=1) / 10).reshape(-1, 1)
+
+
+def test_predict_bucketed_matches_full_padding():
+    rng = np.random.default_rng(1)
+    lengths = [0, 3, MAX_LEN + 20, 12, 1, 40, MAX_LEN, 7, 70, 5]
+    sequences = [rng.integers(1, 50, size=length).tolist() for length in lengths]
+    model = MaskedModel()
+
+    bucketed = predict_bucketed(model.predict_on_batch, sequences, MAX_LEN)
+    full = model.predict_on_batch(pad_pre(sequences, MAX_LEN)).reshape(-1)
+    # Urutan input tetap, dan hasilnya sama dengan padding penuh sampai MAX_LEN
+    np.testing.assert_allclose(bucketed, full, rtol=1e-6)
+    assert min(model.widths[:-1]) < MAX_LEN
+
+    probes = probe_sequences(50)
+    ok, diff = check_padding_equivalence(MaskedModel().predict_on_batch, probes, MAX_LEN)
+    assert ok and diff < 1e-5
+    ok, diff = check_padding_equivalence(padding_dependent, probes, MAX_LEN)
+    assert not ok and diff > 1e-5
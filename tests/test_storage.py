@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from storage import ChunkWriter, read_table
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.mark.parametrize('ext', ['.parquet', '.feather'])
+def test_chunk_writer_column_empty_in_first_chunk(tmp_path, ext):
+    path = str(tmp_path / f'scored{ext}')
+    first = pd.DataFrame({'comment_text': ['a', 'b'], 'cleaned_comment_text': [np.nan, None],
+                          'like_count': [1, 2]}, dtype=object)
+    second = pd.DataFrame({'comment_text': ['c'], 'cleaned_comment_text': ['teks'], 'like_count': [np.nan]},
+                          dtype=object)
+    with ChunkWriter(path) as writer:
+        writer.write(first)
+        writer.write(second)
+
+    df = read_table(path)
+    assert df['cleaned_comment_text'].tolist()[2] == 'teks'
+    assert df['cleaned_comment_text'].isna().tolist() == [True, True, False]
+    assert df['like_count'].tolist()[:2] == [1, 2] and pd.isna(df['like_count'].tolist()[2])
@@ -0,0 +1,73 @@
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from vocab import CompactTokenizer, _keras_sequences, load_tokenizer
+
+FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+TEXTS = [
+    'Depo 50rb, WD 500rb di PULAUWIN!!', 'halo   semua', '', 'kata-kata\tyang\ndipisah filters',
+    'ΣΑΣ ΟΔΟΣ', 'emoji 🎰🎰 gacor', 'pemisah \ue000 di dalam teks', 'kata asing sekali',
+]
+
+
+def make_config(word_index, oov_token=None, num_words=None):
+    return {'word_index': word_index, 'num_words': num_words, 'oov_token': oov_token, 'filters': FILTERS,
+            'lower': True, 'split': ' ', 'char_level': False, 'analyzer': None}
+
+
+@pytest.mark.parametrize('oov_token', [None, '<OOV>'])
+def test_matches_keras_reference(oov_token):
+    words = ['<OOV>', 'depo', '50rb', 'wd', 'di', 'pulauwin', 'halo', 'semua', 'kata', 'yang', 'σας', 'οδος',
+             '🎰🎰', 'gacor', 'pemisah', '\ue000', 'teks']
+    config = make_config({word: index for index, word in enumerate(words, start=1)}, oov_token, num_words=15)
+    tokenizer = CompactTokenizer.from_config(config)
+    expected = _keras_sequences(config, TEXTS)
+    assert tokenizer.texts_to_sequences(TEXTS) == expected
+
+    padded = tokenizer.encode(TEXTS + [None, float('nan')], maxlen=4)
+    for row, sequence in enumerate(expected + [[], []]):
+        row_expected = np.zeros(4, dtype='int32')
+        if sequence[-4:]:
+            row_expected[4 - len(sequence[-4:]):] = sequence[-4:]
+        assert padded[row].tolist() == row_expected.tolist()
+
+
+@pytest.mark.parametrize('oov_token', [None, '<OOV>'])
+def test_empty_vocab(oov_token):
+    tokenizer = CompactTokenizer.from_config(make_config({}, oov_token))
+    expected = [[] for _ in TEXTS]
+    assert tokenizer.texts_to_sequences(TEXTS) == expected
+    assert tokenizer.encode(TEXTS, maxlen=3).tolist() == [[0, 0, 0]] * len(TEXTS)
+    assert tokenizer.texts_to_sequences([]) == []
+
+
+class _MakeDirs:
+    """Pickle yang menjalankan os.makedirs saat di-unpickle"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return os.makedirs, (self.path,)
+
+
+def test_load_tokenizer_file_does_not_run_code(tmp_path):
+    config = make_config({'depo': 1, 'wd': 2})
+    json_path = str(tmp_path / 'tokenizer.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'class_name': 'Tokenizer', 'config': dict(config, word_index=json.dumps(config['word_index']))}, f)
+    tokenizer = load_tokenizer(json_path)
+    assert isinstance(tokenizer, CompactTokenizer)
+    assert tokenizer.texts_to_sequences(['Depo WD']) == [[1, 2]]
+
+    marker = str(tmp_path / 'pwned')
+    pickle_path = str(tmp_path / 'tokenizer.pickle')
+    with open(pickle_path, 'wb') as f:
+        pickle.dump(_MakeDirs(marker), f)
+    with pytest.raises(pickle.UnpicklingError):
+        load_tokenizer(pickle_path)
+    assert not os.path.exists(marker)
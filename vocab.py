@@ -0,0 +1,393 @@
+import argparse
+import collections
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# Nama modul tempat Keras Tokenizer di-pickle (Keras 3 legacy, Keras 2, keras_preprocessing)
+KERAS_TOKENIZER_MODULES = {
+    'keras.src.legacy.preprocessing.text',
+    'keras.legacy.preprocessing.text',
+    'keras.preprocessing.text',
+    'keras.src.preprocessing.text',
+    'keras_preprocessing.text',
+    'tensorflow.keras.preprocessing.text',
+}
+SAFE_GLOBALS = {
+    ('collections', 'OrderedDict'): collections.OrderedDict,
+    ('collections', 'defaultdict'): collections.defaultdict,
+    ('builtins', 'int'): int,
+    ('builtins', 'list'): list,
+}
+VOCAB_EXTENSION = '.vocab'
+FORMAT_VERSION = 1
+MAX_LEN = 100
+# Pemisah antar teks saat satu batch di-tokenize sekaligus (private use area)
+_SEPARATOR = '\ue000'
+
+
+class _TokenizerState:
+    """Pengganti Keras Tokenizer saat unpickle: hanya menyimpan atribut"""
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+class _TokenizerUnpickler(pickle.Unpickler):
+    """Unpickler terbatas: hanya Tokenizer dan container dasar, tanpa import Keras/TensorFlow"""
+
+    def find_class(self, module, name):
+        if name == 'Tokenizer' and module in KERAS_TOKENIZER_MODULES:
+            return _TokenizerState
+        if (module, name) in SAFE_GLOBALS:
+            return SAFE_GLOBALS[module, name]
+        raise pickle.UnpicklingError(f"Class tidak diizinkan di file tokenizer: {module}.{name}")
+
+
+def read_keras_tokenizer(path):
+    """
+    Config Keras Tokenizer dari pickle (.pickle/.pkl/.joblib tanpa kompresi)
+    atau JSON (tokenizer.to_json()). Return dict word_index, num_words,
+    oov_token, filters, lower, split, char_level, analyzer.
+    """
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)['config']
+        config['word_index'] = json.loads(config['word_index'])
+        config.setdefault('analyzer', None)
+        return config
+    with open(path, 'rb') as f:
+        state = _TokenizerUnpickler(f).load()
+    return dict(state.__dict__)
+
+
+def _hash_words(words):
+    """Hash 64-bit (siphash pandas) untuk array kata, vectorized"""
+    return pd.util.hash_array(np.asarray(words, dtype=object), categorize=False)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CompactTokenizer:
+    """
+    Pengganti Keras Tokenizer khusus inference: hanya kata yang dipakai
+    model (index < num_words) dalam array terurut berdasarkan hash 64-bit.
+    Lookup = hash semua token sekaligus + np.searchsorted, tanpa loop
+    Python per kata. Disimpan sebagai file .npy yang dibuka dengan mmap.
+
+    Output texts_to_sequences / encode sama persis dengan Keras
+    Tokenizer.texts_to_sequences (+ pad_sequences default untuk encode).
+    """
+
+    def __init__(self, hashes, ids, offsets, blob, meta):
+        self.hashes = hashes
+        self.ids = ids
+        self.offsets = offsets
+        self.blob = blob
+        self.meta = meta
+        self.num_words = meta['num_words']
+        self.oov_token = meta['oov_token']
+        self.oov_index = meta['oov_index']
+        self.lower = meta['lower']
+        self.split = meta['split']
+        self._translate = str.maketrans({char: self.split for char in meta['filters']})
+        self._translate_chars = set(meta['filters']) | set(self.split)
+        # Versi regex dari _translate untuk satu batch besar (jauh lebih cepat dari str.translate)
+        self._filters_pattern = re.compile(
+            '[' + ''.join(re.escape(char) for char in meta['filters']) + ']'
+        ) if meta['filters'] else None
+
+    @classmethod
+    def from_config(cls, config, source=None):
+        if config.get('char_level') or config.get('analyzer') is not None:
+            raise ValueError("Tokenizer char_level / analyzer kustom tidak didukung")
+        num_words = config.get('num_words')
+        kept = {word: index for word, index in config['word_index'].items() if not num_words or index < num_words}
+        # Urut berdasarkan hash; 64-bit harus unik di dalam vocab
+        words = list(kept)
+        hashes = _hash_words(words)
+        order = np.argsort(hashes, kind='stable')
+        hashes = hashes[order]
+        if len(hashes) and (np.diff(hashes) == 0).any():
+            raise ValueError("Hash collision di vocab, tidak bisa dikonversi")
+        words = [words[i] for i in order]
+        encoded = [word.encode('utf-8') for word in words]
+        offsets = np.zeros(len(encoded) + 1, dtype='int64')
+        offsets[1:] = np.cumsum([len(word) for word in encoded])
+
+        oov_token = config.get('oov_token')
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'num_words': num_words,
+            'oov_token': oov_token,
+            'oov_index': config['word_index'].get(oov_token) if oov_token is not None else None,
+            'filters': config['filters'],
+            'lower': bool(config['lower']),
+            'split': config['split'],
+            'vocab_size': len(words),
+            'source': source,
+        }
+        return cls(
+            hashes,
+            np.array([kept[word] for word in words], dtype='int32'),
+            offsets,
+            np.frombuffer(b''.join(encoded), dtype='uint8'),
+            meta,
+        )
+
+    @classmethod
+    def from_keras(cls, path):
+        tokenizer = cls.from_config(read_keras_tokenizer(path), source=os.path.basename(path))
+        tokenizer.meta['source_sha256'] = _file_sha256(path)
+        return tokenizer
+
+    # ===== STORAGE =====
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'hashes.npy'), self.hashes)
+        np.save(os.path.join(path, 'ids.npy'), self.ids)
+        np.save(os.path.join(path, 'offsets.npy'), self.offsets)
+        np.save(os.path.join(path, 'words.npy'), self.blob)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        mode = 'r' if mmap else None
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Format vocab {path} tidak didukung: {meta.get('format_version')}")
+        arrays = [np.load(os.path.join(path, name), mmap_mode=mode)
+                  for name in ('hashes.npy', 'ids.npy', 'offsets.npy', 'words.npy')]
+        tokenizer = cls(*arrays, meta)
+        tokenizer._check_hashes()
+        return tokenizer
+
+    def _check_hashes(self, sample=32):
+        """Hash di file harus sama dengan hash versi pandas ini (kalau beda, konversi ulang)"""
+        rows = np.linspace(0, len(self.hashes) - 1, num=min(sample, len(self.hashes)), dtype=int)
+        if len(rows) and not np.array_equal(_hash_words([self.word(row) for row in rows]), self.hashes[rows]):
+            raise ValueError("Hash vocab tidak cocok dengan versi pandas ini; konversi ulang tokenizer")
+
+    def word(self, row):
+        return bytes(self.blob[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+
+    @property
+    def index_word(self):
+        return {int(index): self.word(row) for row, index in enumerate(self.ids)}
+
+    # ===== ENCODE =====
+    def tokenize(self, text):
+        """Sama dengan text_to_word_sequence Keras (lower, filters -> split, buang token kosong)"""
+        if not isinstance(text, str):
+            text = '' if text is None or text != text else str(text)
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self._translate).split(self.split) if word]
+
+    def _join_texts(self, texts):
+        """Gabung teks dengan karakter pemisah yang tidak muncul di teks, filters, maupun split"""
+        joined = _SEPARATOR.join(texts)
+        if _SEPARATOR not in self._translate_chars and joined.count(_SEPARATOR) == len(texts) - 1:
+            return joined, _SEPARATOR
+        for code in range(ord(_SEPARATOR) + 1, 0xF900):
+            separator = chr(code)
+            if separator not in self._translate_chars and separator not in joined:
+                return separator.join(texts), separator
+        raise ValueError("Tidak ada karakter pemisah teks yang aman untuk batch ini")
+
+    def _tokenize_batch(self, texts):
+        """
+        Token seluruh batch sebagai (codes, words, lengths): token ke-i adalah
+        words[codes[i]], lengths = jumlah token per teks. Teks digabung dengan
+        karakter pemisah lalu lower/filters/split sekali untuk seluruh batch
+        (bukan per teks); hasilnya sama dengan tokenize per teks.
+        """
+        texts = [text if isinstance(text, str) else '' if text is None or text != text else str(text)
+                 for text in texts]
+        if not texts:
+            return np.zeros(0, dtype='int64'), np.zeros(0, dtype=object), np.zeros(0, dtype='int64')
+        joined, separator = self._join_texts(texts)
+        if self.lower:
+            joined = joined.lower()
+        if self._filters_pattern is not None:
+            joined = self._filters_pattern.sub(self.split.replace('\\', r'\\'), joined)
+        joined = joined.replace(separator, self.split + separator + self.split)
+        codes, words = pd.factorize(np.array(joined.split(self.split), dtype=object))
+
+        is_separator = words == separator
+        keep = (~is_separator & (words != ''))[codes]
+        owner = np.cumsum(is_separator[codes])
+        return codes[keep], words, np.bincount(owner[keep], minlength=len(texts)).astype('int64')
+
+    def _encode_flat(self, texts):
+        """Semua id token berurutan plus jumlah token per teks"""
+        codes, words, lengths = self._tokenize_batch(texts)
+        if not len(codes):
+            return np.zeros(0, dtype='int32'), lengths
+        # Lookup hash cukup sekali per kata unik, lalu dipetakan ke setiap token
+        missing = -1 if self.oov_index is None else self.oov_index
+        if len(self.hashes):
+            hashes = _hash_words(words)
+            positions = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+            word_hit = self.hashes[positions] == hashes
+            word_ids = np.where(word_hit, self.ids[positions], missing).astype('int32')
+        else:
+            # Vocab kosong: semua kata tidak dikenal
+            word_hit = np.zeros(len(words), dtype=bool)
+            word_ids = np.full(len(words), missing, dtype='int32')
+        hit = word_hit[codes]
+        ids = word_ids[codes]
+        if self.oov_index is None and not hit.all():
+            # Tanpa OOV token, Keras membuang kata yang tidak dikenal
+            owner = np.repeat(np.arange(len(lengths)), lengths)
+            ids = ids[hit]
+            lengths = np.bincount(owner[hit], minlength=len(lengths))
+        return ids, lengths
+
+    def texts_to_sequences(self, texts):
+        ids, lengths = self._encode_flat(list(texts))
+        return [sequence.tolist() for sequence in np.split(ids, np.cumsum(lengths)[:-1])] if len(lengths) else []
+
+    def encode(self, texts, maxlen=MAX_LEN):
+        """
+        Batch id token (int32, shape (len(texts), maxlen)), sama dengan
+        pad_sequences(texts_to_sequences(texts), maxlen=maxlen): padding dan
+        truncating 'pre', nilai 0. maxlen=None = panjang teks terpanjang.
+        """
+        texts = list(texts)
+        ids, lengths = self._encode_flat(texts)
+        if maxlen is None:
+            maxlen = int(lengths.max()) if len(lengths) else 0
+        padded = np.zeros((len(texts), maxlen), dtype='int32')
+        if not len(ids) or not maxlen:
+            return padded
+        owner = np.repeat(np.arange(len(texts)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        position = np.arange(len(ids)) - starts
+        lengths_per_token = lengths[owner]
+        keep = position >= lengths_per_token - maxlen
+        column = maxlen - np.minimum(lengths_per_token, maxlen) + position - np.maximum(lengths_per_token - maxlen, 0)
+        padded[owner[keep], column[keep]] = ids[keep]
+        return padded
+
+
+def load_tokenizer(path, mmap=True):
+    """
+    Tokenizer untuk inference (CompactTokenizer): direktori .vocab, atau file
+    Keras Tokenizer (pickle/JSON) yang dibaca lewat _TokenizerUnpickler, jadi
+    file tokenizer tidak bisa menjalankan kode saat dimuat.
+    """
+    if os.path.isdir(path):
+        return CompactTokenizer.load(path, mmap=mmap)
+    return CompactTokenizer.from_keras(path)
+
+
+def vocab_path(source, output_dir=None):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(output_dir or os.path.dirname(source), stem + VOCAB_EXTENSION)
+
+
+def _keras_sequences(config, texts):
+    """Referensi Tokenizer.texts_to_sequences Keras (dipakai --verify jika Keras tidak terpasang)"""
+    translate = str.maketrans({char: config['split'] for char in config['filters']})
+    word_index = config['word_index']
+    num_words = config.get('num_words')
+    oov_token = config.get('oov_token')
+    oov_index = word_index.get(oov_token)
+    sequences = []
+    for text in texts:
+        text = text.lower() if config['lower'] else text
+        vect = []
+        for word in [w for w in text.translate(translate).split(config['split']) if w]:
+            index = word_index.get(word)
+            if index is not None:
+                if num_words and index >= num_words:
+                    if oov_index is not None:
+                        vect.append(oov_index)
+                else:
+                    vect.append(index)
+            elif oov_token is not None:
+                vect.append(oov_index)
+        sequences.append(vect)
+    return sequences
+
+
+def verify(source, tokenizer, texts, maxlen=MAX_LEN):
+    """Bandingkan output CompactTokenizer dengan tokenizer asli; return jumlah teks yang berbeda"""
+    start = time.perf_counter()
+    try:
+        with open(source, 'rb') as f:
+            original = pickle.load(f)
+        expected = original.texts_to_sequences(texts)
+        reference = 'Keras'
+    except (ImportError, AttributeError, pickle.UnpicklingError):
+        expected = _keras_sequences(read_keras_tokenizer(source), texts)
+        reference = 'referensi Python'
+    reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    padded = tokenizer.encode(texts, maxlen)
+    compact_seconds = time.perf_counter() - start
+
+    mismatches = sum(actual != wanted for actual, wanted in zip(tokenizer.texts_to_sequences(texts), expected))
+    for row, sequence in enumerate(expected):
+        sequence = sequence[-maxlen:]
+        row_expected = np.zeros(maxlen, dtype='int32')
+        if sequence:
+            row_expected[maxlen - len(sequence):] = sequence
+        mismatches += not np.array_equal(padded[row], row_expected)
+    print(f"   verify vs {reference}: {len(texts):,} teks, {mismatches} berbeda "
+          f"(encode {compact_seconds:.2f}s vs {reference_seconds:.2f}s)")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konversi Keras Tokenizer (pickle/JSON) ke vocab array (.vocab)")
+    parser.add_argument('sources', nargs='+', help="File tokenizer (.pickle/.pkl/.json)")
+    parser.add_argument('--output-dir', default=None, help="Default: di samping file sumber")
+    parser.add_argument('--verify', default=None,
+                        help="CSV/Parquet berisi teks untuk membandingkan hasil encode dengan tokenizer asli")
+    parser.add_argument('--column', default='cleaned_comment_text', help="Kolom teks untuk --verify")
+    parser.add_argument('--max-len', type=int, default=MAX_LEN)
+    args = parser.parse_args()
+
+    texts = None
+    if args.verify:
+        from storage import read_table
+        texts = read_table(args.verify, columns=[args.column])[args.column].fillna('').astype(str).tolist()
+
+    failed = 0
+    for source in args.sources:
+        try:
+            tokenizer = CompactTokenizer.from_keras(source)
+        except (pickle.UnpicklingError, ValueError, KeyError) as e:
+            print(f"❌ {source}: {e}")
+            failed += 1
+            continue
+        output = vocab_path(source, args.output_dir)
+        tokenizer.save(output)
+        size_kb = sum(os.path.getsize(os.path.join(output, name)) for name in os.listdir(output)) / 1024
+        print(f"✅ {source} ({os.path.getsize(source) / 1024:,.0f} KB) -> {output} "
+              f"({tokenizer.meta['vocab_size']:,} kata, {size_kb:,.0f} KB)")
+        if texts is not None:
+            failed += verify(source, CompactTokenizer.load(output), texts, args.max_len) > 0
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()